@@ -0,0 +1,178 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Download of large payloads in parts.
+
+A single HTTP stream is often limited to a fraction of the available
+bandwidth. Payloads such as objects and images are instead downloaded with
+concurrent ``Range`` requests, each part being written at its offset of the
+output file.
+"""
+
+import hashlib
+import os
+import threading
+
+import six
+
+from openstack import exceptions
+
+DEFAULT_PART_SIZE = 64 * 1024 * 1024
+# Size of the reads and writes, large enough to keep the per chunk overhead
+# of python low.
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+def can_download_in_parts(output):
+    """Whether parts of a download can be written to an output.
+
+    Parts are written at their offset and read back to verify the checksum
+    of the download, so the output must either be the path of a file or a
+    file object backed by a file descriptor and opened for reading and
+    writing, such as with mode ``w+b``.
+    """
+    if isinstance(output, six.string_types):
+        return True
+    try:
+        output.fileno()
+        return output.readable() and output.writable()
+    except (AttributeError, EnvironmentError, ValueError):
+        return False
+
+
+def get_parts(size, part_size):
+    """Split a payload in parts.
+
+    :returns: A list of the offset and length of each part.
+    """
+    return [(offset, min(part_size, size - offset))
+            for offset in range(0, size, part_size)]
+
+
+class _File(object):
+    """A file descriptor written and read at given offsets by threads."""
+
+    def __init__(self, fd):
+        self.fd = fd
+        # Only needed when the positional calls are not available.
+        self._lock = threading.Lock()
+
+    def write(self, data, offset):
+        data = memoryview(data)
+        while data:
+            if hasattr(os, 'pwrite'):
+                written = os.pwrite(self.fd, data, offset)
+            else:
+                with self._lock:
+                    os.lseek(self.fd, offset, os.SEEK_SET)
+                    written = os.write(self.fd, data)
+            data = data[written:]
+            offset += written
+
+    def read(self, size, offset):
+        if hasattr(os, 'pread'):
+            return os.pread(self.fd, size, offset)
+        with self._lock:
+            os.lseek(self.fd, offset, os.SEEK_SET)
+            return os.read(self.fd, size)
+
+    def get_md5(self, size):
+        md5 = hashlib.md5()
+        offset = 0
+        while offset < size:
+            data = self.read(min(DEFAULT_CHUNK_SIZE, size - offset), offset)
+            if not data:
+                break
+            md5.update(data)
+            offset += len(data)
+        return md5.hexdigest()
+
+
+def download(session, url, size, output, workers, part_size=None,
+             headers=None, error_message=None):
+    """Download a payload in parts written at their offset of a file.
+
+    The parts are downloaded with ``Range`` requests run on the executor of
+    the connection of the session, so the ``concurrency`` of the service
+    applies. The output is resized to the size of the payload beforehand.
+
+    :param session: The :class:`~openstack.proxy.Proxy` of the service.
+    :param str url: The URL of the payload.
+    :param int size: The size of the payload, in bytes.
+    :param output: Path of the file to write, or a file object accepted by
+        :func:`can_download_in_parts`.
+    :param int workers: Maximum number of parts to download at once.
+    :param int part_size: Size of the parts, in bytes. Defaults to
+        :data:`DEFAULT_PART_SIZE`.
+    :param dict headers: Additional headers of the requests.
+    :param str error_message: Message of the errors of the requests.
+
+    :returns: The md5 hexdigest of the downloaded payload, read back from the
+        output.
+    :raises: :class:`~openstack.exceptions.SDKException` when the service
+        does not honour the ranges.
+    """
+    part_size = part_size or DEFAULT_PART_SIZE
+    if isinstance(output, six.string_types):
+        fd = os.open(
+            output,
+            os.O_RDWR | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0),
+            0o666)
+    else:
+        output.flush()
+        fd = output.fileno()
+    try:
+        os.ftruncate(fd, size)
+        target = _File(fd)
+
+        def download_part(part):
+            offset, length = part
+            part_headers = dict(headers or {})
+            part_headers['Range'] = 'bytes={start}-{end}'.format(
+                start=offset, end=offset + length - 1)
+            response = session.get(url, headers=part_headers, stream=True)
+            try:
+                exceptions.raise_from_response(
+                    response, error_message=error_message)
+                if response.status_code != 206:
+                    raise exceptions.SDKException(
+                        "{url} does not support ranged downloads".format(
+                            url=url))
+                written = 0
+                for chunk in response.iter_content(
+                        chunk_size=DEFAULT_CHUNK_SIZE):
+                    target.write(chunk, offset + written)
+                    written += len(chunk)
+                if written != length:
+                    raise exceptions.SDKException(
+                        "Received {written} bytes instead of {length} at"
+                        " offset {offset} of {url}".format(
+                            written=written, length=length, offset=offset,
+                            url=url))
+            finally:
+                response.close()
+
+        parts = get_parts(size, part_size)
+        get_connection = getattr(session, '_get_connection', None)
+        conn = get_connection() if get_connection else None
+        if conn is not None:
+            conn.batch(download_part, parts, max_workers=workers,
+                       return_exceptions=False,
+                       service_type=session.service_type)
+        else:
+            for part in parts:
+                download_part(part)
+        return target.get_md5(size)
+    finally:
+        if isinstance(output, six.string_types):
+            os.close(fd)
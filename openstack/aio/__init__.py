@@ -0,0 +1,46 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+asyncio based access to OpenStack services.
+
+:class:`~openstack.aio.connection.Connection` wraps a regular
+:class:`~openstack.connection.Connection` and exposes, for each service,
+a :class:`~openstack.aio.proxy.Proxy` whose methods are coroutines. HTTP
+requests are sent with `aiohttp`, so that thousands of calls can be in
+flight at once without a thread each, while configuration, authentication
+and the :class:`~openstack.resource.Resource` models are shared with the
+synchronous API.
+
+.. code-block:: python
+
+    import asyncio
+
+    from openstack import aio
+    from openstack.compute.v2 import server
+
+    async def main():
+        async with aio.Connection(cloud='example') as conn:
+            async for srv in conn.compute._list(server.Server):
+                print(srv.name)
+
+    asyncio.get_event_loop().run_until_complete(main())
+
+This module requires Python 3.6 or later and the ``aiohttp`` library, which
+can be installed with the ``asyncio`` extra.
+"""
+
+from openstack.aio.connection import Connection
+
+__all__ = [
+    'Connection',
+]
@@ -0,0 +1,142 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+import ssl
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from openstack.aio import proxy as _aio_proxy
+from openstack import connection as _connection
+from openstack import exceptions
+from openstack import proxy as _proxy
+
+__all__ = [
+    'Connection',
+]
+
+
+def _make_ssl_context(session):
+    """Build an SSL context matching a keystoneauth session
+
+    Honours ``verify``, which may be a boolean or the path of a CA bundle
+    (``cacert``) or of a directory of CA certificates, and the client
+    certificate given as ``cert``.
+    """
+    verify = session.verify
+    if isinstance(verify, str) and os.path.isdir(verify):
+        context = ssl.create_default_context(capath=verify)
+    elif isinstance(verify, str):
+        context = ssl.create_default_context(cafile=verify)
+    else:
+        context = ssl.create_default_context()
+        if not verify:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+    cert = session.cert
+    if cert:
+        if isinstance(cert, (list, tuple)):
+            context.load_cert_chain(*cert)
+        else:
+            context.load_cert_chain(cert)
+    return context
+
+
+def _make_timeout(session):
+    """Build an ``aiohttp.ClientTimeout`` out of ``api_timeout``."""
+    if session.timeout is None:
+        return aiohttp.ClientTimeout()
+    return aiohttp.ClientTimeout(total=float(session.timeout))
+
+
+class Connection(object):
+
+    def __init__(self, cloud=None, config=None, session=None,
+                 connection=None, http_session=None, **kwargs):
+        """Create an asynchronous connection to a cloud.
+
+        Services are accessed through an attribute named after the
+        service's official service-type, exactly like with
+        :class:`~openstack.connection.Connection`, but the returned object
+        is an :class:`~openstack.aio.proxy.Proxy`.
+
+        :param str cloud: Name of the cloud from config to use.
+        :param config: CloudRegion object representing the config for the
+            region of the cloud in question.
+        :type config: :class:`~openstack.config.cloud_region.CloudRegion`
+        :param session: A session object compatible with
+            :class:`~keystoneauth1.session.Session`.
+        :type session: :class:`~keystoneauth1.session.Session`
+        :param connection: An existing synchronous Connection to share
+            configuration and authentication with. If given, ``cloud``,
+            ``config``, ``session`` and ``kwargs`` are ignored.
+        :type connection: :class:`~openstack.connection.Connection`
+        :param http_session: The ``aiohttp.ClientSession`` to send requests
+            with. By default one is created on first use and closed by
+            :meth:`close`.
+        :param kwargs: Passed to :class:`~openstack.connection.Connection`
+            when ``connection`` is not given.
+        """
+        if aiohttp is None:
+            raise exceptions.SDKException(
+                "openstack.aio requires the aiohttp library, which is not"
+                " installed.")
+        if connection is None:
+            connection = _connection.Connection(
+                cloud=cloud, config=config, session=session, **kwargs)
+        #: The synchronous :class:`~openstack.connection.Connection` used
+        #: for configuration, authentication and service discovery.
+        self.sync_connection = connection
+        self._http_session = http_session
+        self._owns_http_session = http_session is None
+        self._proxies = {}
+        #: The ``ssl.SSLContext`` requests are sent with, built from the
+        #: ``verify``/``cacert``, ``insecure`` and ``cert`` settings.
+        self.ssl_context = _make_ssl_context(connection.session)
+        #: The ``aiohttp.ClientTimeout`` of requests, from ``api_timeout``.
+        self.timeout = _make_timeout(connection.session)
+
+    @property
+    def http_session(self):
+        """The ``aiohttp.ClientSession`` requests are sent with."""
+        if self._http_session is None:
+            self._http_session = aiohttp.ClientSession()
+        return self._http_session
+
+    def __getattr__(self, name):
+        # Only called for missing attributes, which are service proxies.
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self._proxies[name]
+        except KeyError:
+            pass
+        adapter = getattr(self.sync_connection, name)
+        if not isinstance(adapter, _proxy.Proxy):
+            raise AttributeError(name)
+        self._proxies[name] = _aio_proxy.Proxy(self, adapter)
+        return self._proxies[name]
+
+    async def close(self):
+        """Release any resources held open."""
+        if self._owns_http_session and self._http_session is not None:
+            await self._http_session.close()
+            self._http_session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
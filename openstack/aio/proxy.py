@@ -0,0 +1,246 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import asyncio
+import functools
+
+from keystoneauth1 import session as ks_session
+import requests
+from requests import structures
+import six
+
+from openstack import _log
+from openstack.aio import resource as _resource
+from openstack import events
+from openstack import exceptions
+from openstack import resource
+from openstack import utils
+
+
+def _encode_params(params):
+    """Convert query parameters to what aiohttp accepts
+
+    requests accepts lists and non-string values in query parameters and
+    drops the ones set to None, while aiohttp only takes strings.
+    """
+    encoded = []
+    for key, values in (params or {}).items():
+        if not isinstance(values, (list, tuple)):
+            values = [values]
+        for value in values:
+            if value is not None:
+                encoded.append((key, six.text_type(value)))
+    return encoded
+
+
+def _make_response(method, url, status, reason, headers, content):
+    """Build a :class:`requests.Response` out of an aiohttp response
+
+    This lets the rest of the SDK, such as
+    :func:`~openstack.exceptions.raise_from_response` and
+    :meth:`~openstack.resource.Resource._translate_response`, handle it
+    unmodified.
+    """
+    response = requests.Response()
+    response.status_code = status
+    response.reason = reason
+    response.headers = structures.CaseInsensitiveDict(headers)
+    response.url = url
+    response._content = content
+    response.encoding = requests.utils.get_encoding_from_headers(
+        response.headers)
+    response.request = requests.Request(method, url).prepare()
+    return response
+
+
+class Proxy(object):
+    """Asynchronous counterpart of :class:`~openstack.proxy.Proxy`
+
+    Authentication, service discovery and microversion negotiation are
+    delegated to the synchronous proxy of the same service, in a thread of
+    the default executor of the event loop since they may block on the
+    network. Requests themselves are sent with aiohttp.
+    """
+
+    def __init__(self, connection, adapter):
+        self._connection = connection
+        #: The synchronous :class:`~openstack.proxy.Proxy` of the service.
+        self.adapter = adapter
+        self.service_type = adapter.service_type
+        self.log = _log.setup_logging(
+            'openstack.aio.{0}'.format(self.service_type))
+
+    async def _run_sync(self, func, *args, **kwargs):
+        """Run a blocking callable without blocking the event loop."""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(func, *args, **kwargs))
+
+    def _get_endpoint_and_headers(self):
+        session = self.adapter.session
+        headers = session.get_auth_headers(auth=self.adapter.auth) or {}
+        if session.user_agent:
+            headers['User-Agent'] = session.user_agent
+        conn = self.adapter._get_connection()
+        if conn and conn._global_request_id:
+            headers['X-OpenStack-Request-ID'] = conn._global_request_id
+        return self.adapter.get_endpoint(), headers
+
+    async def request(self, url, method, json=None, headers=None,
+                      params=None, microversion=None):
+        """Send a request to the service
+
+        :param str url: The URL to request, either absolute or relative to
+            the endpoint of the service.
+        :param str method: The HTTP method.
+        :param json: The body of the request, to be encoded as JSON.
+        :param dict headers: Additional headers of the request.
+        :param dict params: Query parameters of the request.
+        :param str microversion: The microversion to request. Defaults to
+            the default microversion of the service.
+
+        :returns: A :class:`requests.Response`. Errors are not raised.
+        """
+        kwargs = {}
+        if json is not None:
+            kwargs['json'] = json
+        if microversion is None:
+            microversion = self.adapter.default_microversion
+
+        reauthenticated = False
+        while True:
+            endpoint, request_headers = await self._run_sync(
+                self._get_endpoint_and_headers)
+            if not url.startswith(('http://', 'https://')):
+                url = utils.urljoin(endpoint, url)
+            if microversion:
+                ks_session.Session._set_microversion_headers(
+                    request_headers, microversion, self.service_type, None)
+            request_headers.update(headers or {})
+
+            async with self._connection.http_session.request(
+                    method, url, headers=request_headers,
+                    params=_encode_params(params),
+                    ssl=self._connection.ssl_context,
+                    timeout=self._connection.timeout,
+                    **kwargs) as response:
+                content = await response.read()
+                self.log.debug('%s %s: %s', method, url, response.status)
+                result = _make_response(
+                    method, url, response.status, response.reason,
+                    response.headers, content)
+
+            # Like keystoneauth, a 401 may mean the token expired or was
+            # revoked: invalidate it and retry once with a fresh one.
+            if result.status_code != 401 or reauthenticated:
+                return result
+            reauthenticated = True
+            invalidated = await self._run_sync(
+                self.adapter.session.invalidate, auth=self.adapter.auth)
+            if not invalidated:
+                return result
+
+    def _get_resource(self, resource_type, value, **attrs):
+        if (isinstance(value, resource.Resource)
+                and not isinstance(value, resource_type)):
+            raise ValueError("Expected %s but received %s" % (
+                resource_type.__name__, value.__class__.__name__))
+        return self.adapter._get_resource(resource_type, value, **attrs)
+
+    async def _get(self, resource_type, value=None, requires_id=True,
+                   base_path=None, **attrs):
+        """Fetch a resource
+
+        See :meth:`openstack.proxy.Proxy._get`.
+        """
+        res = self._get_resource(resource_type, value, **attrs)
+        return await _resource.fetch(
+            self, res, requires_id=requires_id, base_path=base_path,
+            error_message="No {resource_type} found for {value}".format(
+                resource_type=resource_type.__name__, value=value))
+
+    def _list(self, resource_type, paginated=True, base_path=None, **attrs):
+        """List a resource
+
+        See :meth:`openstack.proxy.Proxy._list`.
+
+        :returns: An asynchronous generator of Resource objects.
+        """
+        return _resource.list(
+            self, resource_type, paginated=paginated, base_path=base_path,
+            **attrs)
+
+    async def _create(self, resource_type, base_path=None, **attrs):
+        """Create a resource from attributes
+
+        See :meth:`openstack.proxy.Proxy._create`.
+        """
+        res = resource_type.new(
+            connection=self.adapter._get_connection(), **attrs)
+        res = await _resource.create(self, res, base_path=base_path)
+        self.adapter._emit_mutation(events.CREATE, res)
+        return res
+
+    async def _update(self, resource_type, value, base_path=None, **attrs):
+        """Update a resource
+
+        See :meth:`openstack.proxy.Proxy._update`.
+        """
+        res = self._get_resource(resource_type, value, **attrs)
+        res = await _resource.commit(self, res, base_path=base_path)
+        self.adapter._emit_mutation(events.UPDATE, res)
+        return res
+
+    async def _delete(self, resource_type, value, ignore_missing=True,
+                      **attrs):
+        """Delete a resource
+
+        See :meth:`openstack.proxy.Proxy._delete`.
+        """
+        res = self._get_resource(resource_type, value, **attrs)
+        try:
+            rv = await _resource.delete(self, res)
+        except exceptions.ResourceNotFound:
+            if ignore_missing:
+                return None
+            raise
+        self.adapter._emit_mutation(events.DELETE, res)
+        return rv
+
+    async def _head(self, resource_type, value=None, base_path=None,
+                    **attrs):
+        """Retrieve a resource's header
+
+        See :meth:`openstack.proxy.Proxy._head`.
+        """
+        res = self._get_resource(resource_type, value, **attrs)
+        return await _resource.head(self, res, base_path=base_path)
+
+    async def wait_for_status(self, res, status, failures=None,
+                              interval=2, wait=120, attribute='status',
+                              strategy=None, max_wait=None):
+        """Wait for a resource to be in a particular status.
+
+        See :func:`openstack.resource.wait_for_status`.
+        """
+        return await _resource.wait_for_status(
+            self, res, status, failures, interval, wait, attribute=attribute,
+            strategy=strategy, max_wait=max_wait)
+
+    async def wait_for_delete(self, res, interval=2, wait=120,
+                              strategy=None, max_wait=None):
+        """Wait for a resource to be deleted.
+
+        See :func:`openstack.resource.wait_for_delete`.
+        """
+        return await _resource.wait_for_delete(
+            self, res, interval, wait, strategy=strategy, max_wait=max_wait)
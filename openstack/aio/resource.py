@@ -0,0 +1,303 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Coroutine versions of the :class:`~openstack.resource.Resource` methods.
+
+They take an :class:`~openstack.aio.proxy.Proxy` instead of a session and
+reuse the request preparation and response translation of the resource, so
+that resources behave the same whichever API they come from.
+"""
+
+import asyncio
+import time
+
+from openstack import _log
+from openstack import exceptions
+from openstack import resource as _resource
+from openstack import utils
+
+
+async def create(proxy, res, prepend_key=True, base_path=None):
+    """Create a remote resource based on this instance.
+
+    See :meth:`openstack.resource.Resource.create`.
+    """
+    if not res.allow_create:
+        raise exceptions.MethodNotSupported(res, "create")
+    if res.create_method not in ('PUT', 'POST'):
+        raise exceptions.ResourceFailure(
+            msg="Invalid create method: %s" % res.create_method)
+
+    microversion = await proxy._run_sync(
+        res._get_microversion_for, proxy.adapter, 'create')
+    requires_id = (res.create_requires_id
+                   if res.create_requires_id is not None
+                   else res.create_method == 'PUT')
+    request = res._prepare_request(requires_id=requires_id,
+                                   prepend_key=prepend_key,
+                                   base_path=base_path)
+    response = await proxy.request(
+        request.url, res.create_method, json=request.body,
+        headers=request.headers, microversion=microversion)
+
+    has_body = (res.has_body if res.create_returns_body is None
+                else res.create_returns_body)
+    res.microversion = microversion
+    res._translate_response(response, has_body=has_body)
+    # direct comparision to False since we need to rule out None
+    if res.has_body and res.create_returns_body is False:
+        # fetch the body if it's required but not returned by create
+        return await fetch(proxy, res)
+    return res
+
+
+async def fetch(proxy, res, requires_id=True, base_path=None,
+                error_message=None, **params):
+    """Get a remote resource based on this instance.
+
+    See :meth:`openstack.resource.Resource.fetch`.
+    """
+    if not res.allow_fetch:
+        raise exceptions.MethodNotSupported(res, "fetch")
+
+    request = res._prepare_request(requires_id=requires_id,
+                                   base_path=base_path)
+    microversion = await proxy._run_sync(
+        res._get_microversion_for, proxy.adapter, 'fetch')
+    response = await proxy.request(request.url, 'GET', params=params,
+                                   microversion=microversion)
+    kwargs = {}
+    if error_message:
+        kwargs['error_message'] = error_message
+
+    res.microversion = microversion
+    res._translate_response(response, **kwargs)
+    return res
+
+
+async def head(proxy, res, base_path=None):
+    """Get headers from a remote resource based on this instance.
+
+    See :meth:`openstack.resource.Resource.head`.
+    """
+    if not res.allow_head:
+        raise exceptions.MethodNotSupported(res, "head")
+
+    request = res._prepare_request(base_path=base_path)
+    microversion = await proxy._run_sync(
+        res._get_microversion_for, proxy.adapter, 'fetch')
+    response = await proxy.request(request.url, 'HEAD',
+                                   headers={"Accept": ""},
+                                   microversion=microversion)
+
+    res.microversion = microversion
+    res._translate_response(response, has_body=False)
+    return res
+
+
+async def commit(proxy, res, prepend_key=True, has_body=True,
+                 base_path=None):
+    """Commit the state of the instance to the remote resource.
+
+    See :meth:`openstack.resource.Resource.commit`.
+    """
+    # The id cannot be dirty for an commit
+    res._body._dirty.discard("id")
+
+    # Only try to update if we actually have anything to commit.
+    if not res.requires_commit:
+        return res
+
+    if not res.allow_commit:
+        raise exceptions.MethodNotSupported(res, "commit")
+
+    kwargs = {}
+    if res.commit_jsonpatch:
+        kwargs['patch'] = True
+
+    request = res._prepare_request(prepend_key=prepend_key,
+                                   base_path=base_path, **kwargs)
+    microversion = await proxy._run_sync(
+        res._get_microversion_for, proxy.adapter, 'commit')
+    response = await proxy.request(
+        request.url, res.commit_method, json=request.body,
+        headers=request.headers, microversion=microversion)
+
+    res.microversion = microversion
+    res._translate_response(response, has_body=has_body)
+    return res
+
+
+async def delete(proxy, res, error_message=None):
+    """Delete the remote resource based on this instance.
+
+    See :meth:`openstack.resource.Resource.delete`.
+    """
+    if not res.allow_delete:
+        raise exceptions.MethodNotSupported(res, "delete")
+
+    request = res._prepare_request()
+    microversion = await proxy._run_sync(
+        res._get_microversion_for, proxy.adapter, 'delete')
+    response = await proxy.request(request.url, 'DELETE',
+                                   headers={"Accept": ""},
+                                   microversion=microversion)
+    kwargs = {}
+    if error_message:
+        kwargs['error_message'] = error_message
+
+    res._translate_response(response, has_body=False, **kwargs)
+    return res
+
+
+async def list(proxy, resource_type, paginated=True, base_path=None,
+               allow_unknown_params=False, **params):
+    """Asynchronous generator which yields resource objects.
+
+    See :meth:`openstack.resource.Resource.list`.
+    """
+    if not resource_type.allow_list:
+        raise exceptions.MethodNotSupported(resource_type, "list")
+    microversion = await proxy._run_sync(
+        resource_type._get_microversion_for_list, proxy.adapter)
+
+    if base_path is None:
+        base_path = resource_type.base_path
+    params = resource_type._query_mapping._validate(
+        params, base_path=base_path,
+        allow_unknown_params=allow_unknown_params)
+    query_params = resource_type._query_mapping._transpose(params)
+    uri = base_path % params
+    limit = query_params.get('limit')
+    connection = proxy.adapter._get_connection()
+
+    # Track the total number of resources yielded so we can paginate
+    # swift objects
+    total_yielded = 0
+    while uri:
+        response = await proxy.request(
+            uri, 'GET', headers={"Accept": "application/json"},
+            params=query_params, microversion=microversion)
+        exceptions.raise_from_response(response)
+        data, resources = resource_type._parse_list_response(response)
+
+        # Discard any existing pagination keys
+        query_params.pop('marker', None)
+        query_params.pop('limit', None)
+
+        page = _resource._ListPage(
+            resource_type, resources, microversion, connection)
+        for value in page:
+            yield value
+        total_yielded += page.count
+
+        if not (page.count and paginated):
+            return
+        uri, next_params = resource_type._get_next_link(
+            uri, response, data, page.marker, limit, total_yielded)
+        query_params.update(next_params)
+
+
+async def wait_for_status(proxy, res, status, failures, interval=None,
+                          wait=None, attribute='status', strategy=None,
+                          max_wait=None):
+    """Wait for the resource to be in a particular status.
+
+    See :func:`openstack.resource.wait_for_status`. Other coroutines keep
+    running while waiting.
+    """
+    log = _log.setup_logging(__name__)
+
+    current_status = getattr(res, attribute)
+    if _resource._normalize_status(current_status) == status.lower():
+        return res
+
+    if failures is None:
+        failures = ['ERROR']
+
+    failures = [f.lower() for f in failures]
+    name = "{res}:{id}".format(res=res.__class__.__name__, id=res.id)
+    msg = "Timeout waiting for {name} to transition to {status}".format(
+        name=name, status=status)
+
+    strategy = _resource._get_wait_strategy(proxy.adapter, strategy)
+    max_wait = _resource._get_wait_max(proxy.adapter, max_wait)
+    async for count in _iterate_timeout(
+            wait, msg, interval, strategy, max_wait):
+        res = await fetch(proxy, res)
+
+        if not res:
+            raise exceptions.ResourceFailure(
+                "{name} went away while waiting for {status}".format(
+                    name=name, status=status))
+
+        new_status = getattr(res, attribute)
+        normalized_status = _resource._normalize_status(new_status)
+        if normalized_status == status.lower():
+            return res
+        elif normalized_status in failures:
+            raise exceptions.ResourceFailure(
+                "{name} transitioned to failure state {status}".format(
+                    name=name, status=new_status))
+
+        log.debug('Still waiting for resource %s to reach state %s, '
+                  'current state is %s', name, status, new_status)
+
+
+async def wait_for_delete(proxy, res, interval, wait, strategy=None,
+                          max_wait=None):
+    """Wait for the resource to be deleted.
+
+    See :func:`openstack.resource.wait_for_delete`. Other coroutines keep
+    running while waiting.
+    """
+    orig_resource = res
+    msg = "Timeout waiting for {res}:{id} to delete".format(
+        res=res.__class__.__name__, id=res.id)
+    strategy = _resource._get_wait_strategy(proxy.adapter, strategy)
+    max_wait = _resource._get_wait_max(proxy.adapter, max_wait)
+    async for count in _iterate_timeout(
+            wait, msg, interval, strategy, max_wait):
+        try:
+            res = await fetch(proxy, res)
+            if not res:
+                return orig_resource
+            if res.status.lower() == 'deleted':
+                return res
+        except exceptions.NotFoundException:
+            return orig_resource
+
+
+async def _iterate_timeout(timeout, message, wait=2, strategy=None,
+                           max_wait=None):
+    """Asynchronous counterpart of :func:`openstack.utils.iterate_timeout`"""
+    try:
+        if wait is None:
+            wait = 2
+        elif wait == 0:
+            # wait should be < timeout, unless timeout is None
+            wait = 0.1 if timeout is None else min(0.1, timeout)
+        wait = float(wait)
+    except ValueError:
+        raise exceptions.SDKException(
+            "Wait value must be an int or float value. {wait} given"
+            " instead".format(wait=wait))
+    intervals = utils.iterate_intervals(wait, strategy, max_wait)
+
+    start = time.time()
+    count = 0
+    while (timeout is None) or (time.time() < start + timeout):
+        count += 1
+        yield count
+        await asyncio.sleep(next(intervals))
+    raise exceptions.ResourceTimeout(message)
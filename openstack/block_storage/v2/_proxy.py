@@ -309,7 +309,7 @@ class Proxy(_base_proxy.BaseBlockStorageProxy):
         return backup.restore(self, volume_id=volume_id, name=name)
 
     def wait_for_status(self, res, status='ACTIVE', failures=None,
-                        interval=2, wait=120):
+                        interval=2, wait=120, strategy=None, max_wait=None):
         """Wait for a resource to be in a particular status.
 
         :param res: The resource to wait on to reach the specified status.
@@ -322,6 +322,12 @@ class Proxy(_base_proxy.BaseBlockStorageProxy):
                          checks. Default to 2.
         :param wait: Maximum number of seconds to wait before the change.
                      Default to 120.
+        :param strategy: How the interval between checks changes over time,
+            see :func:`~openstack.utils.iterate_intervals`. Defaults to the
+            ``wait_strategy`` of the service.
+        :param max_wait: Longest interval between checks for the strategies
+            which increase it. Defaults to the ``wait_max_interval`` of the
+            service, or ten times ``interval``.
         :returns: The resource is returned on success.
         :raises: :class:`~openstack.exceptions.ResourceTimeout` if transition
                  to the desired status failed to occur in specified seconds.
@@ -332,9 +338,11 @@ class Proxy(_base_proxy.BaseBlockStorageProxy):
         """
         failures = ['Error'] if failures is None else failures
         return resource.wait_for_status(
-            self, res, status, failures, interval, wait)
+            self, res, status, failures, interval, wait,
+            strategy=strategy, max_wait=max_wait)
 
-    def wait_for_delete(self, res, interval=2, wait=120):
+    def wait_for_delete(self, res, interval=2, wait=120, strategy=None,
+                        max_wait=None):
         """Wait for a resource to be deleted.
 
         :param res: The resource to wait on to be deleted.
@@ -343,8 +351,15 @@ class Proxy(_base_proxy.BaseBlockStorageProxy):
                          checks. Default to 2.
         :param wait: Maximum number of seconds to wait before the change.
                      Default to 120.
+        :param strategy: How the interval between checks changes over time,
+            see :func:`~openstack.utils.iterate_intervals`. Defaults to the
+            ``wait_strategy`` of the service.
+        :param max_wait: Longest interval between checks for the strategies
+            which increase it. Defaults to the ``wait_max_interval`` of the
+            service, or ten times ``interval``.
         :returns: The resource is returned on success.
         :raises: :class:`~openstack.exceptions.ResourceTimeout` if transition
                  to delete failed to occur in the specified seconds.
         """
-        return resource.wait_for_delete(self, res, interval, wait)
+        return resource.wait_for_delete(self, res, interval, wait,
+                                        strategy=strategy, max_wait=max_wait)
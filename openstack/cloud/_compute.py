@@ -14,6 +14,7 @@
 # We can't just use list, because sphinx gets confused by
 # openstack.resource.Resource.list and openstack.resource2.Resource.list
 import base64
+import collections
 import datetime
 import functools
 import iso8601
@@ -31,6 +32,10 @@ from openstack import exceptions
 from openstack import proxy
 from openstack import utils
 
+# Seconds subtracted from the start of a server listing to get the
+# changes-since of the next incremental listing
+_SERVER_CHANGES_SKEW = 60
+
 
 class ComputeCloudMixin(_normalize.Normalizer):
 
@@ -38,6 +43,16 @@ class ComputeCloudMixin(_normalize.Normalizer):
         self._servers = None
         self._servers_time = 0
         self._servers_lock = threading.Lock()
+        self._servers_dirty = False
+        # State of the incremental server listing
+        self._servers_by_id = None
+        self._servers_listing = None
+        self._servers_changes_since = None
+        self._servers_resync_time = 0
+        self._incremental_server_cache = self.config.config[
+            'incremental_server_cache']
+        self._incremental_server_cache_resync = float(self.config.config[
+            'incremental_server_cache_resync'])
 
     @property
     def _compute_region(self):
@@ -317,29 +332,18 @@ class ComputeCloudMixin(_normalize.Normalizer):
                 filters=filters,
             )
 
-        if (time.time() - self._servers_time) >= self._SERVER_AGE:
-            # Since we're using cached data anyway, we don't need to
-            # have more than one thread actually submit the list
-            # servers task.  Let the first one submit it while holding
-            # a lock, and the non-blocking acquire method will cause
-            # subsequent threads to just skip this and use the old
-            # data until it succeeds.
-            # Initially when we never got data, block to retrieve some data.
-            first_run = self._servers is None
-            if self._servers_lock.acquire(first_run):
-                try:
-                    if not (first_run and self._servers is not None):
-                        self._servers = self._list_servers(
-                            detailed=detailed,
-                            all_projects=all_projects,
-                            bare=bare)
-                        self._servers_time = time.time()
-                finally:
-                    self._servers_lock.release()
+        if self._incremental_server_cache:
+            list_servers = self._list_servers_incremental
+        else:
+            list_servers = self._list_servers
+        servers = self._get_batched_list(
+            'servers', self._SERVER_AGE,
+            lambda: list_servers(
+                detailed=detailed, all_projects=all_projects, bare=bare))
         # Wrap the return with filter_list so that if filters were passed
         # but we were batching/caching and thus always fetching the whole
         # list from the cloud, we still return a filtered list.
-        return _utils._filter_list(self._servers, None, filters)
+        return _utils._filter_list(servers, None, filters)
 
     def _list_servers(self, detailed=False, all_projects=False, bare=False,
                       filters=None):
@@ -352,11 +356,108 @@ class ComputeCloudMixin(_normalize.Normalizer):
             for server in self.compute.servers(
                 all_projects=all_projects, allow_unknown_params=True,
                 **filters)]
+        # Fetch the details of all the servers at once rather than for each
+        # server
+        details = meta.ServerDetailsIndex(self)
         return [
-            self._expand_server(server, detailed, bare)
+            self._expand_server(server, detailed, bare, details=details)
             for server in servers
         ]
 
+    def _list_servers_incremental(self, detailed=False, all_projects=False,
+                                  bare=False):
+        """List servers, only fetching the changes since the last listing.
+
+        The servers of the previous listing are kept by id. The servers which
+        changed since then, including the deleted ones, are listed with the
+        changes-since filter of nova and patched into the previous listing,
+        so that only them are normalized and expanded again.
+
+        Details of the servers which nova does not know about, such as their
+        floating IPs or volumes, and servers deleted long enough ago to be
+        purged from nova, are only seen by a full listing. All the servers
+        are listed again once the previous full listing is older than
+        ``incremental_server_cache_resync`` seconds.
+        """
+        listing = (detailed, all_projects, bare)
+        # Changes made while listing are listed again by the next call
+        changes_since = self._get_servers_changes_since()
+        now = time.time()
+        if (self._servers_by_id is None or self._servers_listing != listing
+                or now - self._servers_resync_time
+                >= self._incremental_server_cache_resync):
+            servers = self._list_servers(
+                detailed=detailed, all_projects=all_projects, bare=bare)
+            self._servers_by_id = collections.OrderedDict(
+                (server['id'], server) for server in servers)
+            self._servers_listing = listing
+            self._servers_changes_since = changes_since
+            self._servers_resync_time = now
+            return servers
+
+        changed = [
+            self._normalize_server(server._to_munch())
+            for server in self.compute.servers(
+                all_projects=all_projects,
+                changes_since=self._servers_changes_since)]
+        self._servers_changes_since = changes_since
+
+        # Expanding a few servers is cheaper one at a time than by listing
+        # the details of all of them
+        details = meta.ServerDetailsIndex(self) if len(changed) > 1 else None
+        new_servers = []
+        for server in changed:
+            if server['status'] == 'DELETED':
+                self._servers_by_id.pop(server['id'], None)
+                continue
+            server = self._expand_server(
+                server, detailed, bare, details=details)
+            if server['id'] in self._servers_by_id:
+                self._servers_by_id[server['id']] = server
+            else:
+                new_servers.append(server)
+        if new_servers:
+            # Nova lists the newest servers first
+            servers_by_id = collections.OrderedDict(
+                (server['id'], server) for server in new_servers)
+            servers_by_id.update(self._servers_by_id)
+            self._servers_by_id = servers_by_id
+        return list(self._servers_by_id.values())
+
+    def _write_through_server(self, server_id, server=None):
+        """Patch a created, updated or deleted server into the cached list.
+
+        This saves fetching the whole list again after each change. The
+        server should be in the form returned by list_servers, it is removed
+        from the list when None.
+        """
+        if not self._SERVER_AGE:
+            return
+        if server is not None:
+            # Callers may modify the server they return, such as setting its
+            # adminPass
+            server = server.copy()
+        with self._servers_lock:
+            self._patch_batched_list('servers', server_id, server)
+            if self._servers_by_id is None:
+                return
+            if server is None:
+                self._servers_by_id.pop(server_id, None)
+            elif server_id in self._servers_by_id:
+                self._servers_by_id[server_id] = server
+            else:
+                servers_by_id = collections.OrderedDict(
+                    [(server_id, server)])
+                servers_by_id.update(self._servers_by_id)
+                self._servers_by_id = servers_by_id
+
+    def _get_servers_changes_since(self):
+        # The time a listing starts, as changes-since of the next one. Nova
+        # compares it with its own clock, so allow for some skew.
+        start = datetime.datetime.utcnow() - datetime.timedelta(
+            seconds=_SERVER_CHANGES_SKEW)
+        return start.strftime('%Y-%m-%dT%H:%M:%SZ')
+
     def list_server_groups(self):
         """List all available server groups.
 
@@ -552,11 +653,12 @@ class ComputeCloudMixin(_normalize.Normalizer):
         server = _utils._get_entity(self, searchfunc, name_or_id, filters)
         return self._expand_server(server, detailed, bare)
 
-    def _expand_server(self, server, detailed, bare):
+    def _expand_server(self, server, detailed, bare, details=None):
         if bare or not server:
             return server
         elif detailed:
-            return meta.get_hostvars_from_server(self, server)
+            return meta.get_hostvars_from_server(
+                self, server, details=details)
         else:
             return meta.add_server_interfaces(self, server)
 
@@ -943,6 +1045,7 @@ class ComputeCloudMixin(_normalize.Normalizer):
                 if server.status == 'ERROR':
                     raise exc.OpenStackCloudCreateException(
                         resource='server', resource_id=server.id)
+                self._write_through_server(server.id, server)
 
         if wait:
             server = self.wait_for_server(
@@ -951,6 +1054,7 @@ class ComputeCloudMixin(_normalize.Normalizer):
                 reuse=reuse_ips, timeout=timeout,
                 nat_destination=nat_destination,
             )
+            self._write_through_server(server['id'], server)
 
         server.adminPass = admin_pass
         return server
@@ -1272,6 +1376,7 @@ class ComputeCloudMixin(_normalize.Normalizer):
             delete_ip_retry=1):
         if not server:
             return False
+        server_id = server['id']
 
         if delete_ips and self._has_floating_ips():
             self._delete_server_floating_ips(server, delete_ip_retry)
@@ -1282,11 +1387,13 @@ class ComputeCloudMixin(_normalize.Normalizer):
                     '/servers/{id}'.format(id=server['id'])),
                 error_message="Error in deleting server")
         except exc.OpenStackCloudURINotFound:
+            self._write_through_server(server_id)
             return False
         except Exception:
             raise
 
         if not wait:
+            self._write_through_server(server_id)
             return True
 
         # If the server has volume attachments, or if it has booted
@@ -1313,9 +1420,7 @@ class ComputeCloudMixin(_normalize.Normalizer):
         if reset_volume_cache:
             self.list_volumes.invalidate(self)
 
-        # Reset the list servers cache time so that the next list server
-        # call gets a new list
-        self._servers_time = self._servers_time - self._SERVER_AGE
+        self._write_through_server(server_id)
         return True
 
     @_utils.valid_kwargs(
@@ -1349,7 +1454,9 @@ class ComputeCloudMixin(_normalize.Normalizer):
             error_message="Error updating server {0}".format(name_or_id))
         server = self._normalize_server(
             self._get_and_munchify('server', data))
-        return self._expand_server(server, bare=bare, detailed=detailed)
+        server = self._expand_server(server, bare=bare, detailed=detailed)
+        self._write_through_server(server['id'], server)
+        return server
 
     def create_server_group(self, name, policies=[], policy=None):
         """Create a new server group.
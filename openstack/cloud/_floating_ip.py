@@ -49,6 +49,7 @@ class FloatingIPCloudMixin(_normalize.Normalizer):
         self._floating_ips = None
         self._floating_ips_time = 0
         self._floating_ips_lock = threading.Lock()
+        self._floating_ips_dirty = False
 
         self._floating_network_by_router = None
         self._floating_network_by_router_run = False
@@ -199,26 +200,12 @@ class FloatingIPCloudMixin(_normalize.Normalizer):
         if filters and self._FLOAT_AGE == 0:
             return self._list_floating_ips(filters)
 
-        if (time.time() - self._floating_ips_time) >= self._FLOAT_AGE:
-            # Since we're using cached data anyway, we don't need to
-            # have more than one thread actually submit the list
-            # floating ips task.  Let the first one submit it while holding
-            # a lock, and the non-blocking acquire method will cause
-            # subsequent threads to just skip this and use the old
-            # data until it succeeds.
-            # Initially when we never got data, block to retrieve some data.
-            first_run = self._floating_ips is None
-            if self._floating_ips_lock.acquire(first_run):
-                try:
-                    if not (first_run and self._floating_ips is not None):
-                        self._floating_ips = self._list_floating_ips()
-                        self._floating_ips_time = time.time()
-                finally:
-                    self._floating_ips_lock.release()
+        floating_ips = self._get_batched_list(
+            'floating_ips', self._FLOAT_AGE, self._list_floating_ips)
         # Wrap the return with filter_list so that if filters were passed
         # but we were batching/caching and thus always fetching the whole
         # list from the cloud, we still return a filtered list.
-        return _utils._filter_list(self._floating_ips, None, filters)
+        return _utils._filter_list(floating_ips, None, filters)
 
     def get_floating_ip_by_id(self, id):
         """ Get a floating ip by ID
@@ -121,7 +121,7 @@ class ImageCloudMixin(_normalize.Normalizer):
 
     def download_image(
             self, name_or_id, output_path=None, output_file=None,
-            chunk_size=1024):
+            chunk_size=1024, workers=None, part_size=None):
         """Download an image by name or ID
 
         :param str name_or_id: Name or ID of the image.
@@ -132,6 +132,12 @@ class ImageCloudMixin(_normalize.Normalizer):
             this or output_path must be specified
         :param int chunk_size: size in bytes to read from the wire and buffer
             at one time. Defaults to 1024
+        :param int workers: Download the image in parts, with up to this
+            number of concurrent ranged requests. output_file must then be
+            opened for reading and writing, such as with mode ``w+b``,
+            otherwise the image is downloaded in a single request.
+        :param int part_size: Size in bytes of the parts downloaded with
+            workers. Defaults to 64 MiB.
 
         :raises: OpenStackCloudException in the event download_image is called
             without exactly one of either output_path or output_file
@@ -154,7 +160,7 @@ class ImageCloudMixin(_normalize.Normalizer):
 
         return self.image.download_image(
             image, output=output_file or output_path,
-            chunk_size=chunk_size)
+            chunk_size=chunk_size, workers=workers, part_size=part_size)
 
     def get_image_exclude(self, name_or_id, exclude):
         for image in self.search_images(name_or_id):
@@ -14,7 +14,6 @@
 # We can't just use list, because sphinx gets confused by
 # openstack.resource.Resource.list and openstack.resource2.Resource.list
 import six
-import time
 import threading
 import types  # noqa
 
@@ -31,6 +30,7 @@ class NetworkCloudMixin(_normalize.Normalizer):
         self._ports = None
         self._ports_time = 0
         self._ports_lock = threading.Lock()
+        self._ports_dirty = False
 
     @_utils.cache_on_arguments()
     def _neutron_extensions(self):
@@ -179,26 +179,12 @@ class NetworkCloudMixin(_normalize.Normalizer):
         if filters and self._PORT_AGE == 0:
             return self._list_ports(filters)
 
-        if (time.time() - self._ports_time) >= self._PORT_AGE:
-            # Since we're using cached data anyway, we don't need to
-            # have more than one thread actually submit the list
-            # ports task.  Let the first one submit it while holding
-            # a lock, and the non-blocking acquire method will cause
-            # subsequent threads to just skip this and use the old
-            # data until it succeeds.
-            # Initially when we never got data, block to retrieve some data.
-            first_run = self._ports is None
-            if self._ports_lock.acquire(first_run):
-                try:
-                    if not (first_run and self._ports is not None):
-                        self._ports = self._list_ports({})
-                        self._ports_time = time.time()
-                finally:
-                    self._ports_lock.release()
+        ports = self._get_batched_list(
+            'ports', self._PORT_AGE, lambda: self._list_ports({}))
         # Wrap the return with filter_list so that if filters were passed
         # but we were batching/caching and thus always fetching the whole
         # list from the cloud, we still return a filtered list.
-        return _utils._filter_list(self._ports, None, filters or {})
+        return _utils._filter_list(ports, None, filters or {})
 
     def _list_ports(self, filters):
         # If the cloud is running nova-network, just return an empty list.
@@ -13,9 +13,9 @@
 # import types so that we can reference ListType in sphinx param declarations.
 # We can't just use list, because sphinx gets confused by
 # openstack.resource.Resource.list and openstack.resource2.Resource.list
-import collections
 import concurrent.futures
 import hashlib
+import itertools
 import json
 import os
 import six
@@ -33,6 +33,8 @@ from openstack import proxy
 
 
 DEFAULT_OBJECT_SEGMENT_SIZE = 1073741824  # 1GB
+# Segments of streamed data are kept in memory while they are uploaded
+DEFAULT_STREAM_SEGMENT_SIZE = 256 * 1024 * 1024
 # This halves the current default for Swift
 DEFAULT_MAX_FILE_SIZE = (5 * 1024 * 1024 * 1024 + 2) / 2
 
@@ -45,9 +47,6 @@ OBJECT_CONTAINER_ACLS = {
 
 class ObjectStoreCloudMixin(_normalize.Normalizer):
 
-    def __init__(self):
-        self.__pool_executor = None
-
     @property
     def _object_store_client(self):
         if 'object-store' not in self._raw_clients:
@@ -55,16 +54,6 @@ class ObjectStoreCloudMixin(_normalize.Normalizer):
             self._raw_clients['object-store'] = raw_client
         return self._raw_clients['object-store']
 
-    @property
-    def _pool_executor(self):
-        if not self.__pool_executor:
-            # TODO(mordred) Make this configurable - and probably use Futurist
-            # instead of concurrent.futures so that people using Eventlet will
-            # be happier.
-            self.__pool_executor = concurrent.futures.ThreadPoolExecutor(
-                max_workers=5)
-        return self.__pool_executor
-
     def list_containers(self, full_listing=True, prefix=None):
         """List containers.
 
@@ -213,10 +202,8 @@ class ObjectStoreCloudMixin(_normalize.Normalizer):
             "Could not determine container access for ACL: %s." % acl)
 
     def _get_file_hashes(self, filename):
-        file_key = "{filename}:{mtime}".format(
-            filename=filename,
-            mtime=os.stat(filename).st_mtime)
-        if file_key not in self._file_hash_cache:
+        (md5, sha256) = self._get_cached_file_hashes(filename)
+        if md5 is None:
             self.log.debug(
                 'Calculating hashes for %(filename)s', {'filename': filename})
             md5 = hashlib.md5()
@@ -225,15 +212,40 @@ class ObjectStoreCloudMixin(_normalize.Normalizer):
                 for chunk in iter(lambda: file_obj.read(8192), b''):
                     md5.update(chunk)
                     sha256.update(chunk)
-            self._file_hash_cache[file_key] = dict(
-                md5=md5.hexdigest(), sha256=sha256.hexdigest())
-            self.log.debug(
-                "Image file %(filename)s md5:%(md5)s sha256:%(sha256)s",
-                {'filename': filename,
-                 'md5': self._file_hash_cache[file_key]['md5'],
-                 'sha256': self._file_hash_cache[file_key]['sha256']})
-        return (self._file_hash_cache[file_key]['md5'],
-                self._file_hash_cache[file_key]['sha256'])
+            (md5, sha256) = (md5.hexdigest(), sha256.hexdigest())
+            self._set_file_hashes(filename, md5, sha256)
+        return (md5, sha256)
+
+    def _get_cached_file_hashes(self, filename):
+        """Get the hashes of a file only if they are already known
+
+        :returns: A tuple of md5 and sha256, both None if the hashes of the
+            file have not been calculated yet.
+        """
+        return self._file_hash_cache.get(filename) or (None, None)
+
+    def _set_file_hashes(self, filename, md5, sha256):
+        self._file_hash_cache.set(filename, md5, sha256)
+        self.log.debug(
+            "Image file %(filename)s md5:%(md5)s sha256:%(sha256)s",
+            {'filename': filename, 'md5': md5, 'sha256': sha256})
+
+    def _get_hasher_headers(self, hasher, headers):
+        """Get headers with the checksums computed while uploading a file
+
+        The hashes are also remembered so that they do not need to be
+        computed again for the same file.
+
+        :param hasher: The :class:`~openstack.cloud._utils.FileHasher` used
+            while uploading the file.
+        :param headers: The headers of the upload.
+        """
+        (md5, sha256) = hasher.hexdigests()
+        self._set_file_hashes(hasher.filename, md5, sha256)
+        headers = headers.copy()
+        headers[self._OBJECT_MD5_KEY] = md5
+        headers[self._OBJECT_SHA256_KEY] = sha256
+        return headers
 
     @_utils.cache_on_arguments()
     def get_object_capabilities(self):
@@ -301,13 +313,20 @@ class ObjectStoreCloudMixin(_normalize.Normalizer):
                     container=container, name=name))
             return True
 
-        if not (file_md5 or file_sha256):
-            (file_md5, file_sha256) = self._get_file_hashes(filename)
         md5_key = metadata.get(
             self._OBJECT_MD5_KEY, metadata.get(self._SHADE_OBJECT_MD5_KEY, ''))
         sha256_key = metadata.get(
             self._OBJECT_SHA256_KEY, metadata.get(
                 self._SHADE_OBJECT_SHA256_KEY, ''))
+        if not (md5_key or sha256_key):
+            # Nothing to compare with, no need to hash the file
+            self.log.debug(
+                "swift stale check, no checksums: {container}/{name}".format(
+                    container=container, name=name))
+            return True
+
+        if not (file_md5 or file_sha256):
+            (file_md5, file_sha256) = self._get_file_hashes(filename)
         up_to_date = self._hashes_up_to_date(
             md5=file_md5, sha256=file_sha256,
             md5_key=md5_key, sha256_key=sha256_key)
@@ -357,7 +376,7 @@ class ObjectStoreCloudMixin(_normalize.Normalizer):
             self, container, name, filename=None,
             md5=None, sha256=None, segment_size=None,
             use_slo=True, metadata=None,
-            generate_checksums=None, data=None,
+            generate_checksums=None, data=None, resume=False,
             **headers):
         """Create a file object.
 
@@ -369,7 +388,14 @@ class ObjectStoreCloudMixin(_normalize.Normalizer):
         :param filename: The path to the local file whose contents will be
             uploaded. Mutually exclusive with data.
         :param data: The content to upload to the object. Mutually exclusive
-           with filename.
+           with filename. Either bytes, or a file-like object or an iterable
+           of bytes which is streamed. Streams larger than ``segment_size``,
+           which defaults to 256 MiB for them, are uploaded as a large object
+           whose segments are uploaded concurrently. As many segments as the
+           executor of the connection has workers are kept in memory. Unless
+           ``generate_checksums`` is False, the checksums of such large
+           objects are computed as the segments are cut and set with the
+           manifest.
         :param md5: A hexadecimal md5 of the file. (Optional), if it is known
             and can be passed here, it will save repeating the expensive md5
             process. It is assumed to be accurate.
@@ -386,9 +412,17 @@ class ObjectStoreCloudMixin(_normalize.Normalizer):
             (optional, defaults to True)
         :param generate_checksums: Whether to generate checksums on the client
             side that get added to headers for later prevention of double
-            uploads of identical data. (optional, defaults to True)
+            uploads of identical data. (optional, defaults to True). Unless
+            they are needed to compare the file with an existing object, the
+            checksums are computed while uploading so that the file is only
+            read once. They are then set after the upload of the object, or
+            with the manifest of large objects.
         :param metadata: This dict will get changed into headers that set
             metadata of the object
+        :param resume: Whether to resume a previous upload of a large object
+            which was interrupted. The segments already uploaded are listed
+            and only the ones missing, or whose size or md5 do not match the
+            file, are uploaded again. (optional, defaults to False)
 
         :raises: ``OpenStackCloudException`` on operation error.
         """
@@ -401,6 +435,8 @@ class ObjectStoreCloudMixin(_normalize.Normalizer):
         if data is not None and generate_checksums:
             raise ValueError(
                 "checksums cannot be generated with data parameter")
+        # Streamed large objects are hashed as their segments are cut
+        hash_stream = generate_checksums is None
         if generate_checksums is None:
             if data is not None:
                 generate_checksums = False
@@ -414,7 +450,8 @@ class ObjectStoreCloudMixin(_normalize.Normalizer):
             filename = name
 
         if generate_checksums and (md5 is None or sha256 is None):
-            (md5, sha256) = self._get_file_hashes(filename)
+            # Hashes not known yet are computed while uploading
+            (md5, sha256) = self._get_cached_file_hashes(filename)
         if md5:
             headers[self._OBJECT_MD5_KEY] = md5 or ''
         if sha256:
@@ -432,6 +469,18 @@ class ObjectStoreCloudMixin(_normalize.Normalizer):
                 "swift uploading data to %(endpoint)s",
                 {'endpoint': endpoint})
 
+            if _utils.is_stream(data):
+                segment_size = self.get_object_segment_size(
+                    int(segment_size or DEFAULT_STREAM_SEGMENT_SIZE))
+                segments = _utils.get_data_segments(data, segment_size)
+                data = next(segments, b'')
+                if len(data) == segment_size:
+                    # The first segment is not kept in memory during the
+                    # whole upload.
+                    segments, data = itertools.chain([data], segments), None
+                    return self._upload_large_object_data(
+                        endpoint, headers, segments, use_slo,
+                        hash_stream and not (md5 and sha256))
             return self._upload_object_data(endpoint, data, headers)
 
         # segment_size gets used as a step value in a range call, so needs
@@ -443,37 +492,67 @@ class ObjectStoreCloudMixin(_normalize.Normalizer):
 
         if self.is_object_stale(container, name, filename, md5, sha256):
 
+            hasher = None
+            if generate_checksums and (md5 is None or sha256 is None):
+                # The stale check hashes the file if it has to be compared
+                # with an existing object.
+                (md5, sha256) = self._get_cached_file_hashes(filename)
+                if md5 is None:
+                    hasher = _utils.FileHasher(filename)
+                else:
+                    headers[self._OBJECT_MD5_KEY] = md5
+                    headers[self._OBJECT_SHA256_KEY] = sha256
+
             self.log.debug(
                 "swift uploading %(filename)s to %(endpoint)s",
                 {'filename': filename, 'endpoint': endpoint})
 
             if file_size <= segment_size:
-                self._upload_object(endpoint, filename, headers)
+                self._upload_object(endpoint, filename, headers, hasher)
             else:
+                uploaded_segments = None
+                if resume:
+                    uploaded_segments = (
+                        self.object_store._get_uploaded_segments(
+                            container, name))
                 self._upload_large_object(
                     endpoint, filename, headers,
-                    file_size, segment_size, use_slo)
+                    file_size, segment_size, use_slo, hasher,
+                    uploaded_segments)
 
     def _upload_object_data(self, endpoint, data, headers):
         return proxy._json_response(self.object_store.put(
             endpoint, headers=headers, data=data))
 
-    def _upload_object(self, endpoint, filename, headers):
-        return proxy._json_response(self.object_store.put(
-            endpoint, headers=headers, data=open(filename, 'rb')))
+    def _upload_object(self, endpoint, filename, headers, hasher=None):
+        if not hasher:
+            return proxy._json_response(self.object_store.put(
+                endpoint, headers=headers, data=open(filename, 'rb')))
+        with open(filename, 'rb') as file_obj:
+            proxy._json_response(self.object_store.put(
+                endpoint, headers=headers,
+                data=_utils.HashingReader(file_obj, hasher)))
+        # POST replaces all the metadata, so send it again with the checksums
+        return proxy._json_response(self.object_store.post(
+            endpoint, headers=self._get_hasher_headers(hasher, headers)))
 
     def _get_file_segments(self, endpoint, filename, file_size, segment_size):
-        # Use an ordered dict here so that testing can replicate things
-        segments = collections.OrderedDict()
-        for (index, offset) in enumerate(range(0, file_size, segment_size)):
-            remaining = file_size - (index * segment_size)
-            segment = _utils.FileSegment(
-                filename, offset,
-                segment_size if segment_size < remaining else remaining)
-            name = '{endpoint}/{index:0>6}'.format(
-                endpoint=endpoint, index=index)
-            segments[name] = segment
-        return segments
+        return _utils.get_file_segments(
+            endpoint, filename, file_size, segment_size)
+
+    def _upload_segment(self, name, headers, segment, hasher, **kwargs):
+        try:
+            return self.object_store.put(
+                name, headers=headers,
+                data=self._get_segment_data(segment, hasher), **kwargs)
+        finally:
+            # The request may fail before the segment was read entirely
+            segment.close()
+
+    def _get_segment_data(self, segment, hasher):
+        if not hasher:
+            return segment
+        return _utils.HashingReader(segment, hasher, segment.offset)
 
     def _object_name_from_url(self, url):
         '''Get container_name/object_name from the full URL called.
@@ -497,11 +576,15 @@ class ObjectStoreCloudMixin(_normalize.Normalizer):
 
     def _upload_large_object(
             self, endpoint, filename,
-            headers, file_size, segment_size, use_slo):
+            headers, file_size, segment_size, use_slo, hasher=None,
+            uploaded_segments=None):
         # If the object is big, we need to break it up into segments that
         # are no larger than segment_size, upload each of them individually
         # and then upload a manifest object. The segments can be uploaded in
         # parallel, so we'll use the async feature of the TaskManager.
+        # When checksums are computed while uploading, the data of the
+        # segments read ahead is kept by the hasher until it can be hashed.
+        # When resuming an upload, the segments already uploaded are skipped.
 
         segment_futures = []
         segment_results = []
@@ -509,20 +592,41 @@ class ObjectStoreCloudMixin(_normalize.Normalizer):
         retry_futures = []
         manifest = []
 
-        # Get an OrderedDict with keys being the swift location for the
-        # segment, the value a FileSegment file-like object that is a
-        # slice of the data for the segment.
-        segments = self._get_file_segments(
-            endpoint, filename, file_size, segment_size)
+        # The FileSegment file-like objects that are a slice of the data
+        # for the segments, by swift location. They only open the file while
+        # they are uploaded.
+        segments = {}
+        running = set()
+        # Segments are produced as the upload of the previous ones finish,
+        # so that no more are pending than the executor can upload at once.
+        executor = self._pool_executor
+        window = _utils.get_max_workers(executor)
+
+        uploaded_segments = uploaded_segments or {}
 
         # Schedule the segments for upload
-        for name, segment in segments.items():
+        for name, segment in self._get_file_segments(
+                endpoint, filename, file_size, segment_size):
+            segments[name] = segment
+            index = name.rsplit('/', 1)[-1]
+            uploaded = uploaded_segments.pop(index, None)
+            if uploaded is not None and _utils.segment_matches(
+                    segment, uploaded, hasher):
+                self.log.debug("swift segment already uploaded: %s", name)
+                manifest.append(dict(
+                    path='/{name}'.format(name=name),
+                    size_bytes=segment.length,
+                    etag=uploaded.etag))
+                continue
             # Async call to put - schedules execution and returns a future
-            segment_future = self._pool_executor.submit(
-                self.object_store.put,
-                name, headers=headers, data=segment,
+            segment_future = executor.submit(
+                self._upload_segment, name, headers, segment, hasher,
                 raise_exc=False)
             segment_futures.append(segment_future)
+            running.add(segment_future)
+            if len(running) >= window:
+                _, running = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED)
             # TODO(mordred) Collect etags from results to add to this manifest
             # dict. Then sort the list of dicts by path.
             manifest.append(dict(
@@ -541,9 +645,8 @@ class ObjectStoreCloudMixin(_normalize.Normalizer):
             segment = segments[name]
             segment.seek(0)
             # Async call to put - schedules execution and returns a future
-            segment_future = self._pool_executor.submit(
-                self.object_store.put,
-                name, headers=headers, data=segment)
+            segment_future = executor.submit(
+                self._upload_segment, name, headers, segment, hasher)
             # TODO(mordred) Collect etags from results to add to this manifest
             # dict. Then sort the list of dicts by path.
             retry_futures.append(segment_future)
@@ -554,6 +657,16 @@ class ObjectStoreCloudMixin(_normalize.Normalizer):
 
         self._add_etag_to_manifest(segment_results, manifest)
 
+        if not use_slo:
+            # Every object of the prefix is part of a dynamic large object,
+            # including the segments of a previous upload of a larger file.
+            for index in uploaded_segments:
+                self.object_store.delete('{endpoint}/{index}'.format(
+                    endpoint=endpoint, index=urllib_parse.quote(index)))
+
+        if hasher:
+            headers = self._get_hasher_headers(hasher, headers)
+
         # If the final manifest upload fails, remove the segments we've
         # already uploaded.
         try:
@@ -576,6 +689,65 @@ class ObjectStoreCloudMixin(_normalize.Normalizer):
                     segment_prefix)
             raise
 
+    def _upload_large_object_data(self, endpoint, headers, segments,
+                                  use_slo, generate_checksums=False):
+        # The segments are read from the stream while the previous ones are
+        # uploaded. No more are pending than the executor uploads at once,
+        # which bounds the memory used to as many segments.
+        executor = self._pool_executor
+        window = _utils.get_max_workers(executor)
+        segment_futures = []
+        running = set()
+        manifest = []
+        md5 = hashlib.md5()
+        sha256 = hashlib.sha256()
+
+        for index, segment in enumerate(segments):
+            name = '{endpoint}/{index:0>6}'.format(
+                endpoint=endpoint, index=index)
+            if generate_checksums:
+                md5.update(segment)
+                sha256.update(segment)
+            segment_future = executor.submit(
+                self._upload_data_segment, name, headers, segment)
+            segment_futures.append(segment_future)
+            running.add(segment_future)
+            manifest.append(dict(
+                path='/{name}'.format(name=name),
+                size_bytes=len(segment)))
+            if len(running) >= window:
+                done, running = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED)
+                # Stop reading the stream once a segment failed
+                for future in done:
+                    future.result()
+
+        segment_results = [future.result() for future in segment_futures]
+        self._add_etag_to_manifest(segment_results, manifest)
+
+        if generate_checksums:
+            headers = headers.copy()
+            headers[self._OBJECT_MD5_KEY] = md5.hexdigest()
+            headers[self._OBJECT_SHA256_KEY] = sha256.hexdigest()
+
+        if use_slo:
+            return self._finish_large_object_slo(endpoint, headers, manifest)
+        else:
+            return self._finish_large_object_dlo(endpoint, headers)
+
+    def _upload_data_segment(self, name, headers, data):
+        # The stream can not be read again, so a failed segment is retried
+        # while its data is still in memory.
+        try:
+            response = self.object_store.put(name, headers=headers, data=data)
+            exceptions.raise_from_response(response)
+        except (keystoneauth1.exceptions.RetriableConnectionFailure,
+                exceptions.HttpException) as e:
+            self.log.debug("Retrying upload of segment %s: %s", name, e)
+            response = self.object_store.put(name, headers=headers, data=data)
+            exceptions.raise_from_response(response)
+        return response
+
     def _finish_large_object_slo(self, endpoint, headers, manifest):
         # TODO(mordred) send an etag of the manifest, which is the md5sum
         # of the concatenation of the etags of the results
@@ -12,17 +12,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 import contextlib
 import fnmatch
 import functools
+import hashlib
+import heapq
 import inspect
 import jmespath
 import munch
 import netifaces
+import operator
+import os
 import re
 import six
 import sre_constants
 import sys
+import threading
 import time
 import uuid
 
@@ -33,6 +39,9 @@ from openstack.cloud import exc
 from openstack.cloud import meta
 
 _decorated_methods = []
+# Number of bytes of a file read ahead of the data hashed that a FileHasher
+# keeps, such as the data of the segments uploaded concurrently.
+FILE_HASHER_BUFFER_SIZE = 64 * 1024 * 1024
 
 
 def _exc_clear():
@@ -70,6 +79,105 @@ def _dictify_resource(resource):
             return resource
 
 
+# Indexes of the cached lists, see _index_list. They are kept beside the
+# lists, which stay plain lists so that callers can serialise them.
+_list_indexes = collections.OrderedDict()
+_list_indexes_lock = threading.Lock()
+_MAX_LIST_INDEXES = 64
+
+
+def _index_list(data, replaces=None):
+    """Make a cached list searchable by id or name.
+
+    :func:`_filter_list` then finds the entries with a given id or name,
+    which all the get_ and search_ methods end up doing, without scanning
+    the whole list. The index is built the first time it is needed. It is
+    not checked against the entries afterwards: a list changed in place
+    must be passed to :func:`_invalidate_list_index`.
+
+    :param data: The list, returned unmodified.
+    :param replaces: A previous version of the list, whose index can be
+        dropped.
+    """
+    if not isinstance(data, list):
+        return data
+    with _list_indexes_lock:
+        if replaces is not None:
+            entry = _list_indexes.get(id(replaces))
+            if entry and entry[0] is replaces:
+                del _list_indexes[id(replaces)]
+        _list_indexes.pop(id(data), None)
+        # The list itself is kept, so that its id is not reused
+        _list_indexes[id(data)] = (data, None)
+        while len(_list_indexes) > _MAX_LIST_INDEXES:
+            _list_indexes.popitem(last=False)
+    return data
+
+
+def _invalidate_list_index(data):
+    """Build the index of an indexed list again on its next lookup."""
+    with _list_indexes_lock:
+        entry = _list_indexes.get(id(data))
+        if entry and entry[0] is data:
+            _list_indexes[id(data)] = (data, None)
+
+
+def _build_list_index(data):
+    index = {}
+    for position, e in enumerate(data):
+        keys = set((_make_unicode(e.get('id', None)),
+                    _make_unicode(e.get('name', None))))
+        for key in keys:
+            if key:
+                index.setdefault(key, []).append(position)
+    return index
+
+
+def _lookup_list(data, name_or_id):
+    """Get the entries of an indexed list whose id or name is name_or_id.
+
+    :returns: A list of the entries, in the order of data, or None when
+        data was not indexed with :func:`_index_list`.
+    """
+    with _list_indexes_lock:
+        entry = _list_indexes.get(id(data))
+    if entry is None or entry[0] is not data:
+        return None
+    index = entry[1]
+    # Entries added or removed in place change the length, which is cheap
+    # to check. Other changes go through _invalidate_list_index.
+    if index is None or index[0] != len(data):
+        index = (len(data), _build_list_index(data))
+        with _list_indexes_lock:
+            if id(data) in _list_indexes:
+                _list_indexes[id(data)] = (data, index)
+    return [data[position] for position in index[1].get(name_or_id, [])]
+
+
+_fnmatch_patterns = {}
+_MAX_FNMATCH_PATTERNS = 256
+
+
+def _is_fnmatch_pattern(name_or_id):
+    return any(c in name_or_id for c in '*?[')
+
+
+def _compile_fnmatch_pattern(name_or_id):
+    """Compile a glob pattern, or return None if it is not valid."""
+    try:
+        return _fnmatch_patterns[name_or_id]
+    except KeyError:
+        pass
+    try:
+        fn_reg = re.compile(fnmatch.translate(name_or_id))
+    except sre_constants.error:
+        fn_reg = None
+    if len(_fnmatch_patterns) >= _MAX_FNMATCH_PATTERNS:
+        _fnmatch_patterns.clear()
+    _fnmatch_patterns[name_or_id] = fn_reg
+    return fn_reg
+
+
 def _filter_list(data, name_or_id, filters):
     """Filter a list by name/ID and arbitrary meta data.
 
@@ -92,6 +200,9 @@ def _filter_list(data, name_or_id, filters):
             }
         OR
         A string containing a jmespath expression for further filtering.
+
+    When data was indexed with :func:`_index_list` and name_or_id is not a
+    pattern, the entries are looked up in its index instead of scanning it.
     """
     # The logger is openstack.cloud.fmmatch to allow a user/operator to
     # configure logging not to communicate about fnmatch misses
@@ -100,16 +211,20 @@ def _filter_list(data, name_or_id, filters):
     if name_or_id:
         # name_or_id might already be unicode
         name_or_id = _make_unicode(name_or_id)
+    matches = None
+    if name_or_id and not _is_fnmatch_pattern(name_or_id):
+        # Without wildcards, the pattern only matches the exact id or name
+        matches = _lookup_list(data, name_or_id)
+    if matches is not None:
+        data = matches
+    elif name_or_id:
         identifier_matches = []
         bad_pattern = False
-        try:
-            fn_reg = re.compile(fnmatch.translate(name_or_id))
-        except sre_constants.error:
-            # If the fnmatch re doesn't compile, then we don't care,
-            # but log it in case the user DID pass a pattern but did
-            # it poorly and wants to know what went wrong with their
-            # search
-            fn_reg = None
+        # If the fnmatch re doesn't compile, then we don't care,
+        # but log it in case the user DID pass a pattern but did
+        # it poorly and wants to know what went wrong with their
+        # search
+        fn_reg = _compile_fnmatch_pattern(name_or_id)
         for e in data:
             e_id = _make_unicode(e.get('id', None))
             e_name = _make_unicode(e.get('name', None))
@@ -385,12 +500,41 @@ def _func_wrap(f):
     # 0.7.0 and later it is impossible to pass bound methods to the
     # decorator. This was introduced when utilizing the decorate module in
     # lieu of a direct wrap implementation.
+    # Lists are also indexed before being cached, see _index_list.
     @functools.wraps(f)
     def inner(*args, **kwargs):
-        return f(*args, **kwargs)
+        return _index_list(f(*args, **kwargs))
+    # The cache keys are made from the arguments of the original method, see
+    # get_cache_arguments.
+    inner._cached_func = getattr(f, '__func__', f)
     return inner
 
 
+def get_cache_arguments(func, args, kwargs):
+    """Get the arguments of a call to a cached method by name.
+
+    Defaults are included, so that a call gets the same cache key however
+    its arguments are passed, and the ``invalidate`` of cached methods drops
+    the entries of calls made with their default arguments.
+
+    :param func: The cached method, or its wrapper made by ``_func_wrap``.
+    :param args: The positional arguments of the call, without ``self``.
+    :param kwargs: The keyword arguments of the call.
+    """
+    func = getattr(func, '_cached_func', func)
+    argspec = (getattr(inspect, 'getfullargspec', None)
+               or inspect.getargspec)(func)
+    names = argspec.args[1:]
+    defaults = argspec.defaults or ()
+    call_args = dict(zip(names[len(names) - len(defaults):], defaults))
+    call_args.update(zip(names, args))
+    call_args.update(kwargs)
+    if len(args) > len(names):
+        call_args['*'] = list(args[len(names):])
+    call_args.pop('cache', None)
+    return call_args
+
+
 def cache_on_arguments(*cache_on_args, **cache_on_kwargs):
     _cache_name = cache_on_kwargs.pop('resource', None)
 
@@ -592,69 +736,86 @@ def parse_range(value):
     return (op, num)
 
 
-def range_filter(data, key, range_exp):
-    """Filter a list by a single range expression.
+_RANGE_OPERATORS = {
+    None: operator.eq,
+    '<': operator.lt,
+    '>': operator.gt,
+    '<=': operator.le,
+    '>=': operator.ge,
+}
 
-    :param list data: List of dictionaries to be searched.
-    :param string key: Key name to search within the data set.
-    :param string range_exp: The expression describing the range of values.
 
-    :returns: A list subset of the original data set.
+class RangeFilter(object):
+    """Range expressions compiled once to filter lists of dictionaries.
+
+    The expressions are parsed when the filter is created, so the same
+    filter can be used on several data sets without parsing them again.
+    Each dictionary of a data set is tested against all the expressions in
+    a single pass. The minimum and maximum values needed by "MIN" and "MAX"
+    expressions are computed once per key and data set.
+
+    :param dict filters: Dict describing the one or more range searches to
+        perform, as given to ``range_search``.
     :raises: OpenStackCloudException on invalid range expressions.
     """
-    filtered = []
-    range_exp = str(range_exp).upper()
 
-    if range_exp == "MIN":
-        key_min = safe_dict_min(key, data)
-        if key_min is None:
-            return []
-        for d in data:
-            if int(d[key]) == key_min:
-                filtered.append(d)
-        return filtered
-    elif range_exp == "MAX":
-        key_max = safe_dict_max(key, data)
-        if key_max is None:
-            return []
+    def __init__(self, filters):
+        self._expressions = []
+        for key, range_exp in filters.items():
+            range_exp = str(range_exp).upper()
+            if range_exp in ('MIN', 'MAX'):
+                self._expressions.append((key, range_exp, None))
+                continue
+            val_range = parse_range(range_exp)
+            # If parsing the range fails, it must be a bad value.
+            if val_range is None:
+                raise exc.OpenStackCloudException(
+                    "Invalid range value: {value}".format(value=range_exp))
+            self._expressions.append(
+                (key, _RANGE_OPERATORS[val_range[0]], val_range[1]))
+
+    def filter(self, data):
+        """Filter a data set.
+
+        Dictionaries which do not contain one of the keys do not match.
+
+        :param list data: List of dictionaries to be searched.
+
+        :returns: A list subset of the data set, in the same order.
+        """
+        tests = []
+        for key, op, num in self._expressions:
+            if op == 'MIN':
+                op, num = operator.eq, safe_dict_min(key, data)
+            elif op == 'MAX':
+                op, num = operator.eq, safe_dict_max(key, data)
+            if num is None:
+                # The key is in none of the dictionaries
+                return []
+            tests.append((key, op, num))
+
+        filtered = []
         for d in data:
-            if int(d[key]) == key_max:
+            for key, op, num in tests:
+                value = d.get(key)
+                if value is None or not op(int(value), num):
+                    break
+            else:
                 filtered.append(d)
         return filtered
 
-    # Not looking for a min or max, so a range or exact value must
-    # have been supplied.
-    val_range = parse_range(range_exp)
 
-    # If parsing the range fails, it must be a bad value.
-    if val_range is None:
-        raise exc.OpenStackCloudException(
-            "Invalid range value: {value}".format(value=range_exp))
+def range_filter(data, key, range_exp):
+    """Filter a list by a single range expression.
 
-    op = val_range[0]
-    if op:
-        # Range matching
-        for d in data:
-            d_val = int(d[key])
-            if op == '<':
-                if d_val < val_range[1]:
-                    filtered.append(d)
-            elif op == '>':
-                if d_val > val_range[1]:
-                    filtered.append(d)
-            elif op == '<=':
-                if d_val <= val_range[1]:
-                    filtered.append(d)
-            elif op == '>=':
-                if d_val >= val_range[1]:
-                    filtered.append(d)
-        return filtered
-    else:
-        # Exact number match
-        for d in data:
-            if int(d[key]) == val_range[1]:
-                filtered.append(d)
-        return filtered
+    :param list data: List of dictionaries to be searched.
+    :param string key: Key name to search within the data set.
+    :param string range_exp: The expression describing the range of values.
+
+    :returns: A list subset of the original data set.
+    :raises: OpenStackCloudException on invalid range expressions.
+    """
+    return RangeFilter({key: range_exp}).filter(data)
 
 
 def generate_patches_from_kwargs(operation, **kwargs):
@@ -675,41 +836,284 @@ def generate_patches_from_kwargs(operation, **kwargs):
     return sorted(patches)
 
 
+class SharedFile(object):
+    """A file read at given offsets by several threads.
+
+    The file is only open while at least one reader uses it, and all of them
+    share the same descriptor.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._fd = None
+        self._readers = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if self._fd is None:
+                self._fd = os.open(
+                    self.filename, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+            self._readers += 1
+
+    def release(self):
+        with self._lock:
+            self._readers -= 1
+            if not self._readers:
+                os.close(self._fd)
+                self._fd = None
+
+    def pread(self, size, offset):
+        if hasattr(os, 'pread'):
+            return os.pread(self._fd, size, offset)
+        with self._lock:
+            os.lseek(self._fd, offset, os.SEEK_SET)
+            return os.read(self._fd, size)
+
+
 class FileSegment(object):
-    """File-like object to pass to requests."""
+    """File-like object to pass to requests.
 
-    def __init__(self, filename, offset, length):
+    The file is opened when the segment is first read and closed once it was
+    read entirely, or by :meth:`close`.
+
+    :param shared_file: The :class:`SharedFile` to read from, shared with
+        the other segments of the file.
+    """
+
+    def __init__(self, filename, offset, length, shared_file=None):
         self.filename = filename
         self.offset = offset
         self.length = length
         self.pos = 0
-        self._file = open(filename, 'rb')
-        self.seek(0)
+        self._file = shared_file or SharedFile(filename)
+        self._reading = False
 
     def tell(self):
-        return self._file.tell() - self.offset
+        return self.pos
 
     def seek(self, offset, whence=0):
         if whence == 0:
-            self._file.seek(self.offset + offset, whence)
+            self.pos = offset
         elif whence == 1:
-            self._file.seek(offset, whence)
+            self.pos += offset
         elif whence == 2:
-            self._file.seek(self.offset + self.length - offset, 0)
+            self.pos = self.length - offset
 
     def read(self, size=-1):
         remaining = self.length - self.pos
         if remaining <= 0:
+            self.close()
             return b''
 
+        if not self._reading:
+            self._file.acquire()
+            self._reading = True
         to_read = remaining if size < 0 else min(size, remaining)
-        chunk = self._file.read(to_read)
+        chunk = self._file.pread(to_read, self.offset + self.pos)
         self.pos += len(chunk)
+        if not chunk or self.pos >= self.length:
+            self.close()
 
         return chunk
 
     def reset(self):
-        self._file.seek(self.offset, 0)
+        self.seek(0)
+
+    def close(self):
+        if self._reading:
+            self._reading = False
+            self._file.release()
+
+
+def get_file_segments(endpoint, filename, file_size, segment_size):
+    """Generate the segments of a large object.
+
+    :returns: A generator of the names and :class:`FileSegment` of the
+        segments, which share a single descriptor of the file.
+    """
+    shared_file = SharedFile(filename)
+    for (index, offset) in enumerate(range(0, file_size, segment_size)):
+        name = '{endpoint}/{index:0>6}'.format(endpoint=endpoint, index=index)
+        yield name, FileSegment(
+            filename, offset, min(segment_size, file_size - offset),
+            shared_file)
+
+
+def is_stream(data):
+    """Whether data to upload is a file-like object or an iterable."""
+    return not isinstance(
+        data, (six.binary_type, bytearray, memoryview, six.text_type))
+
+
+def get_data_segments(data, segment_size):
+    """Cut a stream of data into segments.
+
+    :param data: A file-like object or an iterable of bytes.
+    :param int segment_size: Size of the segments.
+    :returns: A generator of the bytes of each segment, all of
+        ``segment_size`` but the last one.
+    """
+    buffer = bytearray()
+    if hasattr(data, 'read'):
+        # Only read what the current segment misses. Text files end with an
+        # empty string rather than bytes.
+        chunks = iter(
+            lambda: data.read(segment_size - len(buffer)) or b'', b'')
+    else:
+        chunks = iter(data)
+    for chunk in chunks:
+        if isinstance(chunk, six.text_type):
+            chunk = chunk.encode('utf-8')
+        buffer += chunk
+        while len(buffer) >= segment_size:
+            yield bytes(buffer[:segment_size])
+            del buffer[:segment_size]
+    if buffer:
+        yield bytes(buffer)
+
+
+def get_max_workers(executor, default=5):
+    """Get the number of calls an executor runs at once."""
+    return getattr(executor, '_max_workers', None) or default
+
+
+def segment_matches(segment, uploaded, hasher=None):
+    """Whether a segment of a file was already uploaded.
+
+    The md5 of the segment is compared with the etag of the uploaded object
+    when their sizes match. The segment is read again from its start
+    afterwards.
+
+    :param segment: The :class:`FileSegment` to upload.
+    :param uploaded: The :class:`~openstack.object_store.v1.obj.Object` of
+        the segment listed in the container.
+    :param hasher: The :class:`FileHasher` of the whole file, given the data
+        of the segment.
+    """
+    if uploaded.content_length != segment.length or not uploaded.etag:
+        return False
+    md5 = hashlib.md5()
+    segment.seek(0)
+    for chunk in iter(lambda: segment.read(65536), b''):
+        if hasher:
+            hasher.update(segment.offset + segment.pos - len(chunk), chunk)
+        md5.update(chunk)
+    segment.seek(0)
+    return md5.hexdigest() == uploaded.etag.strip('"')
+
+
+class FileHasher(object):
+    """Compute the md5 and sha256 of a file while it is read for upload.
+
+    Data read from the file is given to :meth:`update` along with its offset
+    in the file. Data following what was already hashed is hashed at once,
+    and data read ahead of it, such as by the concurrent uploads of the
+    segments of a large object, is kept until the data before it was seen.
+    Reading a part of the file again (when retrying a request for instance)
+    does not change the result. Whatever was not seen while uploading, or
+    did not fit in the buffer of data read ahead, is read from the file by
+    :meth:`hexdigests`.
+
+    :param filename: Path of the file being read.
+    :param hashers: Additional objects with an ``update`` method to feed with
+        the file contents, such as an
+        :class:`~openstack.image.image_signer.ImageSigner`.
+    :param int max_buffer_size: Number of bytes read ahead which can be kept.
+    """
+
+    def __init__(self, filename, hashers=None,
+                 max_buffer_size=FILE_HASHER_BUFFER_SIZE):
+        self.filename = filename
+        self.md5 = hashlib.md5()
+        self.sha256 = hashlib.sha256()
+        self._hashers = [self.md5, self.sha256] + list(hashers or [])
+        self.offset = 0
+        self.max_buffer_size = max_buffer_size
+        # Data read ahead by offset, with a heap of the offsets
+        self._pending = {}
+        self._pending_offsets = []
+        self._pending_size = 0
+        self._lock = threading.Lock()
+
+    def update(self, offset, data):
+        with self._lock:
+            if offset > self.offset:
+                self._keep(offset, data)
+            else:
+                self._hash(offset, data)
+                self._flush()
+
+    def _hash(self, offset, data):
+        start = self.offset - offset
+        if start < 0 or start >= len(data):
+            return
+        if start:
+            data = data[start:]
+        for hasher in self._hashers:
+            hasher.update(data)
+        self.offset += len(data)
+
+    def _keep(self, offset, data):
+        if (not data or offset in self._pending
+                or self._pending_size + len(data) > self.max_buffer_size):
+            # Read again by hexdigests if it is still missing
+            return
+        self._pending[offset] = data
+        heapq.heappush(self._pending_offsets, offset)
+        self._pending_size += len(data)
+
+    def _flush(self):
+        while (self._pending_offsets
+               and self._pending_offsets[0] <= self.offset):
+            offset = heapq.heappop(self._pending_offsets)
+            data = self._pending.pop(offset)
+            self._pending_size -= len(data)
+            self._hash(offset, data)
+
+    def hexdigests(self):
+        """Return the md5 and sha256 hexdigests of the whole file."""
+        with open(self.filename, 'rb') as file_obj:
+            while True:
+                with self._lock:
+                    self._flush()
+                    offset = self.offset
+                    # Only read up to the data already kept
+                    size = 65536
+                    if self._pending_offsets:
+                        size = min(size, self._pending_offsets[0] - offset)
+                file_obj.seek(offset)
+                chunk = file_obj.read(size)
+                if not chunk:
+                    break
+                self.update(offset, chunk)
+        return (self.md5.hexdigest(), self.sha256.hexdigest())
+
+
+class HashingReader(object):
+    """File-like object giving what is read to a :class:`FileHasher`.
+
+    :param file_obj: The file or :class:`FileSegment` to read from.
+    :param hasher: The :class:`FileHasher` of the whole file.
+    :param offset: Offset of the start of ``file_obj`` in the file.
+    """
+
+    def __init__(self, file_obj, hasher, offset=0):
+        self._file = file_obj
+        self._hasher = hasher
+        self._offset = offset
+
+    def tell(self):
+        return self._file.tell()
+
+    def seek(self, offset, whence=0):
+        return self._file.seek(offset, whence)
+
+    def read(self, size=-1):
+        position = self._file.tell()
+        chunk = self._file.read(size)
+        self._hasher.update(self._offset + position, chunk)
+        return chunk
 
 
 def _format_uuid_string(string):
@@ -45,6 +45,8 @@ def parse_args():
                         help='Output data in nicely readable yaml')
     parser.add_argument('--debug', action='store_true', default=False,
                         help='Enable debug output')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Maximum number of clouds to query concurrently')
     return parser.parse_args()
 
 
@@ -54,7 +56,7 @@ def main():
         openstack.enable_logging(debug=args.debug)
         inventory = openstack.cloud.inventory.OpenStackInventory(
             refresh=args.refresh, private=args.private,
-            cloud=args.cloud)
+            cloud=args.cloud, max_workers=args.workers)
         if args.list:
             output = inventory.list_hosts()
         elif args.host:
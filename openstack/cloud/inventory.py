@@ -12,8 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import concurrent.futures
 import functools
+import time
 
+from openstack import _log
 from openstack.config import loader
 from openstack import connection
 from openstack import exceptions
@@ -21,6 +24,9 @@ from openstack.cloud import _utils
 
 __all__ = ['OpenStackInventory']
 
+# Default maximum number of clouds to collect hosts from at the same time
+DEFAULT_MAX_WORKERS = 8
+
 
 class OpenStackInventory(object):
 
@@ -30,7 +36,15 @@ class OpenStackInventory(object):
     def __init__(
             self, config_files=None, refresh=False, private=False,
             config_key=None, config_defaults=None, cloud=None,
-            use_direct_get=False):
+            use_direct_get=False, max_workers=None):
+        """Inventory of the servers of one or all configured clouds.
+
+        :param max_workers: Maximum number of clouds to list the servers of
+            concurrently. Defaults to the number of clouds, up to
+            ``DEFAULT_MAX_WORKERS``.
+        """
+        self.log = _log.setup_logging('openstack')
+        self.max_workers = max_workers
         if config_files is None:
             config_files = []
         config = loader.OpenStackConfig(
@@ -59,21 +73,58 @@ class OpenStackInventory(object):
 
     def list_hosts(self, expand=True, fail_on_cloud_config=True,
                    all_projects=False):
+        """List the servers of all the clouds.
+
+        The servers of the different clouds are listed concurrently, see
+        ``max_workers``. They are returned in the order of the clouds.
+
+        :param bool fail_on_cloud_config: Whether to raise the error of a
+            cloud the servers could not be listed from. If false, the servers
+            of the other clouds are still returned.
+        """
         hostvars = []
+        if not self.clouds:
+            return hostvars
 
-        for cloud in self.clouds:
-            try:
-                # Cycle on servers
-                for server in cloud.list_servers(detailed=expand,
-                                                 all_projects=all_projects):
-                    hostvars.append(server)
-            except exceptions.OpenStackCloudException:
-                # Don't fail on one particular cloud as others may work
-                if fail_on_cloud_config:
-                    raise
+        max_workers = self.max_workers or min(
+            len(self.clouds), DEFAULT_MAX_WORKERS)
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+            futures = [
+                executor.submit(
+                    self._list_cloud_hosts, cloud, expand, all_projects)
+                for cloud in self.clouds]
+            for future in futures:
+                try:
+                    hostvars.extend(future.result())
+                except exceptions.OpenStackCloudException:
+                    # Don't fail on one particular cloud as others may work
+                    if fail_on_cloud_config:
+                        for pending in futures:
+                            pending.cancel()
+                        raise
 
         return hostvars
 
+    def _list_cloud_hosts(self, cloud, expand, all_projects):
+        start = time.time()
+        try:
+            servers = cloud.list_servers(
+                detailed=expand, all_projects=all_projects)
+        except exceptions.OpenStackCloudException:
+            self.log.debug(
+                "Failed to list servers of cloud %(cloud)s region %(region)s"
+                " after %(elapsed).2f seconds",
+                {'cloud': cloud.name, 'region': cloud.config.region_name,
+                 'elapsed': time.time() - start}, exc_info=True)
+            raise
+        self.log.debug(
+            "Listed %(count)d servers of cloud %(cloud)s region %(region)s"
+            " in %(elapsed).2f seconds",
+            {'count': len(servers), 'cloud': cloud.name,
+             'region': cloud.config.region_name,
+             'elapsed': time.time() - start})
+        return servers
+
     def search_hosts(self, name_or_id=None, filters=None, expand=True):
         hosts = self.list_hosts(expand=expand)
         return _utils._filter_list(hosts, name_or_id, filters)
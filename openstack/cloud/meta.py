@@ -393,7 +393,103 @@ def _make_address_dict(fip, port):
     return address
 
 
-def _get_supplemental_addresses(cloud, server):
+class ServerDetailsIndex(object):
+    """Details of the servers of a listing, fetched once for all of them.
+
+    Expanding servers one at a time costs several API calls per server to
+    find their ports, floating IPs, security groups and volumes. Instead, the
+    first time a kind of details is needed, all of them are listed with a
+    single call and indexed by id, so that they are joined with each server
+    in memory.
+
+    :param cloud: the cloud we're working with
+    """
+
+    def __init__(self, cloud):
+        self.cloud = cloud
+        self._indexes = {}
+
+    def _get_index(self, name, list_func, get_keys):
+        if name not in self._indexes:
+            index = {}
+            try:
+                for item in list_func():
+                    for key in get_keys(item):
+                        index.setdefault(key, []).append(item)
+            except exc.OpenStackCloudException as e:
+                # Don't try again for each server
+                index = e
+            self._indexes[name] = index
+        index = self._indexes[name]
+        if isinstance(index, Exception):
+            raise index
+        return index
+
+    def get_ports(self, server):
+        index = self._get_index(
+            'ports', self.cloud.list_ports,
+            lambda port: [port['device_id']])
+        return index.get(server['id'], [])
+
+    def get_floating_ips(self, port):
+        index = self._get_index(
+            'floating_ips', self.cloud.list_floating_ips,
+            lambda fip: [fip['port_id']])
+        return index.get(port['id'], [])
+
+    def get_flavor_name(self, flavor_id):
+        index = self._get_index(
+            'flavors',
+            lambda: self.cloud.list_flavors(get_extra=False),
+            lambda flavor: [flavor['id'], flavor['name']])
+        flavors = index.get(flavor_id)
+        return flavors[0]['name'] if flavors else None
+
+    def get_image_name(self, image_id):
+        index = self._get_index(
+            'images', self.cloud.list_images,
+            lambda image: [image['id'], image['name']])
+        images = index.get(image_id)
+        return images[0]['name'] if images else None
+
+    def get_security_groups(self, server):
+        if not self.cloud._has_secgroups():
+            return []
+        if self.cloud._use_neutron_secgroups():
+            # Neutron security groups are attached to the ports
+            keys = []
+            for port in self.get_ports(server):
+                for group_id in port.get('security_groups') or []:
+                    if group_id not in keys:
+                        keys.append(group_id)
+            index = self._get_index(
+                'security_groups', self._list_neutron_security_groups,
+                lambda group: [group['id']])
+        else:
+            keys = [group['name'] for group in server['security_groups']]
+            index = self._get_index(
+                'security_groups', self.cloud.list_security_groups,
+                lambda group: [group['name']])
+        groups = [index[key][0] for key in keys if key in index]
+        if len(groups) != len(keys):
+            # Groups of other projects are not listed
+            return self.cloud.list_server_security_groups(server)
+        return groups
+
+    def _list_neutron_security_groups(self):
+        return self.cloud._normalize_secgroups(
+            group.to_dict(computed=False)
+            for group in self.cloud.list_security_groups())
+
+    def get_volumes(self, server):
+        index = self._get_index(
+            'volumes', self.cloud.list_volumes,
+            lambda volume: set(
+                attach['server_id'] for attach in volume['attachments']))
+        return index.get(server['id'], [])
+
+
+def _get_supplemental_addresses(cloud, server, details=None):
     fixed_ip_mapping = {}
     for name, network in server['addresses'].items():
         for address in network:
@@ -409,12 +505,20 @@ def _get_supplemental_addresses(cloud, server):
         if (cloud.has_service('network')
                 and cloud._has_floating_ips()
                 and server['status'] == 'ACTIVE'):
-            for port in cloud.search_ports(
-                    filters=dict(device_id=server['id'])):
+            if details is None:
+                ports = cloud.search_ports(
+                    filters=dict(device_id=server['id']))
+            else:
+                ports = details.get_ports(server)
+            for port in ports:
                 # This SHOULD return one and only one FIP - but doing it as a
                 # search/list lets the logic work regardless
-                for fip in cloud.search_floating_ips(
-                        filters=dict(port_id=port['id'])):
+                if details is None:
+                    fips = cloud.search_floating_ips(
+                        filters=dict(port_id=port['id']))
+                else:
+                    fips = details.get_floating_ips(port)
+                for fip in fips:
                     fixed_net = fixed_ip_mapping.get(fip['fixed_ip_address'])
                     if fixed_net is None:
                         log = _log.setup_logging('openstack')
@@ -436,7 +540,7 @@ def _get_supplemental_addresses(cloud, server):
     return server['addresses']
 
 
-def add_server_interfaces(cloud, server):
+def add_server_interfaces(cloud, server, details=None):
     """Add network interface information to server.
 
     Query the cloud as necessary to add information to the server record
@@ -444,10 +548,14 @@ def add_server_interfaces(cloud, server):
 
     Ensures that public_v4, public_v6, private_v4, private_v6, interface_ip,
                  accessIPv4 and accessIPv6 are always set.
+
+    :param details: An optional :class:`ServerDetailsIndex` to get the ports
+                    and floating IPs of the server from.
     """
     # First, add an IP address. Set it to '' rather than None if it does
     # not exist to remain consistent with the pre-existing missing values
-    server['addresses'] = _get_supplemental_addresses(cloud, server)
+    server['addresses'] = _get_supplemental_addresses(
+        cloud, server, details=details)
     server['public_v4'] = get_server_external_ipv4(cloud, server) or ''
     server['public_v6'] = get_server_external_ipv6(server) or ''
     server['private_v4'] = get_server_private_ip(server, cloud) or ''
@@ -466,30 +574,46 @@ def add_server_interfaces(cloud, server):
     return server
 
 
-def expand_server_security_groups(cloud, server):
+def expand_server_security_groups(cloud, server, details=None):
     try:
-        groups = cloud.list_server_security_groups(server)
+        if details is None:
+            groups = cloud.list_server_security_groups(server)
+        else:
+            groups = details.get_security_groups(server)
     except exc.OpenStackCloudException:
         groups = []
     server['security_groups'] = groups or []
 
 
-def get_hostvars_from_server(cloud, server, mounts=None):
+def get_hostvars_from_server(cloud, server, mounts=None, details=None):
     """Expand additional server information useful for ansible inventory.
 
     Variables in this function may make additional cloud queries to flesh out
     possibly interesting info, making it more expensive to call than
     expand_server_vars if caching is not set up. If caching is set up,
     the extra cost should be minimal.
+
+    When expanding many servers, pass the same :class:`ServerDetailsIndex`
+    as ``details`` for all of them so that the number of queries does not
+    grow with the number of servers.
     """
-    server_vars = add_server_interfaces(cloud, server)
+    if details is None:
+        get_flavor_name = cloud.get_flavor_name
+        get_image_name = cloud.get_image_name
+        get_volumes = cloud.get_volumes
+    else:
+        get_flavor_name = details.get_flavor_name
+        get_image_name = details.get_image_name
+        get_volumes = details.get_volumes
+
+    server_vars = add_server_interfaces(cloud, server, details=details)
 
     flavor_id = server['flavor']['id']
-    flavor_name = cloud.get_flavor_name(flavor_id)
+    flavor_name = get_flavor_name(flavor_id)
     if flavor_name:
         server_vars['flavor']['name'] = flavor_name
 
-    expand_server_security_groups(cloud, server)
+    expand_server_security_groups(cloud, server, details=details)
 
     # OpenStack can return image as a string when you've booted from volume
     if str(server['image']) == server['image']:
@@ -498,14 +622,14 @@ def get_hostvars_from_server(cloud, server, mounts=None):
     else:
         image_id = server['image'].get('id', None)
     if image_id:
-        image_name = cloud.get_image_name(image_id)
+        image_name = get_image_name(image_id)
         if image_name:
             server_vars['image']['name'] = image_name
 
     volumes = []
     if cloud.has_service('volume'):
         try:
-            for volume in cloud.get_volumes(server):
+            for volume in get_volumes(server):
                 # Make things easier to consume elsewhere
                 volume['device'] = volume['attachments'][0]['device']
                 volumes.append(volume)
@@ -11,7 +11,10 @@
 # limitations under the License.
 import copy
 import functools
+import hashlib
+import json
 import six
+import time
 # import types so that we can reference ListType in sphinx param declarations.
 # We can't just use list, because sphinx gets confused by
 # openstack.resource.Resource.list and openstack.resource2.Resource.list
@@ -34,11 +37,40 @@ from openstack.cloud import meta
 from openstack.cloud import _utils
 import openstack.config
 from openstack.config import cloud_region as cloud_region_mod
+from openstack import events
+from openstack import file_hash_cache
 from openstack import proxy
 
 DEFAULT_SERVER_AGE = 5
 DEFAULT_PORT_AGE = 5
 DEFAULT_FLOAT_AGE = 5
+# Fraction of their age after which batched lists are refreshed in the
+# background, when background_cache_refresh is enabled
+CACHE_REFRESH_AHEAD = 0.8
+# Bumped when the cached values or their keys change incompatibly, so that
+# processes running different versions can share a cache.
+CACHE_KEY_VERSION = 1
+# Auth values identifying whose data is cached, secrets are never included.
+CACHE_SCOPE_AUTH_KEYS = (
+    'auth_url', 'domain_id', 'domain_name', 'project_id', 'project_name',
+    'project_domain_id', 'project_domain_name', 'user_id', 'username',
+    'user_domain_id', 'user_domain_name')
+# Cached lists made stale by the changes to resources, keyed on the service
+# type and the name of the resource class. Names starting with an underscore
+# are batched lists, the others cached methods.
+CACHE_INVALIDATIONS = {
+    ('block-storage', 'Type'): ('list_volume_types',),
+    ('block-storage', 'Volume'): ('list_volumes',),
+    ('compute', 'Flavor'): ('list_flavors',),
+    ('compute', 'Server'): ('_servers',),
+    ('identity', 'Group'): ('list_groups',),
+    ('identity', 'Project'): ('list_projects',),
+    ('identity', 'User'): ('list_users',),
+    ('image', 'Image'): ('list_images',),
+    ('network', 'FloatingIP'): ('_floating_ips', '_servers'),
+    ('network', 'Port'): ('_ports', '_servers'),
+    ('orchestration', 'Stack'): ('list_stacks',),
+}
 _CONFIG_DOC_URL = _floating_ip._CONFIG_DOC_URL
 
 DEFAULT_OBJECT_SEGMENT_SIZE = _object_store.DEFAULT_OBJECT_SEGMENT_SIZE
@@ -157,8 +189,17 @@ class _OpenStackCloudMixin(object):
         self._FLOAT_AGE = self.config.get_cache_resource_expiration(
             'floating_ip', self._FLOAT_AGE)
 
+        self._background_cache_refresh = self.config.config[
+            'background_cache_refresh']
+        self._cache_statsd_client = self.config.get_statsd_client()
+        self._cache_statsd_prefix = self.config.get_statsd_prefix()
+
+        self.mutation_events = events.MutationEvents()
+        self.mutation_events.subscribe(self._invalidate_cached_lists)
+
         self._container_cache = dict()
-        self._file_hash_cache = dict()
+        if getattr(self, '_file_hash_cache', None) is None:
+            self._file_hash_cache = file_hash_cache.from_config(self.config)
 
         # self.__pool_executor = None
 
@@ -323,21 +364,40 @@ class _OpenStackCloudMixin(object):
             expiration_time=expiration_time,
             arguments=arguments)
 
+    def _get_cache_scope(self):
+        """Get what identifies the data seen by this connection.
+
+        The cloud name alone is not enough for a cache shared between
+        processes, which may use the same cloud with another region, project
+        or user. Only the identifiers from the config are used, so that no
+        secret ends up in the cache and no authentication is needed.
+        """
+        auth = self.config.config.get('auth') or {}
+        scope = dict(
+            (key, auth[key]) for key in CACHE_SCOPE_AUTH_KEYS
+            if auth.get(key))
+        scope['cloud'] = self.name
+        scope['region_name'] = self.config.region_name
+        return scope
+
     def _make_cache_key(self, namespace, fn):
+        """Make the key generator of the cached methods.
+
+        Keys are a hash of the scope of the connection, the method and its
+        arguments, so that they are stable between processes and safe to use
+        with backends such as memcached which restrict the keys.
+        """
         fname = fn.__name__
-        if namespace is None:
-            name_key = self.name
-        else:
-            name_key = '%s:%s' % (self.name, namespace)
+        scope = self._get_cache_scope()
 
         def generate_key(*args, **kwargs):
-            arg_key = ','.join(args)
-            kw_keys = sorted(kwargs.keys())
-            kwargs_key = ','.join(
-                ['%s:%s' % (k, kwargs[k]) for k in kw_keys if k != 'cache'])
-            ans = "_".join(
-                [str(name_key), fname, arg_key, kwargs_key])
-            return ans
+            call_args = _utils.get_cache_arguments(fn, args, kwargs)
+            key_data = json.dumps(
+                [CACHE_KEY_VERSION, scope, namespace, fname, call_args],
+                sort_keys=True, default=repr)
+            digest = hashlib.sha1(key_data.encode('utf-8')).hexdigest()
+            return 'openstack.cloud:{fname}:{digest}'.format(
+                fname=fname, digest=digest)
         return generate_key
 
     def _get_cache(self, resource_name):
@@ -674,27 +734,168 @@ class _OpenStackCloudMixin(object):
 
                 {"vcpus": "<=5", "ram": "<=2048", "disk": "1"}
 
+            When searching several data sets with the same filters, a
+            :class:`~openstack.cloud._utils.RangeFilter` built from them can
+            be passed instead, so that they are only parsed once.
+
         :returns: A list subset of the original data set.
         :raises: OpenStackCloudException on invalid range expressions.
         """
-        filtered = []
+        if not filters:
+            return []
+        if not isinstance(filters, _utils.RangeFilter):
+            filters = _utils.RangeFilter(filters)
+        # Minimums and maximums are computed on the full data set, and all
+        # the searches are evaluated in a single pass over it.
+        return filters.filter(data)
+
+    def _get_batched_list(self, name, age, list_func):
+        """Get a batched list of resources, refreshing it when too old.
+
+        The list, the time it was fetched and the lock serializing its
+        refreshes are the ``_<name>``, ``_<name>_time`` and ``_<name>_lock``
+        attributes. The list is fetched again, as when it was never fetched,
+        once ``_<name>_dirty`` is set by a change to the resources.
+
+        :param str name: Name of the resources, such as ``servers``.
+        :param float age: Number of seconds the list can be used for.
+        :param list_func: Callable returning a new list of the resources.
+        """
+        lock = getattr(self, '_{name}_lock'.format(name=name))
+        data = self._get_batched_list_data(name)
+        staleness = time.time() - getattr(self, '_{name}_time'.format(
+            name=name))
+
+        if self._background_cache_refresh and age and data is not None:
+            # Always return the cached list, and refresh it in the background
+            # before it expires so that callers never wait for it.
+            if staleness >= age * CACHE_REFRESH_AHEAD and lock.acquire(False):
+                try:
+                    self._pool_executor.submit(
+                        self._refresh_batched_list_in_background,
+                        name, list_func, lock)
+                except Exception:
+                    lock.release()
+                    self.log.debug(
+                        "Could not schedule the refresh of the cached %s",
+                        name, exc_info=True)
+            self._report_cache_staleness(name, staleness)
+            return data
+
+        if data is None or staleness >= age:
+            # Since we're using cached data anyway, we don't need to
+            # have more than one thread actually refresh the list.
+            # Let the first one refresh it while holding a lock, and the
+            # non-blocking acquire method will cause subsequent threads to
+            # just skip this and use the old data until it succeeds.
+            # Initially when we never got data, block to retrieve some data.
+            first_run = data is None
+            if lock.acquire(first_run):
+                try:
+                    if not (first_run and self._get_batched_list_data(name)
+                            is not None):
+                        self._refresh_batched_list(name, list_func)
+                finally:
+                    lock.release()
+        elif age:
+            self._report_cache_staleness(name, staleness)
+        # Changes made while refreshing the list are only seen by the next
+        # call, which fetches it again.
+        return getattr(self, '_' + name)
+
+    def _get_batched_list_data(self, name):
+        if getattr(self, '_{name}_dirty'.format(name=name)):
+            return None
+        return getattr(self, '_' + name)
+
+    def _invalidate_cached_lists(self, event):
+        """Drop the cached lists made stale by a change to a resource.
+
+        Subscribed to :attr:`mutation_events`, so that changes made through
+        the proxies are seen by the cloud layer without waiting for the
+        lists to expire. The batched lists are only marked dirty, so that
+        this never waits for a refresh in progress.
+        """
+        key = (event.service_type, event.resource_type.__name__)
+        for name in CACHE_INVALIDATIONS.get(key, ()):
+            if name.startswith('_'):
+                # Fetched again by the next call, even when refreshed in the
+                # background.
+                setattr(self, '{name}_dirty'.format(name=name), True)
+                _utils._invalidate_list_index(getattr(self, name))
+            else:
+                getattr(self, name).invalidate(self)
 
-        for key, range_value in filters.items():
-            # We always want to operate on the full data set so that
-            # calculations for minimum and maximum are correct.
-            results = _utils.range_filter(data, key, range_value)
+    def _patch_batched_list(self, name, resource_id, resource=None):
+        """Write a change to a resource through to a batched list.
 
-            if not filtered:
-                # First set of results
-                filtered = results
-            else:
-                # The combination of all searches should be the intersection of
-                # all result sets from each search. So adjust the current set
-                # of filtered data by computing its intersection with the
-                # latest result set.
-                filtered = [r for r in results for f in filtered if r == f]
+        The resource replaces the entry with the same id, or is added first
+        when there is none, and the entry is removed when ``resource`` is
+        None. The list keeps its age, so that it is still fetched again when
+        it expires. Must be called with the ``_<name>_lock`` held.
+        """
+        data = getattr(self, '_' + name)
+        if data is None:
+            # Not fetched yet, the next call lists the change anyway
+            return
+        patched = [e for e in data if e.get('id') != resource_id]
+        if resource is not None:
+            position = next(
+                (position for position, e in enumerate(data)
+                 if e.get('id') == resource_id), 0)
+            patched.insert(position, resource)
+        setattr(self, '_' + name, _utils._index_list(patched, replaces=data))
+
+    def _refresh_batched_list(self, name, list_func):
+        # Cleared before listing, so that the changes made meanwhile mark
+        # the new list dirty again.
+        dirty = '_{name}_dirty'.format(name=name)
+        was_dirty = getattr(self, dirty)
+        setattr(self, dirty, False)
+        start = time.time()
+        try:
+            data = list_func()
+        except Exception:
+            if was_dirty:
+                setattr(self, dirty, True)
+            raise
+        data = _utils._index_list(data, replaces=getattr(self, '_' + name))
+        now = time.time()
+        setattr(self, '_' + name, data)
+        setattr(self, '_{name}_time'.format(name=name), now)
+        self._report_cache_refresh(name, now - start)
 
-        return filtered
+    def _refresh_batched_list_in_background(self, name, list_func, lock):
+        try:
+            self._refresh_batched_list(name, list_func)
+        except Exception:
+            # Keep serving the old list, the next call tries again
+            self.log.debug(
+                "Failed to refresh the cached %s", name, exc_info=True)
+        finally:
+            lock.release()
+
+    def _report_cache_refresh(self, name, duration):
+        self.log.debug(
+            "Refreshed the cached %s in %.3f seconds", name, duration)
+        if self._cache_statsd_client:
+            self._cache_statsd_client.timing(
+                '.'.join([self._cache_statsd_prefix, 'cache', name,
+                          'refresh']),
+                int(duration * 1000))
+        histogram = self.config.get_prometheus_cache_refresh_histogram()
+        if histogram:
+            histogram.labels(resource=name).observe(duration)
+
+    def _report_cache_staleness(self, name, staleness):
+        if self._cache_statsd_client:
+            self._cache_statsd_client.gauge(
+                '.'.join([self._cache_statsd_prefix, 'cache', name,
+                          'staleness']),
+                int(staleness * 1000))
+        gauge = self.config.get_prometheus_cache_staleness_gauge()
+        if gauge:
+            gauge.labels(resource=name).set(staleness)
 
     def _get_and_munchify(self, key, data):
         """Wrapper around meta.get_and_munchify.
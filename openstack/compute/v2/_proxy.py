@@ -922,7 +922,7 @@ class Proxy(proxy.Proxy):
         return server.get_console_output(self, length=length)
 
     def wait_for_server(self, server, status='ACTIVE', failures=None,
-                        interval=2, wait=120):
+                        interval=2, wait=120, strategy=None, max_wait=None):
         """Wait for a server to be in a particular status.
 
         :param server:
@@ -939,6 +939,12 @@ class Proxy(proxy.Proxy):
         :param int wait:
             Maximum number of seconds to wait before the change.
             Default to 120.
+        :param strategy: How the interval between checks changes over time,
+            see :func:`~openstack.utils.iterate_intervals`. Defaults to the
+            ``wait_strategy`` of the service.
+        :param max_wait: Longest interval between checks for the strategies
+            which increase it. Defaults to the ``wait_max_interval`` of the
+            service, or ten times ``interval``.
         :returns: The resource is returned on success.
         :raises: :class:`~openstack.exceptions.ResourceTimeout` if transition
                  to the desired status failed to occur in specified seconds.
@@ -949,7 +955,47 @@ class Proxy(proxy.Proxy):
         """
         failures = ['ERROR'] if failures is None else failures
         return resource.wait_for_status(
-            self, server, status, failures, interval, wait)
+            self, server, status, failures, interval, wait,
+            strategy=strategy, max_wait=max_wait)
+
+    def wait_for_servers(self, servers, status='ACTIVE', failures=None,
+                         interval=2, wait=120, strategy=None, max_wait=None):
+        """Wait for several servers to be in a particular status.
+
+        All servers are checked at once with a single request listing the
+        servers changed since the last check, instead of one request per
+        server. See :func:`~openstack.resource.wait_for_statuses`.
+
+        :param servers:
+            The :class:`~openstack.compute.v2.server.Server` objects to wait
+            on to reach the specified status.
+        :type servers: list of :class:`~openstack.compute.v2.server.Server`
+        :param status: Desired status.
+        :param failures:
+            Statuses that would be interpreted as failures.
+        :type failures: :py:class:`list`
+        :param int interval:
+            Number of seconds to wait before to consecutive checks.
+            Default to 2.
+        :param int wait:
+            Maximum number of seconds to wait for all of the servers.
+            Default to 120.
+        :param strategy: How the interval between checks changes over time,
+            see :func:`~openstack.utils.iterate_intervals`. Defaults to the
+            ``wait_strategy`` of the service.
+        :param max_wait: Longest interval between checks for the strategies
+            which increase it. Defaults to the ``wait_max_interval`` of the
+            service, or ten times ``interval``.
+        :returns: A generator of the servers, yielding each one as soon as it
+            reaches the status.
+        :raises: :class:`~openstack.exceptions.ResourceTimeout` if transition
+                 to the desired status failed to occur in specified seconds.
+        :raises: :class:`~openstack.exceptions.ResourceFailure` if a server
+                 has transited to one of the failure statuses.
+        """
+        return resource.wait_for_statuses(
+            self, servers, status, failures, interval, wait,
+            strategy=strategy, max_wait=max_wait)
 
     def create_server_interface(self, server, **attrs):
         """Create a new server interface from attributes
@@ -1441,7 +1487,8 @@ class Proxy(proxy.Proxy):
             force=force,
             block_migration=block_migration)
 
-    def wait_for_delete(self, res, interval=2, wait=120):
+    def wait_for_delete(self, res, interval=2, wait=120, strategy=None,
+                        max_wait=None):
         """Wait for a resource to be deleted.
 
         :param res: The resource to wait on to be deleted.
@@ -1450,11 +1497,18 @@ class Proxy(proxy.Proxy):
                          checks. Default to 2.
         :param wait: Maximum number of seconds to wait before the change.
                      Default to 120.
+        :param strategy: How the interval between checks changes over time,
+            see :func:`~openstack.utils.iterate_intervals`. Defaults to the
+            ``wait_strategy`` of the service.
+        :param max_wait: Longest interval between checks for the strategies
+            which increase it. Defaults to the ``wait_max_interval`` of the
+            service, or ten times ``interval``.
         :returns: The resource is returned on success.
         :raises: :class:`~openstack.exceptions.ResourceTimeout` if transition
                  to delete failed to occur in the specified seconds.
         """
-        return resource.wait_for_delete(self, res, interval, wait)
+        return resource.wait_for_delete(self, res, interval, wait,
+                                        strategy=strategy, max_wait=max_wait)
 
     def get_server_diagnostics(self, server):
         """Get a single server diagnostics
@@ -55,6 +55,7 @@ class Server(resource.Resource, metadata.MetadataMixin, resource.TagMixin):
     )
 
     _max_microversion = '2.72'
+    _list_details_base_path = '/servers/detail'
 
     #: A list of dictionaries holding links relevant to this server.
     links = resource.Body('links')
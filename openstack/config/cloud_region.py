@@ -231,7 +231,8 @@ class CloudRegion(object):
                  discovery_cache=None, extra_config=None,
                  cache_expiration_time=0, cache_expirations=None,
                  cache_path=None, cache_class='dogpile.cache.null',
-                 cache_arguments=None, password_callback=None,
+                 cache_arguments=None, cache_file_hashes=None,
+                 password_callback=None,
                  statsd_host=None, statsd_port=None, statsd_prefix=None,
                  collector_registry=None):
         self._name = name
@@ -256,6 +257,7 @@ class CloudRegion(object):
         self._cache_path = cache_path
         self._cache_class = cache_class
         self._cache_arguments = cache_arguments
+        self._cache_file_hashes = cache_file_hashes or {}
         self._password_callback = password_callback
         self._statsd_host = statsd_host
         self._statsd_port = statsd_port
@@ -821,6 +823,9 @@ class CloudRegion(object):
     def get_cache_expirations(self):
         return copy.deepcopy(self._cache_expirations)
 
+    def get_cache_file_hashes(self):
+        return copy.deepcopy(self._cache_file_hashes)
+
     def get_cache_resource_expiration(self, resource, default=None):
         """Get expiration time for a resource
 
@@ -945,8 +950,30 @@ class CloudRegion(object):
             'rate_limit', service_type=service_type)
 
     def get_concurrency(self, service_type=None):
-        return self._get_service_config(
+        concurrency = self._get_service_config(
             'concurrency', service_type=service_type)
+        if concurrency is not None:
+            return int(concurrency)
+
+    def get_max_concurrency(self):
+        """Get the largest concurrency set for any service, if any."""
+        concurrency = self.config.get('concurrency')
+        if not concurrency:
+            return None
+        if not isinstance(concurrency, dict):
+            return int(concurrency)
+        values = [int(value) for value in concurrency.values() if value]
+        return max(values) if values else None
+
+    def get_wait_strategy(self, service_type=None):
+        return self._get_service_config(
+            'wait_strategy', service_type=service_type)
+
+    def get_wait_max_interval(self, service_type=None):
+        max_interval = self._get_service_config(
+            'wait_max_interval', service_type=service_type)
+        if max_interval is not None:
+            return float(max_interval)
 
     def get_statsd_client(self):
         if not statsd:
@@ -1006,6 +1033,38 @@ class CloudRegion(object):
             registry._openstacksdk_counter = counter
         return counter
 
+    def get_prometheus_cache_refresh_histogram(self):
+        registry = self.get_prometheus_registry()
+        if not registry or not prometheus_client:
+            return
+        hist = getattr(registry, '_openstacksdk_cache_refresh_histogram', None)
+        if not hist:
+            hist = prometheus_client.Histogram(
+                'openstack_cache_refresh_time',
+                'Time taken to refresh a list of resources cached by the'
+                ' cloud layer',
+                labelnames=['resource'],
+                registry=registry,
+            )
+            registry._openstacksdk_cache_refresh_histogram = hist
+        return hist
+
+    def get_prometheus_cache_staleness_gauge(self):
+        registry = self.get_prometheus_registry()
+        if not registry or not prometheus_client:
+            return
+        gauge = getattr(registry, '_openstacksdk_cache_staleness_gauge', None)
+        if not gauge:
+            gauge = prometheus_client.Gauge(
+                'openstack_cache_staleness',
+                'Age of the list of resources last returned from the caches'
+                ' of the cloud layer',
+                labelnames=['resource'],
+                registry=registry,
+            )
+            registry._openstacksdk_cache_staleness_gauge = gauge
+        return gauge
+
     def has_service(self, service_type):
         service_type = service_type.lower().replace('-', '_')
         key = 'has_{service_type}'.format(service_type=service_type)
@@ -68,7 +68,9 @@ VENDOR_FILES = [
     for s in YAML_SUFFIXES + JSON_SUFFIXES
 ]
 
-BOOL_KEYS = ('insecure', 'cache')
+BOOL_KEYS = (
+    'insecure', 'cache', 'incremental_server_cache',
+    'background_cache_refresh')
 
 FORMAT_EXCLUSIONS = frozenset(['password'])
 
@@ -254,6 +256,7 @@ class OpenStackConfig(object):
         self._cache_class = 'dogpile.cache.null'
         self._cache_arguments = {}
         self._cache_expirations = {}
+        self._cache_file_hashes = {}
         if 'cache' in self.cloud_config:
             cache_settings = _util.normalize_keys(self.cloud_config['cache'])
 
@@ -277,6 +280,8 @@ class OpenStackConfig(object):
                 'arguments', self._cache_arguments)
             self._cache_expirations = cache_settings.get(
                 'expiration', self._cache_expirations)
+            self._cache_file_hashes = cache_settings.get(
+                'file_hashes', self._cache_file_hashes)
 
         if load_yaml_config:
             statsd_config = self.cloud_config.get('statsd', {})
@@ -1105,6 +1110,7 @@ class OpenStackConfig(object):
             app_version=self._app_version,
             cache_expiration_time=self._cache_expiration_time,
             cache_expirations=self._cache_expirations,
+            cache_file_hashes=self._cache_file_hashes,
             cache_path=self._cache_path,
             cache_class=self._cache_class,
             cache_arguments=self._cache_arguments,
@@ -1209,6 +1215,7 @@ class OpenStackConfig(object):
             openstack_config=self,
             cache_expiration_time=self._cache_expiration_time,
             cache_expirations=self._cache_expirations,
+            cache_file_hashes=self._cache_file_hashes,
             cache_path=self._cache_path,
             cache_class=self._cache_class,
             cache_arguments=self._cache_arguments,
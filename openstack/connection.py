@@ -176,6 +176,7 @@ try to find it and if that fails, you would create it::
 Additional information about the services can be found in the
 :ref:`service-proxies` documentation.
 """
+import concurrent.futures
 import warnings
 
 import keystoneauth1.exceptions
@@ -202,6 +203,7 @@ from openstack.cloud import _security_group
 from openstack import config as _config
 from openstack.config import cloud_region
 from openstack import exceptions
+from openstack import proxy
 from openstack import service_description
 
 __all__ = [
@@ -214,6 +216,9 @@ if requestsexceptions.SubjectAltNameWarning:
         'ignore', category=requestsexceptions.SubjectAltNameWarning)
 
 _logger = _log.setup_logging('openstack')
+# Number of workers of the executor created by a connection, unless a larger
+# concurrency is configured
+DEFAULT_POOL_SIZE = 5
 
 
 def from_config(cloud=None, config=None, options=None, **kwargs):
@@ -273,6 +278,9 @@ class Connection(six.with_metaclass(_meta.ConnectionMeta,
                  oslo_conf=None,
                  service_types=None,
                  global_request_id=None,
+                 lazy_resource_dict=False,
+                 pool_executor=None,
+                 file_hash_cache=None,
                  **kwargs):
         """Create a connection to a cloud.
 
@@ -330,6 +338,27 @@ class Connection(six.with_metaclass(_meta.ConnectionMeta,
             **Currently only supported in conjunction with the ``oslo_conf``
             kwarg.**
         :param global_request_id: A Request-id to send with all interactions.
+        :param bool lazy_resource_dict:
+            Defer filling the dict representation of
+            :class:`~openstack.resource.Resource` objects created through
+            this Connection until it is first needed, for instance by
+            iterating over the resource or passing it to ``json.dumps``.
+            Attribute access is unaffected. This saves a considerable amount
+            of time and memory when iterating over large listings where only
+            a few attributes are read. Default false.
+        :param pool_executor: A :class:`concurrent.futures.Executor` to be
+            used for concurrent background activities, such as uploading
+            object segments or :meth:`batch`. Defaults to None, in which case
+            a :class:`~concurrent.futures.ThreadPoolExecutor` is created
+            when first needed, with 5 workers or as many as the largest
+            ``concurrency`` setting of the services.
+        :param file_hash_cache: A
+            :class:`~openstack.file_hash_cache.FileHashCache` remembering the
+            hashes of the files uploaded as objects or images. Defaults to
+            None, in which case the cache is created according to the
+            ``file_hashes`` entry of the cache settings, see
+            :mod:`openstack.file_hash_cache`. Only a cache created by the
+            connection is closed by :meth:`close`.
         :param kwargs: If a config is not provided, the rest of the parameters
             provided are assumed to be arguments to be passed to the
             CloudRegion constructor.
@@ -364,9 +393,13 @@ class Connection(six.with_metaclass(_meta.ConnectionMeta,
 
         self._session = None
         self._proxies = {}
-        self.__pool_executor = None
+        self.__pool_executor = pool_executor
+        self._owns_pool_executor = pool_executor is None
+        self._file_hash_cache = file_hash_cache
+        self._owns_file_hash_cache = file_hash_cache is None
         self._global_request_id = global_request_id
         self.use_direct_get = use_direct_get
+        self.lazy_resource_dict = lazy_resource_dict
         self.strict_mode = strict
         # Call the _*CloudMixin constructors while we work on
         # integrating things better.
@@ -477,10 +510,102 @@ class Connection(six.with_metaclass(_meta.ConnectionMeta,
         except keystoneauth1.exceptions.ClientException as e:
             raise exceptions.raise_from_response(e.response)
 
+    @property
+    def _pool_executor(self):
+        if not self.__pool_executor:
+            # TODO(mordred) Probably use Futurist instead of
+            # concurrent.futures so that people using Eventlet will be
+            # happier.
+            # Large enough for the concurrency configured for any service
+            max_workers = max(
+                DEFAULT_POOL_SIZE, self.config.get_max_concurrency() or 0)
+            self.__pool_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_workers)
+        return self.__pool_executor
+
+    def batch(self, fn, iterable, max_workers=None, return_exceptions=True,
+              service_type=None):
+        """Call a function on each item of an iterable concurrently.
+
+        The calls are run on the executor of the connection, for instance::
+
+            ports = conn.batch(conn.network.get_port, port_ids)
+            conn.batch(conn.network.delete_port, ports)
+
+        :param fn: Callable taking a single item of ``iterable``, usually
+            a method of a service proxy.
+        :param iterable: Items to call ``fn`` on.
+        :param int max_workers: Maximum number of calls to run at once.
+            Defaults to as many as the executor allows. The executor also
+            caps it: the one created by the connection runs as many calls
+            as the largest ``concurrency`` setting of the services, and at
+            least 5.
+        :param bool return_exceptions: When ``True``, an exception raised by
+            a call is returned in place of its result. When ``False``, an
+            exception is raised as soon as a call fails: the calls which did
+            not start yet are cancelled and the remaining items skipped, and
+            only the calls already running are waited for.
+        :param str service_type: Service type the calls are made to. The
+            ``concurrency`` setting of that service, if any, further limits
+            the number of calls run at once. Defaults to the service of the
+            proxy ``fn`` is a method of, if any.
+
+        :returns: A list of the results of the calls, in the order of
+            ``iterable``.
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if service_type is None:
+            fn_self = getattr(fn, '__self__', None)
+            if isinstance(fn_self, proxy.Proxy):
+                service_type = fn_self.service_type
+        if service_type:
+            concurrency = self.config.get_concurrency(service_type)
+            if concurrency:
+                max_workers = min(max_workers or concurrency, concurrency)
+
+        executor = self._pool_executor
+        futures = []
+        running = set()
+        for item in iterable:
+            if max_workers and len(running) >= max_workers:
+                done, running = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED)
+                if not return_exceptions and any(
+                        f.exception() is not None for f in done):
+                    # The failure is raised below, in order.
+                    break
+            future = executor.submit(fn, item)
+            futures.append(future)
+            running.add(future)
+
+        if not return_exceptions:
+            done, pending = concurrent.futures.wait(
+                futures, return_when=concurrent.futures.FIRST_EXCEPTION)
+            for future in pending:
+                future.cancel()
+            # Callers may release what the running calls use once this
+            # returns
+            concurrent.futures.wait(pending)
+            for future in futures:
+                if future in done and future.exception() is not None:
+                    # Raised with its traceback
+                    future.result()
+
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+
     def close(self):
         """Release any resources held open."""
-        if self.__pool_executor:
+        if self.__pool_executor and self._owns_pool_executor:
             self.__pool_executor.shutdown()
+        if self._owns_file_hash_cache:
+            self._file_hash_cache.close()
 
     def set_global_request_id(self, global_request_id):
         self._global_request_id = global_request_id
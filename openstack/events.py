@@ -0,0 +1,124 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Events emitted when resources are changed through a connection.
+
+Every resource created, updated or deleted by the ``_create``,
+``_bulk_create``, ``_update`` and ``_delete`` methods of a
+:class:`~openstack.proxy.Proxy` is announced as a :class:`MutationEvent`
+to the :class:`MutationEvents` of its
+:class:`~openstack.connection.Connection`, available as its
+``mutation_events`` attribute. The cloud layer subscribes to them to drop the
+cached lists which the change makes stale, and applications can subscribe to
+them as well:
+
+.. code-block:: python
+
+  def on_server_deleted(event):
+      print("Server {id} deleted".format(id=event.resource_id))
+
+  conn.mutation_events.subscribe(
+      on_server_deleted, service_type='compute', resource_name='Server',
+      action=openstack.events.DELETE)
+"""
+
+import collections
+import threading
+
+from openstack import _log
+
+CREATE = 'create'
+UPDATE = 'update'
+DELETE = 'delete'
+
+MutationEvent = collections.namedtuple(
+    'MutationEvent',
+    ['action', 'service_type', 'resource_type', 'resource_id', 'resource'])
+"""A change made to a resource.
+
+``action`` is one of :data:`CREATE`, :data:`UPDATE` or :data:`DELETE`,
+``resource_type`` the :class:`~openstack.resource.Resource` subclass of the
+resource and ``resource`` the resource as returned by the service, or the
+deleted resource.
+"""
+
+_Subscription = collections.namedtuple(
+    '_Subscription', ['callback', 'service_type', 'resource_name', 'action'])
+
+
+class MutationEvents(object):
+    """Dispatch the events of the changes made to resources to subscribers.
+
+    Subscribers are called synchronously, in the thread which made the
+    change, in the order they subscribed. Errors raised by subscribers are
+    logged and do not affect the change or the other subscribers.
+    """
+
+    def __init__(self):
+        self._subscriptions = []
+        self._lock = threading.Lock()
+        self.log = _log.setup_logging('openstack.events')
+
+    def subscribe(self, callback, service_type=None, resource_name=None,
+                  action=None):
+        """Call a function for each matching event.
+
+        :param callback: Callable taking a :class:`MutationEvent`.
+        :param str service_type: Only call it for resources of this service
+            type, such as ``compute``.
+        :param str resource_name: Only call it for resources whose class has
+            this name, such as ``Server``.
+        :param str action: Only call it for this action.
+        """
+        with self._lock:
+            # Copied so that emit can iterate without holding the lock
+            self._subscriptions = self._subscriptions + [_Subscription(
+                callback, service_type, resource_name, action)]
+
+    def unsubscribe(self, callback):
+        """Stop calling a function for the events."""
+        with self._lock:
+            self._subscriptions = [
+                subscription for subscription in self._subscriptions
+                if subscription.callback != callback]
+
+    def emit(self, action, service_type, resource):
+        """Announce a change made to a resource.
+
+        :param str action: One of :data:`CREATE`, :data:`UPDATE` or
+            :data:`DELETE`.
+        :param str service_type: Service type of the resource.
+        :param resource: The :class:`~openstack.resource.Resource` changed.
+        """
+        event = MutationEvent(
+            action, service_type, type(resource),
+            getattr(resource, 'id', None), resource)
+        for subscription in self._subscriptions:
+            if not _matches(subscription, event):
+                continue
+            try:
+                subscription.callback(event)
+            except Exception:
+                self.log.warning(
+                    "Subscriber %s failed to handle the %s of %s %s",
+                    subscription.callback, action,
+                    event.resource_type.__name__, event.resource_id,
+                    exc_info=True)
+
+
+def _matches(subscription, event):
+    return (
+        subscription.service_type in (None, event.service_type)
+        and subscription.resource_name in (
+            None, event.resource_type.__name__)
+        and subscription.action in (None, event.action))
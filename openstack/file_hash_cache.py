@@ -0,0 +1,234 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Caches of the hashes of local files.
+
+Uploading objects and images requires the md5 and sha256 of the file, to
+detect whether an identical object or image already exists and to record
+them along with the uploaded data. Hashing large files is expensive, so the
+hashes are remembered by a :class:`FileHashCache`.
+
+Entries are keyed on the path of the file along with its inode, size and
+modification time, so that a modified or replaced file is hashed again.
+
+The cache used by a :class:`~openstack.connection.Connection` is configured
+with the ``file_hashes`` entry of the ``cache`` section of ``clouds.yaml``:
+
+.. code-block:: yaml
+
+  cache:
+    file_hashes:
+      backend: sqlite
+      max_entries: 10000
+
+``backend`` is either ``memory`` (the default), which only lasts as long as
+the connection, or ``sqlite``, which stores the hashes in a database in the
+cache path so that they are shared between processes. Another cache can be
+given to the connection with its ``file_hash_cache`` argument, for instance
+an instance of a subclass of :class:`FileHashCache` storing the hashes
+elsewhere.
+"""
+
+import collections
+import os
+import sqlite3
+import threading
+import time
+
+from openstack import _log
+from openstack.config import loader
+from openstack import exceptions
+
+DEFAULT_MAX_ENTRIES = 1024
+SQLITE_FILENAME = 'file_hashes.sqlite'
+
+
+class FileHashCache(object):
+    """Base class of the caches of the hashes of local files.
+
+    Subclasses store the entries by implementing :meth:`_get`, :meth:`_set`
+    and possibly :meth:`close`.
+
+    :param int max_entries: Maximum number of entries to keep. The least
+        recently used entries are evicted first.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+
+    @staticmethod
+    def get_key(filename):
+        """Get the key of the current version of a file.
+
+        :returns: A tuple of the absolute path, inode, size and modification
+            time in nanoseconds of the file.
+        """
+        stat = os.stat(filename)
+        mtime_ns = getattr(stat, 'st_mtime_ns', None)
+        if mtime_ns is None:
+            mtime_ns = int(stat.st_mtime * 1e9)
+        return (os.path.abspath(filename), stat.st_ino, stat.st_size,
+                mtime_ns)
+
+    def get(self, filename):
+        """Get the hashes of a file.
+
+        :returns: A tuple of md5 and sha256 hexdigests, or None if the hashes
+            of this version of the file are not known.
+        """
+        return self._get(self.get_key(filename))
+
+    def set(self, filename, md5, sha256):
+        """Remember the hashes of a file."""
+        self._set(self.get_key(filename), (md5, sha256))
+
+    def close(self):
+        """Release the resources held by the cache."""
+
+    def _get(self, key):
+        raise NotImplementedError
+
+    def _set(self, key, hashes):
+        raise NotImplementedError
+
+
+class MemoryFileHashCache(FileHashCache):
+    """Keep the hashes in memory."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        super(MemoryFileHashCache, self).__init__(max_entries=max_entries)
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get(self, key):
+        with self._lock:
+            hashes = self._entries.pop(key, None)
+            if hashes is not None:
+                # Most recently used entries are last
+                self._entries[key] = hashes
+            return hashes
+
+    def _set(self, key, hashes):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = hashes
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SqliteFileHashCache(FileHashCache):
+    """Store the hashes in a sqlite database.
+
+    The database can be shared by several processes. It is only opened when
+    first needed.
+
+    :param str path: Path of the database file.
+    """
+
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES):
+        super(SqliteFileHashCache, self).__init__(max_entries=max_entries)
+        self.path = path
+        self._db = None
+        self._lock = threading.Lock()
+
+    def _get_db(self):
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory)
+            db = sqlite3.connect(
+                self.path, timeout=30, check_same_thread=False)
+            with db:
+                db.execute(
+                    'CREATE TABLE IF NOT EXISTS file_hashes ('
+                    ' path TEXT, inode INTEGER, size INTEGER,'
+                    ' mtime_ns INTEGER, md5 TEXT, sha256 TEXT,'
+                    ' last_used REAL,'
+                    ' PRIMARY KEY (path, inode, size, mtime_ns))')
+                db.execute(
+                    'CREATE INDEX IF NOT EXISTS file_hashes_last_used'
+                    ' ON file_hashes (last_used)')
+            self._db = db
+        return self._db
+
+    def __len__(self):
+        with self._lock:
+            return self._get_db().execute(
+                'SELECT COUNT(*) FROM file_hashes').fetchone()[0]
+
+    def _get(self, key):
+        with self._lock:
+            db = self._get_db()
+            with db:
+                row = db.execute(
+                    'SELECT md5, sha256 FROM file_hashes WHERE path = ?'
+                    ' AND inode = ? AND size = ? AND mtime_ns = ?',
+                    key).fetchone()
+                if row is None:
+                    return None
+                db.execute(
+                    'UPDATE file_hashes SET last_used = ? WHERE path = ?'
+                    ' AND inode = ? AND size = ? AND mtime_ns = ?',
+                    (time.time(),) + key)
+            return tuple(row)
+
+    def _set(self, key, hashes):
+        with self._lock:
+            db = self._get_db()
+            with db:
+                # Hashes of previous versions of the file are not useful
+                # anymore.
+                db.execute('DELETE FROM file_hashes WHERE path = ?', key[:1])
+                db.execute(
+                    'INSERT INTO file_hashes VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    key + tuple(hashes) + (time.time(),))
+                db.execute(
+                    'DELETE FROM file_hashes WHERE rowid IN ('
+                    ' SELECT rowid FROM file_hashes'
+                    ' ORDER BY last_used DESC LIMIT -1 OFFSET ?)',
+                    (self.max_entries,))
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def from_config(config):
+    """Create the file hash cache described by the config of a cloud.
+
+    :param config: A :class:`~openstack.config.cloud_region.CloudRegion`.
+    :returns: A :class:`FileHashCache`.
+    """
+    settings = config.get_cache_file_hashes()
+    backend = settings.get('backend', 'memory')
+    max_entries = int(settings.get('max_entries', DEFAULT_MAX_ENTRIES))
+    if backend == 'memory':
+        return MemoryFileHashCache(max_entries=max_entries)
+    if backend == 'sqlite':
+        cache_path = config.get_cache_path()
+        if not cache_path:
+            # Regions built from a session have no cache path.
+            cache_path = loader.CACHE_PATH
+        log = _log.setup_logging('openstack.config')
+        log.debug("Caching file hashes in %s", cache_path)
+        return SqliteFileHashCache(
+            os.path.join(cache_path, SQLITE_FILENAME),
+            max_entries=max_entries)
+    raise exceptions.ConfigException(
+        "Unknown file hash cache backend {backend}, expected memory or"
+        " sqlite".format(backend=backend))
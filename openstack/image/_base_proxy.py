@@ -53,7 +53,8 @@ class BaseImageProxy(six.with_metaclass(abc.ABCMeta, proxy.Proxy)):
             should be uploaded for import if the cloud requires such a thing.
             (optional, defaults to 'images')
         :param str md5: md5 sum of the image file. If not given, an md5 will
-            be calculated.
+            be calculated. Unless it is needed to compare the file with an
+            existing image, it is calculated while uploading the file.
         :param str sha256: sha256 sum of the image file. If not given, an md5
             will be calculated.
         :param str disk_format: The disk format the image is in. (optional,
@@ -107,8 +108,10 @@ class BaseImageProxy(six.with_metaclass(abc.ABCMeta, proxy.Proxy)):
         if not filename:
             name, filename = self._get_name_and_filename(
                 name, self._connection.config.config['image_format'])
-        if not (md5 or sha256):
-            (md5, sha256) = self._connection._get_file_hashes(filename)
+        if filename and not (md5 or sha256):
+            # Hashes not known yet are computed while uploading
+            (md5, sha256) = self._connection._get_cached_file_hashes(
+                filename)
         if allow_duplicates:
             current_image = None
         else:
@@ -120,6 +123,10 @@ class BaseImageProxy(six.with_metaclass(abc.ABCMeta, proxy.Proxy)):
                 sha256_key = current_image.get(
                     self._IMAGE_SHA256_KEY,
                     current_image.get(self._SHADE_IMAGE_SHA256_KEY, ''))
+                if (filename and not (md5 or sha256)
+                        and (md5_key or sha256_key)):
+                    (md5, sha256) = self._connection._get_file_hashes(
+                        filename)
                 up_to_date = self._connection._hashes_up_to_date(
                     md5=md5, sha256=sha256,
                     md5_key=md5_key, sha256_key=sha256_key)
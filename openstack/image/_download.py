@@ -13,6 +13,7 @@ import io
 import hashlib
 import six
 
+from openstack import _parallel_download
 from openstack import exceptions
 from openstack import utils
 
@@ -27,11 +28,22 @@ def _verify_checksum(md5, checksum):
 
 class DownloadMixin(object):
 
-    def download(self, session, stream=False, output=None, chunk_size=1024):
-        """Download the data contained in an image"""
+    def download(self, session, stream=False, output=None, chunk_size=1024,
+                 workers=None, part_size=None):
+        """Download the data contained in an image
+
+        When ``workers`` is given along with ``output``, the data is
+        downloaded in parts of ``part_size`` bytes, with up to ``workers``
+        concurrent ranged requests written at their offset of the output.
+        See :func:`openstack._parallel_download.can_download_in_parts`.
+        """
         # TODO(briancurtin): This method should probably offload the get
         # operation into another thread or something of that nature.
         url = utils.urljoin(self.base_path, self.id, 'file')
+        if (output and workers and workers > 1
+                and _parallel_download.can_download_in_parts(output)):
+            return self._download_in_parts(
+                session, url, output, workers, part_size)
         resp = session.get(url, stream=stream)
 
         # See the following bug report for details on why the checksum
@@ -83,3 +95,21 @@ class DownloadMixin(object):
                 "Unable to verify the integrity of image %s", (self.id))
 
         return resp
+
+    def _download_in_parts(self, session, url, output, workers, part_size):
+        details = self.fetch(session)
+        if not details.size:
+            raise exceptions.SDKException(
+                "Unable to download image %s in parts, its size is not"
+                " known" % self.id)
+        md5 = _parallel_download.download(
+            session, url, details.size, output, workers,
+            part_size=part_size, error_message="Unable to download image")
+        if details.checksum:
+            if md5 != details.checksum:
+                raise exceptions.InvalidResponse(
+                    "checksum mismatch: %s != %s" % (details.checksum, md5))
+        else:
+            session.log.warning(
+                "Unable to verify the integrity of image %s", (self.id))
+        return self
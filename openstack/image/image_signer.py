@@ -56,14 +56,27 @@ class ImageSigner(object):
                 key_file.read(), password=password, backend=default_backend()
             )
 
-    def generate_signature(self, file_obj):
-        file_obj.seek(0)
-        chunked_file = IterableChunkedFile(file_obj)
-        for chunk in chunked_file:
-            self.hasher.update(chunk)
-        file_obj.seek(0)
+    def update(self, data):
+        """Add data to the digest to sign.
+
+        This allows computing the digest while the data is read for another
+        purpose, such as being uploaded, instead of reading it again in
+        :meth:`generate_signature`.
+        """
+        self.hasher.update(data)
+
+    def sign(self):
+        """Sign the digest of the data given to :meth:`update`."""
         digest = self.hasher.finalize()
         signature = self.private_key.sign(
             digest, self.padding, utils.Prehashed(self.hash)
         )
         return signature
+
+    def generate_signature(self, file_obj):
+        file_obj.seek(0)
+        chunked_file = IterableChunkedFile(file_obj)
+        for chunk in chunked_file:
+            self.update(chunk)
+        file_obj.seek(0)
+        return self.sign()
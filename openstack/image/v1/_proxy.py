@@ -46,6 +46,12 @@ class Proxy(_base_proxy.BaseImageProxy):
         # NOTE(mordred) wait and timeout parameters are unused, but
         # are present for ease at calling site.
         image_data = open(filename, 'rb')
+        properties = image_kwargs['properties']
+        if not (properties.get(self._IMAGE_MD5_KEY)
+                or properties.get(self._IMAGE_SHA256_KEY)):
+            (properties[self._IMAGE_MD5_KEY],
+             properties[self._IMAGE_SHA256_KEY]) = (
+                self._connection._get_file_hashes(filename))
         image_kwargs['properties'].update(meta)
         image_kwargs['name'] = name
 
@@ -165,7 +171,7 @@ class Proxy(_base_proxy.BaseImageProxy):
         return self._update(_image.Image, image, **attrs)
 
     def download_image(self, image, stream=False, output=None,
-                       chunk_size=1024):
+                       chunk_size=1024, workers=None, part_size=None):
         """Download an image
 
         This will download an image to memory when ``stream=False``, or allow
@@ -193,6 +199,12 @@ class Proxy(_base_proxy.BaseImageProxy):
         :param output: Either a file object or a path to store data into.
         :param int chunk_size: size in bytes to read from the wire and buffer
             at one time. Defaults to 1024
+        :param int workers: When given with ``output``, download the image in
+            parts, with up to this number of concurrent ranged requests. The
+            output must be a path or a file object opened for reading and
+            writing, otherwise the image is downloaded in a single request.
+        :param int part_size: Size in bytes of the parts downloaded with
+            ``workers``. Defaults to 64 MiB.
 
         :returns: When output is not given - the bytes comprising the given
             Image when stream is False, otherwise a :class:`requests.Response`
@@ -203,4 +215,5 @@ class Proxy(_base_proxy.BaseImageProxy):
         image = self._get_resource(_image.Image, image)
 
         return image.download(
-            self, stream=stream, output=output, chunk_size=chunk_size)
+            self, stream=stream, output=output, chunk_size=chunk_size,
+            workers=workers, part_size=part_size)
@@ -13,6 +13,7 @@
 import time
 import warnings
 
+from openstack.cloud import _utils
 from openstack import exceptions
 from openstack.image import _base_proxy
 from openstack.image.v2 import image as _image
@@ -203,6 +204,18 @@ class Proxy(_base_proxy.BaseImageProxy):
         image_kwargs.update(self._make_v2_image_params(meta, properties))
         image_kwargs['name'] = name
 
+        # image_kwargs are flat here
+        md5 = image_kwargs.get(self._IMAGE_MD5_KEY)
+        sha256 = image_kwargs.get(self._IMAGE_SHA256_KEY)
+        hasher = None
+        if not (md5 or sha256):
+            # Compute the checksums while uploading and set them afterwards,
+            # so that the file is only read once.
+            image_kwargs.pop(self._IMAGE_MD5_KEY, None)
+            image_kwargs.pop(self._IMAGE_SHA256_KEY, None)
+            hasher = _utils.FileHasher(filename)
+            image_data = _utils.HashingReader(image_data, hasher)
+
         image = self._create(_image.Image, **image_kwargs)
 
         image.data = image_data
@@ -210,9 +223,14 @@ class Proxy(_base_proxy.BaseImageProxy):
         try:
             response = image.upload(self)
             exceptions.raise_from_response(response)
-            # image_kwargs are flat here
-            md5 = image_kwargs.get(self._IMAGE_MD5_KEY)
-            sha256 = image_kwargs.get(self._IMAGE_SHA256_KEY)
+            if hasher:
+                (md5, sha256) = hasher.hexdigests()
+                self._connection._set_file_hashes(filename, md5, sha256)
+                # Merge with the current properties not to remove them
+                props = image.properties.copy()
+                props[self._IMAGE_MD5_KEY] = md5
+                props[self._IMAGE_SHA256_KEY] = sha256
+                image = self.update_image(image, properties=props)
             if validate_checksum and (md5 or sha256):
                 # Verify that the hash computed remotely matches the local
                 # value
@@ -240,8 +258,8 @@ class Proxy(_base_proxy.BaseImageProxy):
                 " upload, but no object-store service is available."
                 " Aborting.".format(cloud=self._connection.config.name))
         properties = image_kwargs.get('properties', {})
-        md5 = properties[self._IMAGE_MD5_KEY]
-        sha256 = properties[self._IMAGE_SHA256_KEY]
+        md5 = properties[self._IMAGE_MD5_KEY] or None
+        sha256 = properties[self._IMAGE_SHA256_KEY] or None
         container = properties[self._IMAGE_OBJECT_KEY].split('/', 1)[0]
         image_kwargs.pop('disk_format', None)
         image_kwargs.pop('container_format', None)
@@ -253,6 +271,11 @@ class Proxy(_base_proxy.BaseImageProxy):
             metadata={self._connection._OBJECT_AUTOCREATE_KEY: 'true'},
             **{'content-type': 'application/octet-stream',
                'x-delete-after': str(24 * 60 * 60)})
+        if not (md5 or sha256):
+            # Computed while uploading the object, so they are known now
+            (properties[self._IMAGE_MD5_KEY],
+             properties[self._IMAGE_SHA256_KEY]) = (
+                self._connection._get_file_hashes(filename))
         # TODO(mordred): Can we do something similar to what nodepool does
         # using glance properties to not delete then upload but instead make a
         # new "good" image and then mark the old one as "bad"
@@ -324,7 +347,7 @@ class Proxy(_base_proxy.BaseImageProxy):
         return _image.Image.existing(connection=self._connection, **kwargs)
 
     def download_image(self, image, stream=False, output=None,
-                       chunk_size=1024):
+                       chunk_size=1024, workers=None, part_size=None):
         """Download an image
 
         This will download an image to memory when ``stream=False``, or allow
@@ -352,6 +375,12 @@ class Proxy(_base_proxy.BaseImageProxy):
         :param output: Either a file object or a path to store data into.
         :param int chunk_size: size in bytes to read from the wire and buffer
             at one time. Defaults to 1024
+        :param int workers: When given with ``output``, download the image in
+            parts, with up to this number of concurrent ranged requests. The
+            output must be a path or a file object opened for reading and
+            writing, otherwise the image is downloaded in a single request.
+        :param int part_size: Size in bytes of the parts downloaded with
+            ``workers``. Defaults to 64 MiB.
 
         :returns: When output is not given - the bytes comprising the given
             Image when stream is False, otherwise a :class:`requests.Response`
@@ -362,7 +391,8 @@ class Proxy(_base_proxy.BaseImageProxy):
         image = self._get_resource(_image.Image, image)
 
         return image.download(
-            self, stream=stream, output=output, chunk_size=chunk_size)
+            self, stream=stream, output=output, chunk_size=chunk_size,
+            workers=workers, part_size=part_size)
 
     def delete_image(self, image, ignore_missing=True):
         """Delete an image
@@ -654,7 +684,7 @@ class Proxy(_base_proxy.BaseImageProxy):
         return self._create(_task.Task, **attrs)
 
     def wait_for_task(self, task, status='success', failures=None,
-                      interval=2, wait=120):
+                      interval=2, wait=120, strategy=None, max_wait=None):
         """Wait for a task to be in a particular status.
 
         :param task: The resource to wait on to reach the specified status.
@@ -667,6 +697,12 @@ class Proxy(_base_proxy.BaseImageProxy):
                          checks. Default to 2.
         :param wait: Maximum number of seconds to wait before the change.
                      Default to 120.
+        :param strategy: How the interval between checks changes over time,
+            see :func:`~openstack.utils.iterate_intervals`. Defaults to the
+            ``wait_strategy`` of the service.
+        :param max_wait: Longest interval between checks for the strategies
+            which increase it. Defaults to the ``wait_max_interval`` of the
+            service, or ten times ``interval``.
         :returns: The resource is returned on success.
         :raises: :class:`~openstack.exceptions.ResourceTimeout` if transition
                  to the desired status failed to occur in specified seconds.
@@ -690,7 +726,9 @@ class Proxy(_base_proxy.BaseImageProxy):
         for count in utils.iterate_timeout(
                 timeout=wait,
                 message=msg,
-                wait=interval):
+                wait=interval,
+                strategy=resource._get_wait_strategy(self, strategy),
+                max_wait=resource._get_wait_max(self, max_wait)):
             task = task.fetch(self)
 
             if not task:
@@ -124,11 +124,13 @@ class Proxy(proxy.Proxy):
         return self._update(_lb.LoadBalancer, load_balancer, **attrs)
 
     def wait_for_load_balancer(self, name_or_id, status='ACTIVE',
-                               failures=['ERROR'], interval=2, wait=300):
+                               failures=['ERROR'], interval=2, wait=300,
+                               strategy=None, max_wait=None):
         lb = self._find(_lb.LoadBalancer, name_or_id, ignore_missing=False)
 
         return resource.wait_for_status(self, lb, status, failures, interval,
-                                        wait, attribute='provisioning_status')
+                                        wait, attribute='provisioning_status',
+                                        strategy=strategy, max_wait=max_wait)
 
     def failover_load_balancer(self, name_or_id, **attrs):
         """Failover a load balancer
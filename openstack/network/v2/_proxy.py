@@ -1203,6 +1203,25 @@ class Proxy(proxy.Proxy):
         """
         return self._create(_network.Network, **attrs)
 
+    def create_networks(self, data, chunk_size=100):
+        """Create networks from a list of attributes
+
+        Networks are created with one request per ``chunk_size`` of them.
+
+        :param list data: List of dicts, each of which will be used to
+                          create a :class:`~openstack.network.v2.network.\
+                          Network`, comprised of the properties on the
+                          Network class.
+        :param int chunk_size: Maximum number of networks to create per
+                               request, or ``None`` to create all of them in
+                               a single request.
+
+        :returns: The created networks, in the order of ``data``.
+        :rtype: list of :class:`~openstack.network.v2.network.Network`
+        """
+        return self._bulk_create(_network.Network, data,
+                                 chunk_size=chunk_size)
+
     def delete_network(self, network, ignore_missing=True):
         """Delete a network
 
@@ -1687,6 +1706,23 @@ class Proxy(proxy.Proxy):
         """
         return self._create(_port.Port, **attrs)
 
+    def create_ports(self, data, chunk_size=100):
+        """Create ports from a list of attributes
+
+        Ports are created with one request per ``chunk_size`` of them.
+
+        :param list data: List of dicts, each of which will be used to
+                          create a :class:`~openstack.network.v2.port.Port`,
+                          comprised of the properties on the Port class.
+        :param int chunk_size: Maximum number of ports to create per
+                               request, or ``None`` to create all of them in
+                               a single request.
+
+        :returns: The created ports, in the order of ``data``.
+        :rtype: list of :class:`~openstack.network.v2.port.Port`
+        """
+        return self._bulk_create(_port.Port, data, chunk_size=chunk_size)
+
     def delete_port(self, port, ignore_missing=True):
         """Delete a port
 
@@ -3106,6 +3142,25 @@ class Proxy(proxy.Proxy):
         """
         return self._create(_security_group_rule.SecurityGroupRule, **attrs)
 
+    def create_security_group_rules(self, data, chunk_size=100):
+        """Create security group rules from a list of attributes
+
+        Rules are created with one request per ``chunk_size`` of them.
+
+        :param list data: List of dicts, each of which will be used to
+            create a :class:`~openstack.network.v2.security_group_rule.
+            SecurityGroupRule`, comprised of the properties on the
+            SecurityGroupRule class.
+        :param int chunk_size: Maximum number of rules to create per
+            request, or ``None`` to create all of them in a single request.
+
+        :returns: The created security group rules, in the order of ``data``.
+        :rtype: list of :class:`~openstack.network.v2.security_group_rule.\
+            SecurityGroupRule`
+        """
+        return self._bulk_create(_security_group_rule.SecurityGroupRule,
+                                 data, chunk_size=chunk_size)
+
     def delete_security_group_rule(self, security_group_rule,
                                    ignore_missing=True):
         """Delete a security group rule
@@ -3388,6 +3443,24 @@ class Proxy(proxy.Proxy):
         """
         return self._create(_subnet.Subnet, **attrs)
 
+    def create_subnets(self, data, chunk_size=100):
+        """Create subnets from a list of attributes
+
+        Subnets are created with one request per ``chunk_size`` of them.
+
+        :param list data: List of dicts, each of which will be used to
+                          create a :class:`~openstack.network.v2.subnet.\
+                          Subnet`, comprised of the properties on the
+                          Subnet class.
+        :param int chunk_size: Maximum number of subnets to create per
+                               request, or ``None`` to create all of them in
+                               a single request.
+
+        :returns: The created subnets, in the order of ``data``.
+        :rtype: list of :class:`~openstack.network.v2.subnet.Subnet`
+        """
+        return self._bulk_create(_subnet.Subnet, data, chunk_size=chunk_size)
+
     def delete_subnet(self, subnet, ignore_missing=True):
         """Delete a subnet
 
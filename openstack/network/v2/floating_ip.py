@@ -29,7 +29,7 @@ class FloatingIP(resource.Resource, resource.TagMixin):
 
     _query_mapping = resource.QueryParameters(
         'description', 'fixed_ip_address',
-        'floating_ip_address', 'floating_network_id',
+        'floating_ip_address', 'floating_network_id', 'id',
         'port_id', 'router_id', 'status', 'subnet_id',
         project_id='tenant_id',
         **resource.TagMixin._tag_query_parameters)
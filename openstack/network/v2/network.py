@@ -27,7 +27,7 @@ class Network(resource.Resource, resource.TagMixin):
 
     # NOTE: We don't support query on list or datetime fields yet
     _query_mapping = resource.QueryParameters(
-        'description', 'name', 'status',
+        'description', 'id', 'name', 'status',
         ipv4_address_scope_id='ipv4_address_scope',
         ipv6_address_scope_id='ipv6_address_scope',
         is_admin_state_up='admin_state_up',
@@ -28,7 +28,7 @@ class Router(resource.Resource, resource.TagMixin):
 
     # NOTE: We don't support query on datetime, list or dict fields
     _query_mapping = resource.QueryParameters(
-        'description', 'flavor_id', 'name', 'status',
+        'description', 'flavor_id', 'id', 'name', 'status',
         is_admin_state_up='admin_state_up',
         is_distributed='distributed',
         is_ha='ha',
@@ -10,12 +10,16 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 import collections
+import concurrent.futures
+import hashlib
 from hashlib import sha1
 import hmac
+import itertools
 import json
 import os
 import time
 
+import keystoneauth1.exceptions
 import six
 from six.moves.urllib import parse
 
@@ -29,9 +33,28 @@ from openstack import proxy
 from openstack.cloud import _utils
 
 DEFAULT_OBJECT_SEGMENT_SIZE = 1073741824  # 1GB
+# Segments of streamed data are kept in memory while they are uploaded
+DEFAULT_STREAM_SEGMENT_SIZE = 256 * 1024 * 1024
 DEFAULT_MAX_FILE_SIZE = (5 * 1024 * 1024 * 1024 + 2) / 2
 
 
+def _get_sync_prefix(prefix):
+    if not prefix:
+        return ''
+    return prefix.rstrip('/') + '/'
+
+
+def _is_segment(name, names):
+    # Segments of large objects are named after them, with the index of
+    # the segment.
+    (large_object, _, index) = name.rpartition('/')
+    return len(index) == 6 and index.isdigit() and large_object in names
+
+
+def _has_segments(name, names):
+    return '{name}/000000'.format(name=name) in names
+
+
 class Proxy(proxy.Proxy):
 
     skip_discovery = True
@@ -213,7 +236,8 @@ class Proxy(proxy.Proxy):
             obj=obj, container=container)
         return self._get(_obj.Object, obj, container=container_name)
 
-    def download_object(self, obj, container=None, **attrs):
+    def download_object(self, obj, container=None, output=None,
+                        workers=None, part_size=None, **attrs):
         """Download the data contained inside an object.
 
         :param obj: The value can be the name of an object or a
@@ -221,7 +245,18 @@ class Proxy(proxy.Proxy):
         :param container: The value can be the name of a container or a
                :class:`~openstack.object_store.v1.container.Container`
                instance.
-
+        :param output: A path or file object to write the data to, instead of
+            returning it. The md5 of the data written is verified.
+        :param int workers: When given with ``output``, download the object in
+            parts, with up to this number of concurrent ranged requests. The
+            output must be a path or a file object opened for reading and
+            writing, otherwise the object is downloaded in a single request.
+        :param int part_size: Size in bytes of the parts downloaded with
+            ``workers``. Defaults to 64 MiB.
+
+        :returns: The contents of the object, or the
+            :class:`~openstack.object_store.v1.obj.Object` when ``output`` is
+            given.
         :raises: :class:`~openstack.exceptions.ResourceNotFound`
                  when no resource can be found.
         """
@@ -229,7 +264,8 @@ class Proxy(proxy.Proxy):
             obj=obj, container=container)
         obj = self._get_resource(
             _obj.Object, obj, container=container_name, **attrs)
-        return obj.download(self)
+        return obj.download(
+            self, output=output, workers=workers, part_size=part_size)
 
     def stream_object(self, obj, container=None, chunk_size=1024, **attrs):
         """Stream the data contained inside an object.
@@ -255,7 +291,7 @@ class Proxy(proxy.Proxy):
             self, container, name, filename=None,
             md5=None, sha256=None, segment_size=None,
             use_slo=True, metadata=None,
-            generate_checksums=None, data=None,
+            generate_checksums=None, data=None, resume=False,
             **headers):
         """Create a file object.
 
@@ -267,7 +303,14 @@ class Proxy(proxy.Proxy):
         :param filename: The path to the local file whose contents will be
             uploaded. Mutually exclusive with data.
         :param data: The content to upload to the object. Mutually exclusive
-           with filename.
+           with filename. Either bytes, or a file-like object or an iterable
+           of bytes which is streamed. Streams larger than ``segment_size``,
+           which defaults to 256 MiB for them, are uploaded as a large object
+           whose segments are uploaded concurrently. As many segments as the
+           executor of the connection has workers are kept in memory. Unless
+           ``generate_checksums`` is False, the checksums of such large
+           objects are computed as the segments are cut and set with the
+           manifest.
         :param md5: A hexadecimal md5 of the file. (Optional), if it is known
             and can be passed here, it will save repeating the expensive md5
             process. It is assumed to be accurate.
@@ -284,9 +327,17 @@ class Proxy(proxy.Proxy):
             (optional, defaults to True)
         :param generate_checksums: Whether to generate checksums on the client
             side that get added to headers for later prevention of double
-            uploads of identical data. (optional, defaults to True)
+            uploads of identical data. (optional, defaults to True). Unless
+            they are needed to compare the file with an existing object, the
+            checksums are computed while uploading so that the file is only
+            read once. They are then set after the upload of the object, or
+            with the manifest of large objects.
         :param metadata: This dict will get changed into headers that set
             metadata of the object
+        :param resume: Whether to resume a previous upload of a large object
+            which was interrupted. The segments already uploaded are listed
+            and only the ones missing, or whose size or md5 do not match the
+            file, are uploaded again. (optional, defaults to False)
 
         :raises: ``OpenStackCloudException`` on operation error.
         """
@@ -299,6 +350,8 @@ class Proxy(proxy.Proxy):
         if data is not None and generate_checksums:
             raise ValueError(
                 "checksums cannot be generated with data parameter")
+        # Streamed large objects are hashed as their segments are cut
+        hash_stream = generate_checksums is None
         if generate_checksums is None:
             if data is not None:
                 generate_checksums = False
@@ -312,7 +365,8 @@ class Proxy(proxy.Proxy):
             filename = name
 
         if generate_checksums and (md5 is None or sha256 is None):
-            (md5, sha256) = self._connection._get_file_hashes(filename)
+            # Hashes not known yet are computed while uploading
+            (md5, sha256) = self._connection._get_cached_file_hashes(filename)
         if md5:
             headers[self._connection._OBJECT_MD5_KEY] = md5 or ''
         if sha256:
@@ -331,6 +385,18 @@ class Proxy(proxy.Proxy):
             self.log.debug(
                 "swift uploading data to %(endpoint)s",
                 {'endpoint': endpoint})
+            if _utils.is_stream(data):
+                segment_size = self.get_object_segment_size(
+                    int(segment_size or DEFAULT_STREAM_SEGMENT_SIZE))
+                segments = _utils.get_data_segments(data, segment_size)
+                data = next(segments, b'')
+                if len(data) == segment_size:
+                    # The first segment is not kept in memory during the
+                    # whole upload.
+                    segments, data = itertools.chain([data], segments), None
+                    return self._upload_large_object_data(
+                        endpoint, headers, segments, use_slo,
+                        hash_stream and not (md5 and sha256))
             # TODO(gtema): custom headers need to be somehow injected
             return self._create(
                 _obj.Object, container=container_name,
@@ -345,6 +411,18 @@ class Proxy(proxy.Proxy):
 
         if self.is_object_stale(container_name, name, filename, md5, sha256):
 
+            hasher = None
+            if generate_checksums and (md5 is None or sha256 is None):
+                # The stale check hashes the file if it has to be compared
+                # with an existing object.
+                (md5, sha256) = self._connection._get_cached_file_hashes(
+                    filename)
+                if md5 is None:
+                    hasher = _utils.FileHasher(filename)
+                else:
+                    headers[self._connection._OBJECT_MD5_KEY] = md5
+                    headers[self._connection._OBJECT_SHA256_KEY] = sha256
+
             self._connection.log.debug(
                 "swift uploading %(filename)s to %(endpoint)s",
                 {'filename': filename, 'endpoint': endpoint})
@@ -352,11 +430,16 @@ class Proxy(proxy.Proxy):
             if file_size <= segment_size:
                 # TODO(gtema): replace with regular resource put, but
                 # custom headers need to be somehow injected
-                self._upload_object(endpoint, filename, headers)
+                self._upload_object(endpoint, filename, headers, hasher)
             else:
+                uploaded_segments = None
+                if resume:
+                    uploaded_segments = self._get_uploaded_segments(
+                        container_name, name)
                 self._upload_large_object(
                     endpoint, filename, headers,
-                    file_size, segment_size, use_slo)
+                    file_size, segment_size, use_slo, hasher,
+                    uploaded_segments)
 
     # Backwards compat
     upload_object = create_object
@@ -470,15 +553,22 @@ class Proxy(proxy.Proxy):
                     container=container, name=name))
             return True
 
-        if not (file_md5 or file_sha256):
-            (file_md5, file_sha256) = \
-                self._connection._get_file_hashes(filename)
         md5_key = metadata.get(
             self._connection._OBJECT_MD5_KEY,
             metadata.get(self._connection._SHADE_OBJECT_MD5_KEY, ''))
         sha256_key = metadata.get(
             self._connection._OBJECT_SHA256_KEY, metadata.get(
                 self._connection._SHADE_OBJECT_SHA256_KEY, ''))
+        if not (md5_key or sha256_key):
+            # Nothing to compare with, no need to hash the file
+            self._connection.log.debug(
+                "swift stale check, no checksums: {container}/{name}".format(
+                    container=container, name=name))
+            return True
+
+        if not (file_md5 or file_sha256):
+            (file_md5, file_sha256) = \
+                self._connection._get_file_hashes(filename)
         up_to_date = self._connection._hashes_up_to_date(
             md5=file_md5, sha256=file_sha256,
             md5_key=md5_key, sha256_key=sha256_key)
@@ -495,13 +585,207 @@ class Proxy(proxy.Proxy):
             {'container': container, 'name': name})
         return False
 
+    def sync_directory(self, local_path, container, prefix=None,
+                       delete=False, workers=None, progress=None):
+        """Upload the files of a directory tree which are not up to date.
+
+        The objects of the container are listed once. A file is uploaded
+        when there is no object of its name, or when their sizes differ or
+        the md5 of the file, remembered by the file hash cache of the
+        connection, differs from the etag of the object. The metadata of
+        large objects, recognized by their first segment being listed beside
+        them, is fetched to compare their checksums, their etags not being
+        the md5 of their data.
+
+        :param str local_path: Path of the directory to upload.
+        :param container: The name of the container or a
+            :class:`~openstack.object_store.v1.container.Container`.
+        :param str prefix: Prefix of the objects of the files, such as
+            ``backups``, the objects of ``local_path/a/b`` being named
+            ``backups/a/b``. (optional)
+        :param bool delete: Whether to delete the objects of the prefix whose
+            file does not exist anymore. (optional, defaults to False)
+        :param int workers: Number of files to upload at once. Defaults to
+            the number of workers of the executor of the connection.
+        :param progress: Callable called with the name of the object, the
+            number of files and objects processed and their total, once
+            each of them was uploaded, deleted or found up to date.
+
+        :returns: A dict of the sorted names of the objects ``uploaded`` and
+            ``deleted``.
+        """
+        container_name = self._get_container_name(container=container)
+        prefix = _get_sync_prefix(prefix)
+        objects = self._get_sync_objects(container_name, prefix)
+        files = {}
+        for directory, _, filenames in os.walk(local_path):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                relative = os.path.relpath(path, local_path)
+                files[prefix + relative.replace(os.sep, '/')] = path
+        deleted = []
+        if delete:
+            deleted = sorted(
+                name for name in objects
+                if name not in files and not _is_segment(name, files))
+
+        def upload(name):
+            path = files[name]
+            if not self._is_sync_file_changed(
+                    container_name, objects.get(name), path,
+                    _has_segments(name, objects)):
+                return False
+            self.create_object(container_name, name, filename=path)
+            return True
+
+        def remove(name):
+            self.delete_object(name, container=container_name)
+            return True
+
+        uploaded = self._sync(
+            [(upload, name) for name in sorted(files)]
+            + [(remove, name) for name in deleted],
+            workers, progress)
+        return dict(
+            uploaded=sorted(name for name in uploaded if name in files),
+            deleted=deleted)
+
+    def download_directory(self, container, local_path, prefix=None,
+                           delete=False, workers=None, progress=None):
+        """Download the objects of a container which are not up to date.
+
+        This is the reverse of :meth:`sync_directory`. The objects of the
+        container are listed once, and downloaded when there is no file of
+        their name, or when the file differs from them. Directory markers
+        and the segments of large objects are skipped.
+
+        :param container: The name of the container or a
+            :class:`~openstack.object_store.v1.container.Container`.
+        :param str local_path: Path of the directory to download to. It is
+            created if needed.
+        :param str prefix: Only download the objects of this prefix, such
+            as ``backups``, the object ``backups/a/b`` being downloaded to
+            ``local_path/a/b``. (optional)
+        :param bool delete: Whether to delete the files of the directory
+            which have no object anymore. (optional, defaults to False)
+        :param int workers: Number of objects to download at once. Defaults
+            to the number of workers of the executor of the connection.
+        :param progress: Callable called with the name of the object, the
+            number of objects and files processed and their total, once
+            each of them was downloaded, deleted or found up to date.
+
+        :returns: A dict of the sorted names of the objects ``downloaded``
+            and of the paths of the files ``deleted``.
+        """
+        container_name = self._get_container_name(container=container)
+        prefix = _get_sync_prefix(prefix)
+        objects = self._get_sync_objects(container_name, prefix)
+        root = os.path.abspath(local_path)
+        files = {}
+        for name, obj in objects.items():
+            if name.endswith('/') or _is_segment(name, objects):
+                continue
+            path = os.path.abspath(
+                os.path.join(root, *name[len(prefix):].split('/')))
+            if not path.startswith(root + os.sep):
+                self.log.warning(
+                    "Skipping object %s which is outside of %s",
+                    name, local_path)
+                continue
+            files[path] = name
+        deleted = []
+        if delete:
+            for directory, _, filenames in os.walk(root):
+                deleted.extend(
+                    path for path in (
+                        os.path.join(directory, filename)
+                        for filename in filenames)
+                    if path not in files)
+            deleted.sort()
+
+        def download(path):
+            name = files[path]
+            if not self._is_sync_file_changed(
+                    container_name, objects[name], path,
+                    _has_segments(name, objects)):
+                return False
+            directory = os.path.dirname(path)
+            try:
+                os.makedirs(directory)
+            except OSError:
+                # Created by another download
+                if not os.path.isdir(directory):
+                    raise
+            self.download_object(name, container=container_name, output=path)
+            return True
+
+        def remove(path):
+            os.remove(path)
+            return True
+
+        downloaded = self._sync(
+            [(download, path) for path in sorted(files, key=files.get)]
+            + [(remove, path) for path in deleted],
+            workers, progress, names=files)
+        return dict(
+            downloaded=sorted(
+                files[path] for path in downloaded if path in files),
+            deleted=deleted)
+
+    def _get_sync_objects(self, container, prefix):
+        return {
+            obj.name: obj for obj in self.objects(container, prefix=prefix)}
+
+    def _is_sync_file_changed(self, container, obj, filename, large=False):
+        if obj is None or not os.path.exists(filename):
+            return True
+        if obj.content_length != os.path.getsize(filename):
+            return True
+        (md5, sha256) = self._connection._get_file_hashes(filename)
+        if md5 == obj.etag:
+            return False
+        if not large:
+            return True
+        # The etag of large objects is not the md5 of their data
+        return self.is_object_stale(container, obj.name, filename, md5, sha256)
+
+    def _sync(self, tasks, workers, progress, names=None):
+        # The transfers run on their own executor. Large objects are uploaded
+        # and downloaded in segments or parts on the executor of the
+        # connection, which the transfers would block if they ran on it.
+        workers = workers or _utils.get_max_workers(
+            self._connection._pool_executor)
+        done = []
+        with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+            futures = collections.OrderedDict(
+                (executor.submit(fn, item), item) for fn, item in tasks)
+            try:
+                for count, future in enumerate(
+                        concurrent.futures.as_completed(futures), 1):
+                    item = futures[future]
+                    if future.result():
+                        done.append(item)
+                    if progress:
+                        progress(
+                            names.get(item, item) if names else item,
+                            count, len(futures))
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+        return done
+
     def _upload_large_object(
             self, endpoint, filename,
-            headers, file_size, segment_size, use_slo):
+            headers, file_size, segment_size, use_slo, hasher=None,
+            uploaded_segments=None):
         # If the object is big, we need to break it up into segments that
         # are no larger than segment_size, upload each of them individually
         # and then upload a manifest object. The segments can be uploaded in
         # parallel, so we'll use the async feature of the TaskManager.
+        # When checksums are computed while uploading, the data of the
+        # segments read ahead is kept by the hasher until it can be hashed.
+        # When resuming an upload, the segments already uploaded are skipped.
 
         segment_futures = []
         segment_results = []
@@ -509,20 +793,41 @@ class Proxy(proxy.Proxy):
         retry_futures = []
         manifest = []
 
-        # Get an OrderedDict with keys being the swift location for the
-        # segment, the value a FileSegment file-like object that is a
-        # slice of the data for the segment.
-        segments = self._get_file_segments(
-            endpoint, filename, file_size, segment_size)
+        # The FileSegment file-like objects that are a slice of the data
+        # for the segments, by swift location. They only open the file while
+        # they are uploaded.
+        segments = {}
+        running = set()
+        # Segments are produced as the upload of the previous ones finish,
+        # so that no more are pending than the executor can upload at once.
+        executor = self._connection._pool_executor
+        window = _utils.get_max_workers(executor)
+
+        uploaded_segments = uploaded_segments or {}
 
         # Schedule the segments for upload
-        for name, segment in segments.items():
+        for name, segment in self._get_file_segments(
+                endpoint, filename, file_size, segment_size):
+            segments[name] = segment
+            index = name.rsplit('/', 1)[-1]
+            uploaded = uploaded_segments.pop(index, None)
+            if uploaded is not None and _utils.segment_matches(
+                    segment, uploaded, hasher):
+                self.log.debug("swift segment already uploaded: %s", name)
+                manifest.append(dict(
+                    path='/{name}'.format(name=name),
+                    size_bytes=segment.length,
+                    etag=uploaded.etag))
+                continue
             # Async call to put - schedules execution and returns a future
-            segment_future = self._connection._pool_executor.submit(
-                self.put,
-                name, headers=headers, data=segment,
+            segment_future = executor.submit(
+                self._upload_segment, name, headers, segment, hasher,
                 raise_exc=False)
             segment_futures.append(segment_future)
+            running.add(segment_future)
+            if len(running) >= window:
+                _, running = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED)
             # TODO(mordred) Collect etags from results to add to this manifest
             # dict. Then sort the list of dicts by path.
             manifest.append(dict(
@@ -541,9 +846,8 @@ class Proxy(proxy.Proxy):
             segment = segments[name]
             segment.seek(0)
             # Async call to put - schedules execution and returns a future
-            segment_future = self._connection._pool_executor.submit(
-                self.put,
-                name, headers=headers, data=segment)
+            segment_future = executor.submit(
+                self._upload_segment, name, headers, segment, hasher)
             # TODO(mordred) Collect etags from results to add to this manifest
             # dict. Then sort the list of dicts by path.
             retry_futures.append(segment_future)
@@ -554,11 +858,80 @@ class Proxy(proxy.Proxy):
 
         self._add_etag_to_manifest(segment_results, manifest)
 
+        if not use_slo:
+            # Every object of the prefix is part of a dynamic large object,
+            # including the segments of a previous upload of a larger file.
+            for index in uploaded_segments:
+                self.delete('{endpoint}/{index}'.format(
+                    endpoint=endpoint, index=index))
+
+        if hasher:
+            headers = self._connection._get_hasher_headers(hasher, headers)
+
         if use_slo:
             return self._finish_large_object_slo(endpoint, headers, manifest)
         else:
             return self._finish_large_object_dlo(endpoint, headers)
 
+    def _upload_large_object_data(self, endpoint, headers, segments,
+                                  use_slo, generate_checksums=False):
+        # The segments are read from the stream while the previous ones are
+        # uploaded. No more are pending than the executor uploads at once,
+        # which bounds the memory used to as many segments.
+        executor = self._connection._pool_executor
+        window = _utils.get_max_workers(executor)
+        segment_futures = []
+        running = set()
+        manifest = []
+        md5 = hashlib.md5()
+        sha256 = hashlib.sha256()
+
+        for index, segment in enumerate(segments):
+            name = '{endpoint}/{index:0>6}'.format(
+                endpoint=endpoint, index=index)
+            if generate_checksums:
+                md5.update(segment)
+                sha256.update(segment)
+            segment_future = executor.submit(
+                self._upload_data_segment, name, headers, segment)
+            segment_futures.append(segment_future)
+            running.add(segment_future)
+            manifest.append(dict(
+                path='/{name}'.format(name=name),
+                size_bytes=len(segment)))
+            if len(running) >= window:
+                done, running = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED)
+                # Stop reading the stream once a segment failed
+                for future in done:
+                    future.result()
+
+        segment_results = [future.result() for future in segment_futures]
+        self._add_etag_to_manifest(segment_results, manifest)
+
+        if generate_checksums:
+            headers = headers.copy()
+            headers[self._connection._OBJECT_MD5_KEY] = md5.hexdigest()
+            headers[self._connection._OBJECT_SHA256_KEY] = sha256.hexdigest()
+
+        if use_slo:
+            return self._finish_large_object_slo(endpoint, headers, manifest)
+        else:
+            return self._finish_large_object_dlo(endpoint, headers)
+
+    def _upload_data_segment(self, name, headers, data):
+        # The stream can not be read again, so a failed segment is retried
+        # while its data is still in memory.
+        try:
+            response = self.put(name, headers=headers, data=data)
+            exceptions.raise_from_response(response)
+        except (keystoneauth1.exceptions.RetriableConnectionFailure,
+                exceptions.HttpException) as e:
+            self.log.debug("Retrying upload of segment %s: %s", name, e)
+            response = self.put(name, headers=headers, data=data)
+            exceptions.raise_from_response(response)
+        return response
+
     def _finish_large_object_slo(self, endpoint, headers, manifest):
         # TODO(mordred) send an etag of the manifest, which is the md5sum
         # of the concatenation of the etags of the results
@@ -573,23 +946,47 @@ class Proxy(proxy.Proxy):
         headers['X-Object-Manifest'] = endpoint
         return self.put(endpoint, headers=headers)
 
-    def _upload_object(self, endpoint, filename, headers):
+    def _upload_object(self, endpoint, filename, headers, hasher=None):
         with open(filename, 'rb') as dt:
-            return proxy._json_response(self.put(
+            if hasher:
+                dt = _utils.HashingReader(dt, hasher)
+            response = proxy._json_response(self.put(
                 endpoint, headers=headers, data=dt))
+        if not hasher:
+            return response
+        # POST replaces all the metadata, so send it again with the checksums
+        return proxy._json_response(self.post(
+            endpoint,
+            headers=self._connection._get_hasher_headers(hasher, headers)))
+
+    def _upload_segment(self, name, headers, segment, hasher, **kwargs):
+        try:
+            return self.put(
+                name, headers=headers,
+                data=self._get_segment_data(segment, hasher), **kwargs)
+        finally:
+            # The request may fail before the segment was read entirely
+            segment.close()
+
+    def _get_segment_data(self, segment, hasher):
+        if not hasher:
+            return segment
+        return _utils.HashingReader(segment, hasher, segment.offset)
 
     def _get_file_segments(self, endpoint, filename, file_size, segment_size):
-        # Use an ordered dict here so that testing can replicate things
-        segments = collections.OrderedDict()
-        for (index, offset) in enumerate(range(0, file_size, segment_size)):
-            remaining = file_size - (index * segment_size)
-            segment = _utils.FileSegment(
-                filename, offset,
-                segment_size if segment_size < remaining else remaining)
-            name = '{endpoint}/{index:0>6}'.format(
-                endpoint=endpoint, index=index)
-            segments[name] = segment
-        return segments
+        return _utils.get_file_segments(
+            endpoint, filename, file_size, segment_size)
+
+    def _get_uploaded_segments(self, container, name):
+        """Get the segments already uploaded for a large object.
+
+        :returns: A dict of the segment objects listed in the container by
+            their index, such as ``000001``.
+        """
+        prefix = '{name}/'.format(name=name)
+        return {
+            obj.name[len(prefix):]: obj
+            for obj in self.objects(container, prefix=prefix)}
 
     def get_object_segment_size(self, segment_size):
         """Get a segment size that will work given capabilities"""
@@ -12,7 +12,11 @@
 # under the License.
 
 import copy
+import hashlib
 
+import six
+
+from openstack import _parallel_download
 from openstack import exceptions
 from openstack.object_store.v1 import _base
 from openstack import resource
@@ -276,9 +280,72 @@ class Object(_base.BaseResource):
         exceptions.raise_from_response(response, error_message=error_message)
         return response
 
-    def download(self, session, error_message=None):
-        response = self._download(session, error_message=error_message)
-        return response.content
+    def download(self, session, error_message=None, output=None,
+                 workers=None, part_size=None):
+        """Download the data of the object.
+
+        :param session: The session to use for making this request.
+        :param str error_message: Message of the errors of the requests.
+        :param output: Path of a file or file object to write the data to,
+            rather than returning it.
+        :param int workers: When given with ``output``, download the data
+            in parts, with up to this number of concurrent ranged requests
+            written at their offset of the output.
+            See :func:`openstack._parallel_download.can_download_in_parts`.
+        :param int part_size: Size of the parts, in bytes.
+
+        :returns: The data of the object, or this object when ``output`` is
+            given, in which case the md5 of the data written is verified.
+        """
+        if output is None:
+            response = self._download(session, error_message=error_message)
+            return response.content
+
+        self.head(session)
+        headers = {}
+        if self._is_large_object():
+            # The etag of a large object is not the md5 of its data.
+            checksum = (self.metadata.get('x-sdk-md5')
+                        or self.metadata.get('x-shade-md5'))
+        else:
+            checksum = self.etag.strip('"') if self.etag else None
+            if checksum:
+                # Fail rather than mix parts of another version
+                headers['If-Match'] = checksum
+        if (workers and workers > 1 and self.content_length
+                and _parallel_download.can_download_in_parts(output)):
+            digest = _parallel_download.download(
+                session, self._prepare_request().url, self.content_length,
+                output, workers, part_size=part_size, headers=headers,
+                error_message=error_message)
+        else:
+            digest = self._download_to(session, output, error_message)
+        if checksum and digest != checksum:
+            raise exceptions.InvalidResponse(
+                "checksum mismatch: %s != %s" % (checksum, digest))
+        return self
+
+    def _is_large_object(self):
+        return bool(self.is_static_large_object or self.object_manifest)
+
+    def _download_to(self, session, output, error_message=None):
+        response = self._download(
+            session, error_message=error_message, stream=True)
+        md5 = hashlib.md5()
+        if isinstance(output, six.string_types):
+            fd = open(output, 'wb')
+        else:
+            fd = output
+        try:
+            for chunk in response.iter_content(
+                    _parallel_download.DEFAULT_CHUNK_SIZE):
+                fd.write(chunk)
+                md5.update(chunk)
+        finally:
+            response.close()
+            if fd is not output:
+                fd.close()
+        return md5.hexdigest()
 
     def stream(self, session, error_message=None, chunk_size=1024):
         response = self._download(
@@ -20,6 +20,7 @@ from six.moves import urllib
 from keystoneauth1 import adapter
 
 from openstack import _log
+from openstack import events
 from openstack import exceptions
 from openstack import resource
 
@@ -142,6 +143,30 @@ class Proxy(adapter.Adapter):
             log_name = 'openstack'
         self.log = _log.setup_logging(log_name)
 
+    @property
+    def wait_strategy(self):
+        """Default polling strategy of the ``wait_for_*`` methods
+
+        Set with ``wait_strategy`` in the cloud config, either as a single
+        value or as a dict of values keyed by service type. See
+        :func:`openstack.utils.iterate_intervals` for the possible values.
+        """
+        conn = self._get_connection()
+        if conn:
+            return conn.config.get_wait_strategy(self.service_type)
+
+    @property
+    def wait_max_interval(self):
+        """Default longest interval between checks of the ``wait_for_*``
+        methods, for the strategies which increase it.
+
+        Set with ``wait_max_interval`` in the cloud config, either as a
+        single value or as a dict of values keyed by service type.
+        """
+        conn = self._get_connection()
+        if conn:
+            return conn.config.get_wait_max_interval(self.service_type)
+
     def request(
             self, url, method, error_message=None,
             raise_exc=False, connect_retries=1,
@@ -203,6 +228,16 @@ class Proxy(adapter.Adapter):
             self, '_connection', getattr(
                 self.session, '_sdk_connection', None))
 
+    def _emit_mutation(self, action, res):
+        """Announce a change to a resource to the events of the connection.
+
+        See :mod:`openstack.events`.
+        """
+        mutation_events = getattr(
+            self._get_connection(), 'mutation_events', None)
+        if mutation_events is not None:
+            mutation_events.emit(action, self.service_type, res)
+
     def _get_resource(self, resource_type, value, **attrs):
         """Get a resource object to work on
 
@@ -308,6 +343,7 @@ class Proxy(adapter.Adapter):
                 return None
             raise
 
+        self._emit_mutation(events.DELETE, res)
         return rv
 
     @_check_resource(strict=False)
@@ -333,7 +369,9 @@ class Proxy(adapter.Adapter):
         :rtype: :class:`~openstack.resource.Resource`
         """
         res = self._get_resource(resource_type, value, **attrs)
-        return res.commit(self, base_path=base_path)
+        rv = res.commit(self, base_path=base_path)
+        self._emit_mutation(events.UPDATE, rv)
+        return rv
 
     def _create(self, resource_type, base_path=None, **attrs):
         """Create a resource from attributes
@@ -357,7 +395,34 @@ class Proxy(adapter.Adapter):
         """
         conn = self._get_connection()
         res = resource_type.new(connection=conn, **attrs)
-        return res.create(self, base_path=base_path)
+        rv = res.create(self, base_path=base_path)
+        self._emit_mutation(events.CREATE, rv)
+        return rv
+
+    def _bulk_create(self, resource_type, data, base_path=None,
+                     chunk_size=None):
+        """Create several resources of a type in as few requests as possible
+
+        :param resource_type: The type of resource to create.
+        :type resource_type: :class:`~openstack.resource.Resource`
+        :param list data: List of dicts of attributes to be passed onto the
+                          :meth:`~openstack.resource.Resource.bulk_create`
+                          method to be created.
+        :param str base_path: Base part of the URI for creating resources, if
+                              different from
+                              :data:`~openstack.resource.Resource.base_path`.
+        :param int chunk_size: Maximum number of resources to create per
+                               request. Defaults to ``None``, which creates
+                               all of them in a single request.
+
+        :returns: The result of the ``bulk_create``
+        :rtype: list of :class:`~openstack.resource.Resource`
+        """
+        rv = resource_type.bulk_create(self, data, base_path=base_path,
+                                       chunk_size=chunk_size)
+        for res in rv:
+            self._emit_mutation(events.CREATE, res)
+        return rv
 
     @_check_resource(strict=False)
     def _get(self, resource_type, value=None, requires_id=True,
@@ -34,6 +34,11 @@ and then returned to the caller.
 import collections
 import itertools
 
+try:
+    import ijson
+    from ijson import common as ijson_common
+except ImportError:
+    ijson = None
 import jsonpatch
 import operator
 from keystoneauth1 import adapter
@@ -48,6 +53,94 @@ from openstack import format
 from openstack import utils
 
 _SEEN_FORMAT = '{name}_seen'
+# Size of the chunks read from the network when streaming list responses.
+_STREAM_CHUNK_SIZE = 64 * 1024
+_JSON_START_EVENTS = ('start_map', 'start_array')
+_JSON_END_EVENTS = ('end_map', 'end_array')
+
+
+def _iter_json_events(chunks):
+    """Incrementally parse JSON chunks, yielding ijson parse events"""
+    events = ijson.sendable_list()
+    parser = ijson.parse_coro(events, use_float=True)
+    for chunk in chunks:
+        parser.send(chunk)
+        for event in events:
+            yield event
+        del events[:]
+    parser.close()
+    for event in events:
+        yield event
+
+
+def _iter_json_resources(chunks, resources_key, remainder):
+    """Incrementally decode the resources of a list response body
+
+    Items of the ``resources_key`` list (or of the top level list if the body
+    is a list) are yielded as soon as each of them has been parsed, so that
+    only one item is held in memory at a time rather than the whole body.
+    The other top level keys, such as pagination links, are stored in
+    ``remainder`` as they are found. It is complete once the generator is
+    exhausted.
+
+    :param chunks: Iterable of bytes making up the JSON document.
+    :param resources_key: Key of the list of resources in the body.
+    :param dict remainder: Receives the other top level keys of the body.
+    """
+    depth = 0
+    # Depth at which the items of the resources list live, once found.
+    items_depth = None
+    items_found = False
+    key = None
+    builder = None
+    builder_depth = None
+    for prefix, event, value in _iter_json_events(chunks):
+        if builder is not None:
+            builder.event(event, value)
+            if event in _JSON_START_EVENTS:
+                depth += 1
+            elif event in _JSON_END_EVENTS:
+                depth -= 1
+                if depth == builder_depth:
+                    if depth == items_depth:
+                        yield builder.value
+                    elif depth == 1:
+                        remainder[key] = builder.value
+                    builder = None
+            continue
+
+        if event in _JSON_START_EVENTS:
+            if depth == 0 and event == 'start_array':
+                items_depth = 1
+                items_found = True
+            elif (depth == 1 and event == 'start_array'
+                    and not items_found and key == resources_key):
+                items_depth = 2
+                items_found = True
+            elif depth > 0:
+                builder = ijson_common.ObjectBuilder()
+                builder.event(event, value)
+                builder_depth = depth
+            depth += 1
+        elif event in _JSON_END_EVENTS:
+            depth -= 1
+            if depth + 1 == items_depth:
+                items_depth = None
+        elif event == 'map_key':
+            if depth == 1:
+                key = value
+        elif depth == items_depth:
+            yield value
+        elif depth == 1:
+            remainder[key] = value
+
+    if not items_found:
+        # Not a list, handle it the same way as a fully decoded body.
+        if resources_key:
+            yield remainder.pop(resources_key)
+        else:
+            yield dict(remainder)
+            remainder.clear()
 
 
 def _convert_type(value, data_type, list_type=None):
@@ -256,6 +349,116 @@ class _ComponentManager(collections.MutableMapping):
             self._dirty = set()
 
 
+class _AttributeMapping(object):
+    """A server-side name to attribute name mapping ready for consumption
+
+    Wraps a mapping as returned by :meth:`Resource._get_mapping` together
+    with the lookup tables needed by :meth:`Resource._consume_attrs`, so
+    that matching a key is a couple of hash lookups rather than a scan
+    over the whole mapping.
+    """
+
+    def __init__(self, mapping):
+        self.mapping = mapping
+        self._values = set(mapping.values())
+        self._targets = {}
+        for map_key, map_value in mapping.items():
+            for name in set((map_key.lower(), map_value.lower())):
+                self._targets.setdefault(name, []).append(map_key)
+
+    def consume(self, attrs):
+        relevant_attrs = {}
+        consumed_keys = []
+        for key, value in attrs.items():
+            # We want the key lookup in mapping to be case insensitive if the
+            # mapping is, thus the use of the mapping itself. We want value
+            # to be exact.
+            if key in self._values or key in self.mapping:
+                for map_key in self._targets.get(key.lower(), ()):
+                    relevant_attrs[map_key] = value
+                consumed_keys.append(key)
+
+        for key in consumed_keys:
+            attrs.pop(key)
+
+        return relevant_attrs
+
+
+class _ResourceSchema(object):
+    """Per-class description of the components of a Resource
+
+    Looking up components requires walking the whole MRO of the class,
+    which is far too expensive to do for every instance created while
+    listing resources. A schema is built once per class on first use
+    and cached on the class itself.
+    """
+
+    def __init__(self, cls):
+        attributes = []
+        for klass in cls.__mro__:
+            for attr, component in klass.__dict__.items():
+                if isinstance(component, _BaseComponent):
+                    attributes.append((attr, component))
+        #: All (attribute name, component) pairs, subclasses first.
+        self.attributes = tuple(attributes)
+        #: Mapping of ``aka`` names to the attribute they stand for.
+        self.aliases = dict(
+            (component.aka, attr) for attr, component in attributes
+            if component.aka)
+
+        self.alternate_id = ""
+        for value in cls.__dict__.values():
+            if isinstance(value, Body) and value.alternate_id:
+                self.alternate_id = value.name
+                break
+
+        self._mappings = {}
+        self._to_dict_keys = {}
+
+    def iter_attributes(self, components):
+        for attr, component in self.attributes:
+            if isinstance(component, components):
+                yield attr, component
+
+    def get_mapping(self, component):
+        """Return the :class:`_AttributeMapping` for a component type"""
+        try:
+            return self._mappings[component]
+        except KeyError:
+            pass
+        mapping = component._map_cls()
+        ret = component._map_cls()
+        for key, value in self.iter_attributes(component):
+            # Make sure base classes don't end up overwriting
+            # mappings we've found previously in subclasses.
+            if key not in mapping:
+                # Make it this way first, to get MRO stuff correct.
+                mapping[key] = value.name
+        for k, v in mapping.items():
+            ret[v] = k
+        self._mappings[component] = _AttributeMapping(ret)
+        return self._mappings[component]
+
+    def get_to_dict_keys(self, components, original_names):
+        """Return (key, attribute name) pairs to be used by to_dict"""
+        cache_key = (components, original_names)
+        try:
+            return self._to_dict_keys[cache_key]
+        except KeyError:
+            pass
+        keys = []
+        for attr, component in self.iter_attributes(components):
+            if original_names:
+                key = component.name
+            else:
+                key = attr
+            for key in filter(None, (key, component.aka)):
+                if (key, attr) not in keys:
+                    keys.append((key, attr))
+        self._to_dict_keys[cache_key] = tuple(keys)
+        return self._to_dict_keys[cache_key]
+
+
 class _Request(object):
     """Prepared components that go into a KSA request"""
 
@@ -265,6 +468,42 @@ class _Request(object):
         self.headers = headers
 
 
+class _ListPage(object):
+    """One page of results of :meth:`Resource.list`
+
+    Iterating over the page builds resources out of the raw items one at a
+    time, keeping track of what is needed to request the next page.
+    """
+
+    def __init__(self, resource_type, raw_resources, microversion,
+                 connection):
+        self._resource_type = resource_type
+        self._raw_resources = raw_resources
+        self._microversion = microversion
+        self._connection = connection
+        #: ID of the last resource of the page seen so far.
+        self.marker = None
+        #: Number of resources of the page seen so far.
+        self.count = 0
+
+    def __iter__(self):
+        for raw_resource in self._raw_resources:
+            # Do not allow keys called "self" through. Glance chose
+            # to name a key "self", so we need to pop it out because
+            # we can't send it through cls.existing and into the
+            # Resource initializer. "self" is already the first
+            # argument and is practically a reserved word.
+            raw_resource.pop("self", None)
+
+            value = self._resource_type.existing(
+                microversion=self._microversion,
+                connection=self._connection,
+                **raw_resource)
+            self.marker = value.id
+            self.count += 1
+            yield value
+
+
 class QueryParameters(object):
 
     def __init__(self, *names, **mappings):
@@ -432,6 +671,9 @@ class Resource(dict):
     _max_microversion = None
     #: API microversion (string or None) this Resource was loaded with
     microversion = None
+    #: Base path to list resources with all of their attributes, if
+    #: different from :data:`~openstack.resource.Resource.base_path`.
+    _list_details_base_path = None
 
     _connection = None
     _body = None
@@ -441,6 +683,10 @@ class Resource(dict):
     _original_body = None
     _delete_response_class = None
     _store_unknown_attrs_as_properties = False
+    # Whether the dict storage is only filled in when it is first needed,
+    # and whether it currently needs to be (re)filled. See _update_dict.
+    _lazy_dict = False
+    _dict_stale = False
 
     # Placeholder for aliases as dict of {__alias__:__original}
     _attr_aliases = {}
@@ -459,6 +705,10 @@ class Resource(dict):
             protect itself with a check for None.
         """
         self._connection = connection
+        # NOTE: Compare against True explicitly so that mocked connections
+        # do not accidentally switch this on.
+        self._lazy_dict = getattr(
+            connection, 'lazy_resource_dict', False) is True
         self.microversion = attrs.pop('microversion', None)
         # NOTE: _collect_attrs modifies **attrs in place, removing
         # items as they match up with any of the body, header,
@@ -498,29 +748,32 @@ class Resource(dict):
 
         self._update_location()
 
-        for attr, component in self._attributes_iterator():
-            if component.aka:
-                # Register alias for the attribute (local name)
-                self._attr_aliases[component.aka] = attr
+        # Register aliases for the attributes (local names)
+        self._attr_aliases.update(self._get_schema().aliases)
 
-        # TODO(mordred) This is terrible, but is a hack at the moment to ensure
-        # json.dumps works. The json library does basically if not obj: and
-        # obj.items() ... but I think the if not obj: is short-circuiting down
-        # in the C code and thus since we don't store the data in self[] it's
-        # always False even if we override __len__ or __bool__.
-        dict.update(self, self.to_dict())
+        self._update_dict()
+
+    @classmethod
+    def _get_schema(cls):
+        """Return the :class:`_ResourceSchema` describing this class
+
+        The schema is built on first use and cached on the class, so that
+        the MRO is only walked once per class rather than once per instance.
+        """
+        # Look in the class' own __dict__ so that subclasses never pick up
+        # the schema of their parent.
+        schema = cls.__dict__.get('_resource_schema')
+        if schema is None:
+            schema = _ResourceSchema(cls)
+            cls._resource_schema = schema
+        return schema
 
     @classmethod
     def _attributes_iterator(cls, components=tuple([Body, Header])):
         """Iterator over all Resource attributes
         """
         # isinstance stricly requires this to be a tuple
-        # Since we're looking at class definitions we need to include
-        # subclasses, so check the whole MRO.
-        for klass in cls.__mro__:
-            for attr, component in klass.__dict__.items():
-                if isinstance(component, components):
-                    yield attr, component
+        return cls._get_schema().iter_attributes(components)
 
     def __repr__(self):
         pairs = [
@@ -547,6 +800,11 @@ class Resource(dict):
             self._computed.attributes == comparand._computed.attributes
         ])
 
+    def __ne__(self, comparand):
+        # dict.__ne__ would compare the dict storage, which is not filled in
+        # yet in lazy mode.
+        return not self.__eq__(comparand)
+
     def __getattribute__(self, name):
         """Return an attribute on this instance
 
@@ -661,13 +919,64 @@ class Resource(dict):
         self._uri.update(uri)
         self._computed.update(computed)
         self._update_location()
+        self._update_dict()
+
+    def _update_dict(self):
+        """Refresh the dict storage backing this resource.
 
+        Attribute access never looks at the dict storage, but plain dict
+        operations do.
+        """
         # TODO(mordred) This is terrible, but is a hack at the moment to ensure
         # json.dumps works. The json library does basically if not obj: and
         # obj.items() ... but I think the if not obj: is short-circuiting down
         # in the C code and thus since we don't store the data in self[] it's
         # always False even if we override __len__ or __bool__.
-        dict.update(self, self.to_dict())
+        if not self._lazy_dict:
+            dict.update(self, self.to_dict())
+            return
+        # In lazy mode only make sure the storage is not empty, which is
+        # enough for json to go on and call our items(). The real contents
+        # are filled in by _materialize_dict when something reads them.
+        self._dict_stale = True
+        if not dict.__len__(self):
+            dict.__setitem__(self, 'id', self.id)
+
+    def _materialize_dict(self):
+        """Fill in the dict storage if it was deferred by lazy mode.
+
+        Called by the dict methods which read the storage. keys(), items()
+        and copy(), as well as comparisons, are computed from the attributes
+        and do not need it.
+        """
+        if self._dict_stale:
+            self._dict_stale = False
+            dict.update(self, self.to_dict())
+
+    def __iter__(self):
+        self._materialize_dict()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        if not self._dict_stale:
+            return dict.__len__(self)
+        # The keys are known without computing the values, which keeps the
+        # truth value test done by json cheap.
+        keys = self._get_schema().get_to_dict_keys(
+            (Body, Header, Computed), False)
+        return len(set(key for key, _ in keys))
+
+    def __contains__(self, name):
+        self._materialize_dict()
+        return dict.__contains__(self, name)
+
+    def get(self, name, default=None):
+        self._materialize_dict()
+        return dict.get(self, name, default)
+
+    def values(self):
+        self._materialize_dict()
+        return dict.values(self)
 
     def _collect_attrs(self, attrs):
         """Given attributes, return a dict per type of attribute
@@ -684,14 +993,18 @@ class Resource(dict):
             # Keep also remaining (unknown) attributes
             body = self._pack_attrs_under_properties(body, attrs)
 
+        schema = self._get_schema()
         if any([body, header, uri]):
             attrs = self._compute_attributes(body, header, uri)
 
-            body.update(self._consume_attrs(self._body_mapping(), attrs))
+            body.update(self._consume_attrs(
+                schema.get_mapping(Body), attrs))
 
-            header.update(self._consume_attrs(self._header_mapping(), attrs))
-            uri.update(self._consume_attrs(self._uri_mapping(), attrs))
-        computed = self._consume_attrs(self._computed_mapping(), attrs)
+            header.update(self._consume_attrs(
+                schema.get_mapping(Header), attrs))
+            uri.update(self._consume_attrs(
+                schema.get_mapping(URI), attrs))
+        computed = self._consume_attrs(schema.get_mapping(Computed), attrs)
         # TODO(mordred) We should make a Location Resource and add it here
         # instead of just the dict.
         if self._connection:
@@ -749,7 +1062,7 @@ class Resource(dict):
         self._uri.clean()
 
     def _consume_mapped_attrs(self, mapping_cls, attrs):
-        mapping = self._get_mapping(mapping_cls)
+        mapping = self._get_schema().get_mapping(mapping_cls)
         return self._consume_attrs(mapping, attrs)
 
     def _consume_attrs(self, mapping, attrs):
@@ -761,27 +1074,13 @@ class Resource(dict):
         us to only calculate their place and existence in a particular
         type of Resource component one time, rather than looking at the
         same source dict several times.
-        """
-        relevant_attrs = {}
-        consumed_keys = []
-        for key, value in attrs.items():
-            # We want the key lookup in mapping to be case insensitive if the
-            # mapping is, thus the use of get. We want value to be exact.
-            # If we find a match, we then have to loop over the mapping for
-            # to find the key to return, as there isn't really a "get me the
-            # key that matches this other key". We lower() in the inner loop
-            # because we've already done case matching in the outer loop.
-            if key in mapping.values() or mapping.get(key):
-                for map_key, map_value in mapping.items():
-                    if key.lower() in (map_key.lower(), map_value.lower()):
-                        relevant_attrs[map_key] = value
-                        consumed_keys.append(key)
-                continue
 
-        for key in consumed_keys:
-            attrs.pop(key)
-
-        return relevant_attrs
+        ``mapping`` is either a plain mapping as returned by
+        :meth:`_get_mapping` or the precompiled one held by the class schema.
+        """
+        if not isinstance(mapping, _AttributeMapping):
+            mapping = _AttributeMapping(mapping)
+        return mapping.consume(attrs)
 
     def _clean_body_attrs(self, attrs):
         """Mark the attributes as up-to-date."""
@@ -794,17 +1093,8 @@ class Resource(dict):
     @classmethod
     def _get_mapping(cls, component):
         """Return a dict of attributes of a given component on the class"""
-        mapping = component._map_cls()
-        ret = component._map_cls()
-        for key, value in cls._attributes_iterator(component):
-            # Make sure base classes don't end up overwriting
-            # mappings we've found previously in subclasses.
-            if key not in mapping:
-                # Make it this way first, to get MRO stuff correct.
-                mapping[key] = value.name
-        for k, v in mapping.items():
-            ret[v] = k
-        return ret
+        # Hand out a copy so callers can't corrupt the cached schema.
+        return cls._get_schema().get_mapping(component).mapping.copy()
 
     @classmethod
     def _body_mapping(cls):
@@ -836,11 +1126,7 @@ class Resource(dict):
         Returns an empty string if no name exists, as this method is
         consumed by _get_id and passed to getattr.
         """
-        for value in cls.__dict__.values():
-            if isinstance(value, Body):
-                if value.alternate_id:
-                    return value.name
-        return ""
+        return cls._get_schema().alternate_id
 
     @staticmethod
     def _get_id(value):
@@ -944,35 +1230,31 @@ class Resource(dict):
         # but is slightly different in that we're looking at an instance
         # and we're mapping names on this class to their actual stored
         # values.
-        for attr, component in self._attributes_iterator(components):
-            if original_names:
-                key = component.name
-            else:
-                key = attr
-            for key in filter(None, (key, component.aka)):
-                # Make sure base classes don't end up overwriting
-                # mappings we've found previously in subclasses.
-                if key not in mapping:
-                    value = getattr(self, attr, None)
-                    if ignore_none and value is None:
-                        continue
-                    if isinstance(value, Resource):
-                        mapping[key] = value.to_dict(_to_munch=_to_munch)
-                    elif isinstance(value, dict) and _to_munch:
-                        mapping[key] = munch.Munch(value)
-                    elif value and isinstance(value, list):
-                        converted = []
-                        for raw in value:
-                            if isinstance(raw, Resource):
-                                converted.append(
-                                    raw.to_dict(_to_munch=_to_munch))
-                            elif isinstance(raw, dict) and _to_munch:
-                                converted.append(munch.Munch(raw))
-                            else:
-                                converted.append(raw)
-                        mapping[key] = converted
-                    else:
-                        mapping[key] = value
+        keys = self._get_schema().get_to_dict_keys(components, original_names)
+        for key, attr in keys:
+            # Make sure base classes don't end up overwriting
+            # mappings we've found previously in subclasses.
+            if key not in mapping:
+                value = getattr(self, attr, None)
+                if ignore_none and value is None:
+                    continue
+                if isinstance(value, Resource):
+                    mapping[key] = value.to_dict(_to_munch=_to_munch)
+                elif isinstance(value, dict) and _to_munch:
+                    mapping[key] = munch.Munch(value)
+                elif value and isinstance(value, list):
+                    converted = []
+                    for raw in value:
+                        if isinstance(raw, Resource):
+                            converted.append(
+                                raw.to_dict(_to_munch=_to_munch))
+                        elif isinstance(raw, dict) and _to_munch:
+                            converted.append(munch.Munch(raw))
+                        else:
+                            converted.append(raw)
+                    mapping[key] = converted
+                else:
+                    mapping[key] = value
 
         return mapping
     # Compatibility with the munch.Munch.toDict method
@@ -1118,7 +1400,7 @@ class Resource(dict):
         self._header.attributes.update(headers)
         self._header.clean()
         self._update_location()
-        dict.update(self, self.to_dict())
+        self._update_dict()
 
     @classmethod
     def _get_session(cls, session):
@@ -1268,6 +1550,116 @@ class Resource(dict):
             return self.fetch(session)
         return self
 
+    @classmethod
+    def bulk_create(cls, session, data, prepend_key=True, base_path=None,
+                    chunk_size=None):
+        """Create multiple remote resources based on this class and data.
+
+        The resources are sent as a list in the body of a single request,
+        or of one request per ``chunk_size`` resources, for services such
+        as the Networking service which support it.
+
+        :param session: The session to use for making this request.
+        :type session: :class:`~keystoneauth1.adapter.Adapter`
+        :param list data: List of dicts, each containing the attributes of
+                          a resource to create.
+        :param prepend_key: A boolean indicating whether the resources_key
+                            should be prepended in a resource creation
+                            request. Default to True.
+        :param str base_path: Base part of the URI for creating resources, if
+                              different from
+                              :data:`~openstack.resource.Resource.base_path`.
+        :param int chunk_size: Maximum number of resources to create per
+                               request. Defaults to ``None``, which creates
+                               all of them in a single request.
+        :return: A list of the created :class:`Resource` objects, in the
+                 order of ``data``.
+        :raises: :exc:`~openstack.exceptions.MethodNotSupported` if
+                 :data:`Resource.allow_create` is not set to ``True``.
+        :raises: ValueError if ``data`` is not a list of dicts, if
+                 ``chunk_size`` is lower than 1, or if the resources do not
+                 all map to the same URI.
+        """
+        if not cls.allow_create:
+            raise exceptions.MethodNotSupported(cls, "create")
+        if not (isinstance(data, list)
+                and all(isinstance(attrs, dict) for attrs in data)):
+            raise ValueError("Invalid data passed: %s" % data)
+        if chunk_size is not None and (
+                isinstance(chunk_size, bool)
+                or not isinstance(chunk_size, six.integer_types)
+                or chunk_size < 1):
+            raise ValueError(
+                "chunk_size must be an integer of at least 1, got %r"
+                % (chunk_size,))
+        if cls.create_method not in ('PUT', 'POST'):
+            raise exceptions.ResourceFailure(
+                msg="Invalid create method: %s" % cls.create_method)
+        if not data:
+            return []
+
+        session = cls._get_session(session)
+        if chunk_size is None:
+            chunk_size = len(data)
+        created = []
+        for start in range(0, len(data), chunk_size):
+            created.extend(cls._bulk_create_chunk(
+                session, data[start:start + chunk_size],
+                prepend_key=prepend_key, base_path=base_path))
+        return created
+
+    @classmethod
+    def _bulk_create_chunk(cls, session, data, prepend_key, base_path):
+        connection = session._get_connection()
+        requires_id = (cls.create_requires_id
+                       if cls.create_requires_id is not None
+                       else cls.create_method == 'PUT')
+
+        resources = []
+        body = []
+        request = None
+        for attrs in data:
+            # _prepare_request only works on instances. They are also what
+            # gets returned when the service does not return a body.
+            res = cls.new(connection=connection, **attrs)
+            res_request = res._prepare_request(requires_id=requires_id,
+                                               base_path=base_path)
+            if request is None:
+                request = res_request
+            elif res_request.url != request.url:
+                raise ValueError(
+                    "All resources created in bulk must use the same URI,"
+                    " got %s and %s" % (request.url, res_request.url))
+            resources.append(res)
+            body.append(res_request.body)
+
+        if prepend_key and cls.resources_key is not None:
+            body = {cls.resources_key: body}
+
+        microversion = resources[0]._get_microversion_for(session, 'create')
+        call = getattr(session, cls.create_method.lower())
+        response = call(request.url, json=body, headers=request.headers,
+                        microversion=microversion)
+        exceptions.raise_from_response(response)
+
+        has_body = (cls.has_body if cls.create_returns_body is None
+                    else cls.create_returns_body)
+        if not has_body:
+            for res in resources:
+                res.microversion = microversion
+                res._translate_response(response, has_body=False)
+            # direct comparision to False since we need to rule out None
+            if cls.has_body and cls.create_returns_body is False:
+                return [res.fetch(session) for res in resources]
+            return resources
+
+        data = response.json()
+        if cls.resources_key and cls.resources_key in data:
+            data = data[cls.resources_key]
+        if not isinstance(data, list):
+            data = [data]
+        return list(_ListPage(cls, data, microversion, connection))
+
     def fetch(self, session, requires_id=True,
               base_path=None, error_message=None, **params):
         """Get a remote resource based on this instance.
@@ -1524,7 +1916,8 @@ class Resource(dict):
 
     @classmethod
     def list(cls, session, paginated=True, base_path=None,
-             allow_unknown_params=False, **params):
+             allow_unknown_params=False, prefetch=None, stream=False,
+             **params):
         """This method is a generator which yields resource objects.
 
         This resource object list generator handles pagination and takes query
@@ -1544,6 +1937,17 @@ class Resource(dict):
             unknown query parameters. This allows getting list of 'filters' and
             passing everything known to the server. ``False`` will result in
             validation exception when unknown query parameters are passed.
+        :param int prefetch: Number of pages to fetch ahead of the caller in
+            a background thread, so that the latency of requesting the next
+            pages overlaps with the processing of the current one. Only used
+            when ``paginated`` is ``True``. Defaults to ``None``, which
+            fetches each page only when the previous one has been consumed.
+        :param bool stream: Decode each page incrementally while it is being
+            received and build resources as their data arrives, instead of
+            decoding the whole page first. This keeps memory usage bounded by
+            the size of a single resource rather than a whole page, which
+            matters for very large pages. Requires the ``ijson`` library,
+            available through the ``streaming`` extra.
         :param dict params: These keyword arguments are passed through the
             :meth:`~openstack.resource.QueryParamter._transpose` method
             to find if any of them match expected query parameters to be
@@ -1559,9 +1963,15 @@ class Resource(dict):
                  :data:`Resource.allow_list` is not set to ``True``.
         :raises: :exc:`~openstack.exceptions.InvalidResourceQuery` if query
                  contains invalid params.
+        :raises: :exc:`~openstack.exceptions.SDKException` if ``stream`` is
+                 requested but ``ijson`` is not installed.
         """
         if not cls.allow_list:
             raise exceptions.MethodNotSupported(cls, "list")
+        if stream and ijson is None:
+            raise exceptions.SDKException(
+                "Streaming list responses requires the ijson library,"
+                " which is not installed.")
         session = cls._get_session(session)
         microversion = cls._get_microversion_for_list(session)
 
@@ -1573,7 +1983,30 @@ class Resource(dict):
         query_params = cls._query_mapping._transpose(params)
         uri = base_path % params
 
+        pages = cls._list_pages(session, uri, query_params, microversion,
+                                paginated, stream)
+        if paginated and prefetch:
+            # Pages need to be fully consumed before the next one can be
+            # requested, so build them in the background as well.
+            pages = utils.iterate_ahead(
+                (list(page) for page in pages), prefetch)
+        for page in pages:
+            for value in page:
+                yield value
+
+    @classmethod
+    def _list_pages(cls, session, uri, query_params, microversion,
+                    paginated, stream=False):
+        """Generator yielding a :class:`_ListPage` per page of results
+
+        Each page must be consumed before asking for the next one, since
+        the next request depends on the contents of the current page.
+        """
         limit = query_params.get('limit')
+        connection = session._get_connection()
+        kwargs = {}
+        if stream:
+            kwargs['stream'] = True
 
         # Track the total number of resources yielded so we can paginate
         # swift objects
@@ -1584,46 +2017,52 @@ class Resource(dict):
                 uri,
                 headers={"Accept": "application/json"},
                 params=query_params.copy(),
-                microversion=microversion)
+                microversion=microversion,
+                **kwargs)
             exceptions.raise_from_response(response)
-            data = response.json()
+            data, resources = cls._parse_list_response(response, stream)
 
             # Discard any existing pagination keys
             query_params.pop('marker', None)
             query_params.pop('limit', None)
 
-            if cls.resources_key:
-                resources = data[cls.resources_key]
-            else:
-                resources = data
-
-            if not isinstance(resources, list):
-                resources = [resources]
-
-            marker = None
-            for raw_resource in resources:
-                # Do not allow keys called "self" through. Glance chose
-                # to name a key "self", so we need to pop it out because
-                # we can't send it through cls.existing and into the
-                # Resource initializer. "self" is already the first
-                # argument and is practically a reserved word.
-                raw_resource.pop("self", None)
-
-                value = cls.existing(
-                    microversion=microversion,
-                    connection=session._get_connection(),
-                    **raw_resource)
-                marker = value.id
-                yield value
-                total_yielded += 1
+            page = _ListPage(cls, resources, microversion, connection)
+            yield page
+            total_yielded += page.count
 
-            if resources and paginated:
+            if page.count and paginated:
                 uri, next_params = cls._get_next_link(
-                    uri, response, data, marker, limit, total_yielded)
+                    uri, response, data, page.marker, limit, total_yielded)
                 query_params.update(next_params)
             else:
                 return
 
+    @classmethod
+    def _parse_list_response(cls, response, stream=False):
+        """Return the body of a list response and the raw resources in it
+
+        When streaming, the raw resources are a generator decoding the body
+        as it is consumed, and the body only gets filled in with everything
+        other than the resources once that generator is exhausted.
+        """
+        if stream:
+            data = {}
+            resources = _iter_json_resources(
+                response.iter_content(_STREAM_CHUNK_SIZE),
+                cls.resources_key, data)
+            return data, resources
+
+        data = response.json()
+
+        if cls.resources_key:
+            resources = data[cls.resources_key]
+        else:
+            resources = data
+
+        if not isinstance(resources, list):
+            resources = [resources]
+        return data, resources
+
     @classmethod
     def _get_next_link(cls, uri, response, data, marker, limit, total_yielded):
         next_link = None
@@ -1877,8 +2316,27 @@ def _normalize_status(status):
     return status
 
 
+def _get_wait_strategy(session, strategy):
+    if strategy is None:
+        # Proxies have a default strategy for their service.
+        strategy = getattr(session, 'wait_strategy', None)
+        if not isinstance(strategy, six.string_types):
+            strategy = None
+    return strategy
+
+
+def _get_wait_max(session, max_wait):
+    if max_wait is None:
+        # Proxies have a default for their service.
+        max_wait = getattr(session, 'wait_max_interval', None)
+        if not isinstance(max_wait, (six.string_types, int, float)):
+            max_wait = None
+    return max_wait
+
+
 def wait_for_status(session, resource, status, failures, interval=None,
-                    wait=None, attribute='status'):
+                    wait=None, attribute='status', strategy=None,
+                    max_wait=None):
     """Wait for the resource to be in a particular status.
 
     :param session: The session to use for making this request.
@@ -1894,6 +2352,12 @@ def wait_for_status(session, resource, status, failures, interval=None,
     :param wait: Maximum number of seconds to wait for transition.
                  Set to ``None`` to wait forever.
     :param attribute: Name of the resource attribute that contains the status.
+    :param strategy: How the interval between checks changes over time, see
+                     :func:`~openstack.utils.iterate_intervals`. Defaults to
+                     the ``wait_strategy`` of the proxy.
+    :param max_wait: Longest interval between checks for the strategies
+                     which increase it. Defaults to the ``wait_max_interval``
+                     of the proxy, or ten times ``interval``.
 
     :return: The updated resource.
     :raises: :class:`~openstack.exceptions.ResourceTimeout` transition
@@ -1920,7 +2384,9 @@ def wait_for_status(session, resource, status, failures, interval=None,
     for count in utils.iterate_timeout(
             timeout=wait,
             message=msg,
-            wait=interval):
+            wait=interval,
+            strategy=_get_wait_strategy(session, strategy),
+            max_wait=_get_wait_max(session, max_wait)):
         resource = resource.fetch(session)
 
         if not resource:
@@ -1941,7 +2407,170 @@ def wait_for_status(session, resource, status, failures, interval=None,
                   'current state is %s', name, status, new_status)
 
 
-def wait_for_delete(session, resource, interval, wait):
+#: Maximum number of IDs to filter a single list request on, to keep the
+#: URL of the request reasonably short.
+_WAIT_IDS_PER_REQUEST = 50
+
+
+def wait_for_statuses(session, resources, status, failures=None,
+                      interval=None, wait=None, attribute='status',
+                      strategy=None, max_wait=None):
+    """Wait for several resources to be in a particular status.
+
+    Rather than fetching each resource once per interval like
+    :func:`wait_for_status`, the resources are refreshed together from the
+    list endpoint of their type. Only the resources that changed since the
+    last check are requested when the type supports a ``changes_since``
+    query parameter, such as Compute servers, otherwise the list is
+    filtered on their IDs when the type supports an ``id`` query parameter.
+    Other resources are fetched one by one.
+
+    This is a generator, which yields each resource as soon as it reaches
+    the status. Resources are updated in place.
+
+    :param session: The session to use for making this request.
+    :type session: :class:`~keystoneauth1.adapter.Adapter`
+    :param resources: The resources to wait on to reach the status. Each
+                      resource must have a status attribute specified via
+                      ``attribute``.
+    :type resources: list of :class:`~openstack.resource.Resource`
+    :param status: Desired status of the resources.
+    :param list failures: Statuses that would indicate the transition
+                          failed such as 'ERROR'. Defaults to ['ERROR'].
+    :param interval: Number of seconds to wait between checks.
+                     Set to ``None`` to use the default interval.
+    :param wait: Maximum number of seconds to wait for transition.
+                 Set to ``None`` to wait forever.
+    :param attribute: Name of the resource attribute that contains the status.
+    :param strategy: How the interval between checks changes over time, see
+                     :func:`~openstack.utils.iterate_intervals`. Defaults to
+                     the ``wait_strategy`` of the proxy.
+    :param max_wait: Longest interval between checks for the strategies
+                     which increase it. Defaults to the ``wait_max_interval``
+                     of the proxy, or ten times ``interval``.
+
+    :return: A generator of the updated resources, in the order in which they
+             reached the status.
+    :raises: :class:`~openstack.exceptions.ResourceTimeout` transition
+             to status failed to occur in wait seconds.
+    :raises: :class:`~openstack.exceptions.ResourceFailure` a resource
+             transitioned to one of the failure states.
+    :raises: :class:`~AttributeError` if a resource does not have a status
+             attribute
+    """
+    log = _log.setup_logging(__name__)
+
+    if failures is None:
+        failures = ['ERROR']
+    failures = [f.lower() for f in failures]
+
+    pending = collections.OrderedDict()
+    for res in resources:
+        if _normalize_status(getattr(res, attribute)) == status.lower():
+            yield res
+        else:
+            pending[res.id] = res
+    if not pending:
+        return
+
+    msg = "Timeout waiting for {count} resources to transition to {status}"
+    for count in utils.iterate_timeout(
+            timeout=wait,
+            message=msg.format(count=len(pending), status=status),
+            wait=interval,
+            strategy=_get_wait_strategy(session, strategy),
+            max_wait=_get_wait_max(session, max_wait)):
+        for res, found in _refresh_resources(session,
+                                             list(pending.values())):
+            name = "{res}:{id}".format(res=res.__class__.__name__, id=res.id)
+            if not found:
+                raise exceptions.ResourceFailure(
+                    "{name} went away while waiting for {status}".format(
+                        name=name, status=status))
+
+            new_status = getattr(res, attribute)
+            normalized_status = _normalize_status(new_status)
+            if normalized_status == status.lower():
+                del pending[res.id]
+                yield res
+            elif normalized_status in failures:
+                raise exceptions.ResourceFailure(
+                    "{name} transitioned to failure state {status}".format(
+                        name=name, status=new_status))
+        if not pending:
+            return
+
+        log.debug('Still waiting for %d resources to reach state %s',
+                  len(pending), status)
+
+
+def _refresh_resources(session, resources):
+    """Refresh resources with as few requests as possible
+
+    :return: A generator of ``(resource, found)`` tuples, where ``found`` is
+             ``False`` if the resource does not exist anymore. Resources
+             which did not change may not be included.
+    """
+    groups = collections.OrderedDict()
+    for res in resources:
+        key = (type(res), tuple(sorted(res._uri.attributes.items())))
+        groups.setdefault(key, []).append(res)
+
+    for (resource_type, uri_params), group in groups.items():
+        query = resource_type._query_mapping._mapping
+        uri_params = dict(uri_params)
+        base_path = resource_type._list_details_base_path
+        if 'changes_since' in query:
+            by_id = {}
+            for res in group:
+                if getattr(res, 'updated_at', None):
+                    by_id[res.id] = res
+                else:
+                    # Fetch it once to know when it was last updated.
+                    yield res.fetch(session), True
+            if not by_id:
+                continue
+            # Anything that changed got a more recent timestamp than the
+            # oldest one we have, and this uses the clock of the server.
+            since = min(res.updated_at for res in by_id.values())
+            current = resource_type.list(
+                session, base_path=base_path, changes_since=since,
+                **uri_params)
+            for new in current:
+                res = by_id.get(new.id)
+                if res is not None:
+                    yield _refresh_resource(res, new), True
+        elif 'id' in query:
+            for start in range(0, len(group), _WAIT_IDS_PER_REQUEST):
+                chunk = group[start:start + _WAIT_IDS_PER_REQUEST]
+                by_id = {res.id: res for res in chunk}
+                current = resource_type.list(
+                    session, base_path=base_path, id=list(by_id),
+                    **uri_params)
+                for new in current:
+                    res = by_id.pop(new.id, None)
+                    if res is not None:
+                        yield _refresh_resource(res, new), True
+                for res in by_id.values():
+                    yield res, False
+        else:
+            for res in group:
+                yield res.fetch(session), True
+
+
+def _refresh_resource(resource, current):
+    """Update a resource in place with the attributes of a listed copy"""
+    resource._body.attributes.update(current._body.attributes)
+    resource._body.clean()
+    if current._original_body is not None:
+        resource._original_body = current._original_body.copy()
+    resource.microversion = current.microversion
+    resource._update_dict()
+    return resource
+
+
+def wait_for_delete(session, resource, interval, wait, strategy=None,
+                    max_wait=None):
     """Wait for the resource to be deleted.
 
     :param session: The session to use for making this request.
@@ -1950,6 +2579,12 @@ def wait_for_delete(session, resource, interval, wait):
     :type resource: :class:`~openstack.resource.Resource`
     :param interval: Number of seconds to wait between checks.
     :param wait: Maximum number of seconds to wait for the delete.
+    :param strategy: How the interval between checks changes over time, see
+                     :func:`~openstack.utils.iterate_intervals`. Defaults to
+                     the ``wait_strategy`` of the proxy.
+    :param max_wait: Longest interval between checks for the strategies
+                     which increase it. Defaults to the ``wait_max_interval``
+                     of the proxy, or ten times ``interval``.
 
     :return: Method returns self on success.
     :raises: :class:`~openstack.exceptions.ResourceTimeout` transition
@@ -1961,7 +2596,9 @@ def wait_for_delete(session, resource, interval, wait):
             message="Timeout waiting for {res}:{id} to delete".format(
                 res=resource.__class__.__name__,
                 id=resource.id),
-            wait=interval):
+            wait=interval,
+            strategy=_get_wait_strategy(session, strategy),
+            max_wait=_get_wait_max(session, max_wait)):
         try:
             resource = resource.fetch(session)
             if not resource:
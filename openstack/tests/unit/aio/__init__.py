@@ -0,0 +1,23 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+import sys
+
+
+def load_tests(loader, tests, pattern):
+    # openstack.aio uses syntax only available starting with Python 3.6
+    if sys.version_info < (3, 6):
+        return tests
+    this_dir = os.path.dirname(__file__)
+    tests.addTests(loader.discover(start_dir=this_dir, pattern=pattern))
+    return tests
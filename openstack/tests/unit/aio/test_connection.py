@@ -0,0 +1,312 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import asyncio
+import ssl
+
+from aiohttp import test_utils
+from aiohttp import web
+import fixtures
+import mock
+
+from openstack import aio
+from openstack.aio import connection as aio_connection
+from openstack.aio import proxy as aio_proxy
+from openstack import exceptions
+from openstack.network.v2 import network
+from openstack.network.v2 import subnet
+from openstack.tests.unit import base
+
+
+class TestConnection(base.TestCase):
+
+    def setUp(self):
+        super(TestConnection, self).setUp()
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.networks = {
+            'net%d' % i: {'id': 'net%d' % i, 'name': 'network %d' % i,
+                          'status': 'ACTIVE'}
+            for i in range(3)
+        }
+        self.requests = []
+
+        app = web.Application()
+        app.router.add_get('/networks', self._list_networks)
+        app.router.add_post('/networks', self._create_network)
+        app.router.add_get('/networks/{id}', self._get_network)
+        app.router.add_put('/networks/{id}', self._update_network)
+        app.router.add_delete('/networks/{id}', self._delete_network)
+        app.router.add_get('/expired', self._expired)
+        self.server = test_utils.TestServer(app)
+        self._run(self.server.start_server())
+        self.addCleanup(self._run, self.server.close)
+
+        self.useFixture(fixtures.MockPatchObject(
+            self.cloud.network, 'get_endpoint',
+            return_value=str(self.server.make_url(''))))
+
+        self.conn = aio.Connection(connection=self.cloud)
+        self.addCleanup(self._run, self.conn.close())
+
+    def _run(self, coro):
+        if callable(coro):
+            coro = coro()
+        return self.loop.run_until_complete(coro)
+
+    async def _list_networks(self, request):
+        self.requests.append(request)
+        ids = sorted(self.networks)
+        marker = request.query.get('marker')
+        if marker:
+            ids = ids[ids.index(marker) + 1:]
+        body = {'networks': [self.networks[id] for id in ids[:2]]}
+        if len(ids) > 2:
+            body['networks_links'] = [{
+                'rel': 'next',
+                'href': '%s?marker=%s' % (self.server.make_url('/networks'),
+                                          ids[1])}]
+        return web.json_response(body)
+
+    async def _get_network(self, request):
+        self.requests.append(request)
+        try:
+            net = self.networks[request.match_info['id']]
+        except KeyError:
+            raise web.HTTPNotFound()
+        return web.json_response({'network': net})
+
+    async def _create_network(self, request):
+        self.requests.append(request)
+        net = (await request.json())['network']
+        net['id'] = 'net%d' % len(self.networks)
+        net['status'] = 'BUILD'
+        self.networks[net['id']] = net
+        return web.json_response({'network': net}, status=201)
+
+    async def _update_network(self, request):
+        self.requests.append(request)
+        net = self.networks[request.match_info['id']]
+        net.update((await request.json())['network'])
+        return web.json_response({'network': net})
+
+    async def _delete_network(self, request):
+        self.requests.append(request)
+        try:
+            del self.networks[request.match_info['id']]
+        except KeyError:
+            raise web.HTTPNotFound()
+        return web.Response(status=204)
+
+    async def _expired(self, request):
+        self.requests.append(request)
+        if len(self.requests) == 1:
+            raise web.HTTPUnauthorized()
+        return web.json_response({})
+
+    def test_proxy(self):
+        proxy = self.conn.network
+        self.assertIsInstance(proxy, aio_proxy.Proxy)
+        self.assertIs(self.cloud.network, proxy.adapter)
+        self.assertIs(proxy, self.conn.network)
+
+    def test_not_a_proxy(self):
+        self.assertRaises(
+            AttributeError, getattr, self.conn, 'current_user_id')
+        self.assertRaises(AttributeError, getattr, self.conn, '_missing')
+
+    def test_no_aiohttp(self):
+        with mock.patch.object(aio_connection, 'aiohttp', None):
+            self.assertRaises(exceptions.SDKException,
+                              aio.Connection, connection=self.cloud)
+
+    def test_ssl_context(self):
+        self.assertEqual(ssl.CERT_REQUIRED, self.conn.ssl_context.verify_mode)
+
+    def test_ssl_context_insecure(self):
+        with mock.patch.object(self.cloud.session, 'verify', False):
+            conn = aio.Connection(connection=self.cloud)
+
+        self.assertEqual(ssl.CERT_NONE, conn.ssl_context.verify_mode)
+        self.assertFalse(conn.ssl_context.check_hostname)
+
+    def test_ssl_context_cacert(self):
+        with mock.patch.object(self.cloud.session, 'verify', '/ca.pem'), \
+                mock.patch.object(aio_connection.ssl,
+                                  'create_default_context') as create:
+            aio.Connection(connection=self.cloud)
+
+        create.assert_called_once_with(cafile='/ca.pem')
+
+    def test_ssl_context_capath(self):
+        capath = self.useFixture(fixtures.TempDir()).path
+        with mock.patch.object(self.cloud.session, 'verify', capath), \
+                mock.patch.object(aio_connection.ssl,
+                                  'create_default_context') as create:
+            aio.Connection(connection=self.cloud)
+
+        create.assert_called_once_with(capath=capath)
+
+    def test_ssl_context_client_cert(self):
+        cert = ('/client.crt', '/client.key')
+        with mock.patch.object(self.cloud.session, 'cert', cert), \
+                mock.patch.object(aio_connection.ssl,
+                                  'create_default_context') as create:
+            aio.Connection(connection=self.cloud)
+
+        create.return_value.load_cert_chain.assert_called_once_with(*cert)
+
+    def test_timeout(self):
+        with mock.patch.object(self.cloud.session, 'timeout', 30.0):
+            conn = aio.Connection(connection=self.cloud)
+
+        self.assertEqual(30.0, conn.timeout.total)
+
+    def test_reauthenticate(self):
+        with mock.patch.object(self.cloud.session, 'invalidate',
+                               return_value=True) as invalidate:
+            response = self._run(self.conn.network.request('expired', 'GET'))
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(2, len(self.requests))
+        invalidate.assert_called_once_with(auth=self.cloud.network.auth)
+
+    def test_reauthenticate_not_invalidated(self):
+        with mock.patch.object(self.cloud.session, 'invalidate',
+                               return_value=False):
+            response = self._run(self.conn.network.request('expired', 'GET'))
+
+        self.assertEqual(401, response.status_code)
+        self.assertEqual(1, len(self.requests))
+
+    def test_get(self):
+        net = self._run(self.conn.network._get(network.Network, 'net1'))
+
+        self.assertIsInstance(net, network.Network)
+        self.assertEqual('net1', net.id)
+        self.assertEqual('network 1', net.name)
+        request = self.requests[0]
+        self.assertEqual(self.cloud.auth_token,
+                         request.headers['X-Auth-Token'])
+        self.assertIn('User-Agent', request.headers)
+
+    def test_get_not_found(self):
+        self.assertRaises(
+            exceptions.ResourceNotFound, self._run,
+            self.conn.network._get(network.Network, 'missing'))
+
+    def test_get_wrong_type(self):
+        self.assertRaises(
+            ValueError, self._run,
+            self.conn.network._get(network.Network, subnet.Subnet(id='net1')))
+
+    def test_get_concurrent(self):
+        async def get_all():
+            return await asyncio.gather(*[
+                self.conn.network._get(network.Network, id)
+                for id in sorted(self.networks)])
+
+        nets = self._run(get_all())
+
+        self.assertEqual(['net0', 'net1', 'net2'], [n.id for n in nets])
+
+    def test_list(self):
+        async def list_all():
+            return [net async for net in
+                    self.conn.network._list(network.Network)]
+
+        nets = self._run(list_all())
+
+        self.assertEqual(['net0', 'net1', 'net2'], [n.id for n in nets])
+        self.assertEqual(2, len(self.requests))
+        self.assertEqual({'marker': 'net1'}, dict(self.requests[1].query))
+
+    def test_list_not_paginated(self):
+        async def list_all():
+            return [net async for net in
+                    self.conn.network._list(network.Network, paginated=False)]
+
+        nets = self._run(list_all())
+
+        self.assertEqual(['net0', 'net1'], [n.id for n in nets])
+        self.assertEqual(1, len(self.requests))
+
+    def test_create(self):
+        net = self._run(self.conn.network._create(
+            network.Network, name='new'))
+
+        self.assertEqual('net3', net.id)
+        self.assertEqual('new', net.name)
+        self.assertEqual('BUILD', net.status)
+        self.assertEqual('POST', self.requests[0].method)
+
+    def test_update(self):
+        net = self._run(self.conn.network._update(
+            network.Network, 'net1', name='renamed'))
+
+        self.assertEqual('renamed', net.name)
+        self.assertEqual('renamed', self.networks['net1']['name'])
+        self.assertEqual('PUT', self.requests[0].method)
+
+    def test_delete(self):
+        self._run(self.conn.network._delete(network.Network, 'net1'))
+
+        self.assertNotIn('net1', self.networks)
+
+    def test_delete_ignore_missing(self):
+        self.assertIsNone(self._run(self.conn.network._delete(
+            network.Network, 'missing')))
+        self.assertRaises(
+            exceptions.ResourceNotFound, self._run,
+            self.conn.network._delete(network.Network, 'missing',
+                                      ignore_missing=False))
+
+    def test_wait_for_status(self):
+        net = network.Network.existing(id='net0', status='BUILD')
+        self.networks['net0']['status'] = 'BUILD'
+
+        async def activate():
+            await asyncio.sleep(0.05)
+            self.networks['net0']['status'] = 'ACTIVE'
+
+        async def wait():
+            result, _ = await asyncio.gather(
+                self.conn.network.wait_for_status(
+                    net, 'ACTIVE', interval=0.01, wait=5),
+                activate())
+            return result
+
+        self.assertEqual('ACTIVE', self._run(wait()).status)
+
+    def test_wait_for_status_failure(self):
+        net = network.Network.existing(id='net0', status='BUILD')
+        self.networks['net0']['status'] = 'ERROR'
+
+        self.assertRaises(
+            exceptions.ResourceFailure, self._run,
+            self.conn.network.wait_for_status(net, 'ACTIVE', interval=0.01))
+
+    def test_wait_for_status_timeout(self):
+        net = network.Network.existing(id='net0', status='BUILD')
+        self.networks['net0']['status'] = 'BUILD'
+
+        self.assertRaises(
+            exceptions.ResourceTimeout, self._run,
+            self.conn.network.wait_for_status(
+                net, 'ACTIVE', interval=0.01, wait=0.05))
+
+    def test_wait_for_delete(self):
+        net = network.Network.existing(id='net0')
+        del self.networks['net0']
+
+        self.assertIs(net, self._run(self.conn.network.wait_for_delete(
+            net, interval=0.01, wait=1)))
@@ -12,10 +12,17 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import hashlib
+import inspect
+import os
+import tempfile
 from uuid import uuid4
 
+import fixtures
 import mock
+import six
 import testtools
+import yaml
 
 from openstack.cloud import _utils
 from openstack.cloud import exc
@@ -141,6 +148,118 @@ class TestUtils(base.TestCase):
             }})
         self.assertEqual([el2, el3], ret)
 
+    def test__filter_list_indexed(self):
+        el1 = dict(id=100, name='donald')
+        el2 = dict(id=200, name='pluto')
+        el3 = dict(id=300, name='donald')
+        data = _utils._index_list([el1, el2, el3])
+        with mock.patch.object(
+                _utils, '_build_list_index',
+                wraps=_utils._build_list_index) as build:
+            self.assertEqual(
+                [el1, el3], _utils._filter_list(data, 'donald', None))
+            self.assertEqual([el2], _utils._filter_list(data, '200', None))
+            self.assertEqual([el2], _utils._filter_list(data, 200, None))
+            self.assertEqual(
+                [el3], _utils._filter_list(data, 'donald', {'id': 300}))
+            self.assertEqual([], _utils._filter_list(data, 'goofy', None))
+        build.assert_called_once_with(data)
+
+    def test__filter_list_not_indexed(self):
+        el1 = dict(id=100, name='donald')
+        with mock.patch.object(_utils, '_build_list_index') as build:
+            self.assertEqual(
+                [el1], _utils._filter_list([el1], 'donald', None))
+        build.assert_not_called()
+
+    def test__filter_list_indexed_glob(self):
+        el1 = dict(id=100, name='donald')
+        el2 = dict(id=200, name='pluto')
+        el3 = dict(id=300, name='pluto[2017-01-10]')
+        data = _utils._index_list([el1, el2, el3])
+        self.assertEqual(
+            [el2, el3], _utils._filter_list(data, 'pluto*', None))
+        self.assertEqual(
+            [el3], _utils._filter_list(data, 'pluto[2017-01-10]', None))
+
+    def test__filter_list_indexed_modified(self):
+        el1 = dict(id=100, name='donald')
+        el2 = dict(id=200, name='donald')
+        data = _utils._index_list([el1])
+        self.assertEqual([el1], _utils._filter_list(data, 'donald', None))
+        data.append(el2)
+        self.assertEqual(
+            [el1, el2], _utils._filter_list(data, 'donald', None))
+
+    def test__filter_list_indexed_replaced(self):
+        el1 = dict(id=100, name='donald')
+        el2 = dict(id=100, name='pluto')
+        data = _utils._index_list([el1])
+        self.assertEqual([el1], _utils._filter_list(data, 'donald', None))
+        data[0] = el2
+        _utils._invalidate_list_index(data)
+        self.assertEqual([], _utils._filter_list(data, 'donald', None))
+        self.assertEqual([el2], _utils._filter_list(data, 'pluto', None))
+
+    def test__filter_list_indexed_built_once(self):
+        data = _utils._index_list(
+            [dict(id=i, name='server%d' % i) for i in range(100)])
+        with mock.patch.object(
+                _utils, '_build_list_index',
+                wraps=_utils._build_list_index) as build:
+            for i in range(100):
+                self.assertEqual(
+                    [data[i]],
+                    _utils._filter_list(data, 'server%d' % i, None))
+            self.assertEqual(1, build.call_count)
+            _utils._invalidate_list_index(data)
+            self.assertEqual(
+                [data[0]], _utils._filter_list(data, 'server0', None))
+            self.assertEqual(2, build.call_count)
+
+    def test_index_list_replaces(self):
+        old = _utils._index_list([dict(id=100, name='donald')])
+        new = _utils._index_list([dict(id=100, name='donald')], replaces=old)
+        self.assertNotIn(id(old), _utils._list_indexes)
+        self.assertIs(new, _utils._list_indexes[id(new)][0])
+
+    def test_index_list_bounded(self):
+        lists = [_utils._index_list([])
+                 for i in range(_utils._MAX_LIST_INDEXES + 1)]
+        self.assertEqual(_utils._MAX_LIST_INDEXES, len(_utils._list_indexes))
+        self.assertNotIn(id(lists[0]), _utils._list_indexes)
+        self.assertIsNone(_utils._lookup_list(lists[0], 'donald'))
+
+    def test_cache_on_arguments_indexed(self):
+        wrapped = _utils._func_wrap(lambda: [dict(id=100, name='donald')])
+        data = wrapped()
+        self.assertIs(list, type(data))
+        self.assertIs(data, _utils._list_indexes[id(data)][0])
+        self.assertEqual('- id: 100\n  name: donald\n', yaml.safe_dump(data))
+
+    def test_get_cache_arguments(self):
+        def list_things(self, filters=None, detailed=False):
+            pass
+
+        self.assertEqual(
+            {'filters': {'a': 1}, 'detailed': False},
+            _utils.get_cache_arguments(
+                _utils._func_wrap(list_things), ({'a': 1},), {}))
+
+    def test_get_cache_arguments_no_getargspec(self):
+        # inspect.getargspec is gone from python 3.11
+        if not hasattr(inspect, 'getfullargspec'):
+            self.skipTest('inspect.getfullargspec is not available')
+        self.useFixture(fixtures.MonkeyPatch(
+            'inspect.getargspec', fixtures.MonkeyPatch.delete))
+
+        def list_things(self, filters=None):
+            pass
+
+        self.assertEqual(
+            {'filters': None},
+            _utils.get_cache_arguments(list_things, (), {}))
+
     def test_safe_dict_min_ints(self):
         """Test integer comparison"""
         data = [{'f1': 3}, {'f1': 2}, {'f1': 1}]
@@ -295,6 +414,30 @@ class TestUtils(base.TestCase):
         ):
             _utils.range_filter(RANGE_DATA, "key1", "<>100")
 
+    def test_range_filter_missing_key(self):
+        data = RANGE_DATA + [dict(id=7, key2=5), dict(id=8, key1=None)]
+        self.assertEqual(
+            RANGE_DATA[:2], _utils.range_filter(data, "key1", "<2"))
+        self.assertEqual(
+            RANGE_DATA[:2], _utils.range_filter(data, "key1", "min"))
+        self.assertEqual([], _utils.range_filter(data, "key3", "max"))
+
+    def test_range_filter_object(self):
+        range_filter = _utils.RangeFilter({"key1": "max", "key2": ">=20"})
+        with mock.patch.object(_utils, 'parse_range') as parse_range:
+            self.assertEqual(
+                RANGE_DATA[-2:], range_filter.filter(RANGE_DATA))
+            self.assertEqual(
+                [RANGE_DATA[3]], range_filter.filter(RANGE_DATA[:4]))
+        self.assertFalse(parse_range.called)
+
+    def test_range_filter_object_invalid(self):
+        with testtools.ExpectedException(
+            exc.OpenStackCloudException,
+            "Invalid range value: <>100"
+        ):
+            _utils.RangeFilter({"key1": "min", "key2": "<>100"})
+
     def test_get_entity_pass_object(self):
         obj = mock.Mock(id=uuid4().hex)
         self.cloud.use_direct_get = True
@@ -357,3 +500,110 @@ class TestUtils(base.TestCase):
         for r in resources:
             self.assertTrue(hasattr(self.cloud, 'get_%s_by_id' % r))
             self.assertTrue(hasattr(self.cloud, 'search_%ss' % r))
+
+
+class TestFileHasher(base.TestCase):
+
+    def setUp(self):
+        super(TestFileHasher, self).setUp()
+        self.content = b''.join(
+            six.int2byte(i % 256) for i in range(100000))
+        object_file = tempfile.NamedTemporaryFile(delete=False)
+        object_file.write(self.content)
+        object_file.close()
+        self.filename = object_file.name
+        self.addCleanup(os.unlink, self.filename)
+        self.hashes = (hashlib.md5(self.content).hexdigest(),
+                       hashlib.sha256(self.content).hexdigest())
+
+    def test_read_once(self):
+        hasher = _utils.FileHasher(self.filename)
+        with open(self.filename, 'rb') as file_obj:
+            reader = _utils.HashingReader(file_obj, hasher)
+            self.assertEqual(self.content, reader.read())
+
+        # Nothing is left to read from the file
+        self.assertEqual(len(self.content), hasher.offset)
+        self.assertEqual(self.hashes, hasher.hexdigests())
+
+    def test_read_again(self):
+        hasher = _utils.FileHasher(self.filename)
+        with open(self.filename, 'rb') as file_obj:
+            reader = _utils.HashingReader(file_obj, hasher)
+            reader.read(1000)
+            reader.seek(0)
+            reader.read(500)
+            reader.read()
+
+        self.assertEqual(self.hashes, hasher.hexdigests())
+
+    def _read_segments(self, hasher, order):
+        segments = [
+            _utils.FileSegment(self.filename, offset, 30000)
+            for offset in range(0, len(self.content), 30000)]
+        for index in order:
+            segment = segments[index]
+            reader = _utils.HashingReader(segment, hasher, segment.offset)
+            while reader.read(4096):
+                pass
+
+    def test_segments(self):
+        hasher = _utils.FileHasher(self.filename)
+        # Out of order data is kept until the data before it is hashed
+        self._read_segments(hasher, [2, 0, 3, 0, 1])
+
+        self.assertEqual(len(self.content), hasher.offset)
+        self.assertEqual(0, hasher._pending_size)
+        with mock.patch.object(_utils, 'open', create=True) as mock_open:
+            file_obj = mock_open.return_value.__enter__.return_value
+            file_obj.read.return_value = b''
+            self.assertEqual(self.hashes, hasher.hexdigests())
+        # Nothing is read again
+        file_obj.read.assert_called_once_with(65536)
+
+    def test_segments_buffer_full(self):
+        hasher = _utils.FileHasher(self.filename, max_buffer_size=20000)
+        # What does not fit is hashed from the file at the end
+        self._read_segments(hasher, [0, 2, 3, 1])
+
+        self.assertEqual(60000 + 4 * 4096, hasher.offset)
+        self.assertEqual(self.hashes, hasher.hexdigests())
+
+    def test_additional_hashers(self):
+        extra = hashlib.sha512()
+        hasher = _utils.FileHasher(self.filename, hashers=[extra])
+        with open(self.filename, 'rb') as file_obj:
+            _utils.HashingReader(file_obj, hasher).read()
+
+        self.assertEqual(self.hashes, hasher.hexdigests())
+        self.assertEqual(
+            hashlib.sha512(self.content).hexdigest(), extra.hexdigest())
+
+
+class TestGetDataSegments(base.TestCase):
+
+    def test_file_object(self):
+        self.assertEqual(
+            [b'0123', b'4567', b'89'],
+            list(_utils.get_data_segments(six.BytesIO(b'0123456789'), 4)))
+
+    def test_iterable(self):
+        chunks = iter([b'01', b'', b'234', u'56789'])
+        self.assertEqual(
+            [b'0123', b'4567', b'89'],
+            list(_utils.get_data_segments(chunks, 4)))
+
+    def test_exact_size(self):
+        self.assertEqual(
+            [b'0123', b'4567'],
+            list(_utils.get_data_segments([b'01234567'], 4)))
+
+    def test_empty(self):
+        self.assertEqual(
+            [], list(_utils.get_data_segments(six.BytesIO(b''), 4)))
+
+    def test_is_stream(self):
+        for data in (b'01', u'01', bytearray(b'01'), memoryview(b'01')):
+            self.assertFalse(_utils.is_stream(data))
+        for data in (six.BytesIO(b'01'), iter([b'01']), [b'01']):
+            self.assertTrue(_utils.is_stream(data))
@@ -10,13 +10,18 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 import concurrent
+import os
 import time
 
+import fixtures
+import mock
+import prometheus_client
 import testtools
 from testscenarios import load_tests_apply_scenarios as load_tests  # noqa
 
 import openstack
 import openstack.cloud
+from openstack.cloud import _utils
 from openstack.cloud import meta
 from openstack import exceptions
 from openstack.tests import fakes
@@ -558,6 +563,380 @@ class TestMemoryCache(base.TestCase):
         self.assert_calls()
 
 
+class _SyncExecutor(object):
+
+    def submit(self, fn, *args, **kwargs):
+        fn(*args, **kwargs)
+
+
+class TestBackgroundRefresh(base.TestCase):
+
+    def setUp(self):
+        super(TestBackgroundRefresh, self).setUp(
+            cloud_config_fixture='clouds_cache.yaml')
+        self.cloud._background_cache_refresh = True
+        self.cloud._PORT_AGE = 10
+        self.useFixture(fixtures.MockPatchObject(
+            openstack.connection.Connection, '_pool_executor',
+            _SyncExecutor()))
+        self.port = test_port.TestPort.mock_neutron_port_create_rep['port']
+        self.port2 = dict(self.port, id='port-2')
+        self.ports_uri = self.get_mock_url(
+            'network', 'public', append=['v2.0', 'ports.json'])
+
+    def test_list_ports(self):
+        self.register_uris([
+            dict(method='GET', uri=self.ports_uri,
+                 json={'ports': [self.port]}),
+            dict(method='GET', uri=self.ports_uri,
+                 json={'ports': [self.port, self.port2]}),
+        ])
+        self.assertEqual([self.port], self.cloud.list_ports())
+        # Not old enough to be refreshed
+        self.cloud._ports_time -= 7
+        self.assertEqual([self.port], self.cloud.list_ports())
+        # The cached list is returned while it is refreshed
+        self.cloud._ports_time -= 1
+        self.assertEqual([self.port], self.cloud.list_ports())
+        self.assertEqual([self.port, self.port2], self.cloud.list_ports())
+        self.assertFalse(self.cloud._ports_lock.locked())
+        self.assert_calls()
+
+    def test_list_ports_expired(self):
+        self.register_uris([
+            dict(method='GET', uri=self.ports_uri,
+                 json={'ports': [self.port]}),
+            dict(method='GET', uri=self.ports_uri,
+                 json={'ports': [self.port, self.port2]}),
+        ])
+        self.cloud.list_ports()
+        self.cloud._ports_time -= 60
+        self.assertEqual([self.port], self.cloud.list_ports())
+        self.assertEqual([self.port, self.port2], self.cloud.list_ports())
+        self.assert_calls()
+
+    def test_list_ports_refresh_failure(self):
+        self.register_uris([
+            dict(method='GET', uri=self.ports_uri,
+                 json={'ports': [self.port]}),
+            dict(method='GET', uri=self.ports_uri, status_code=500),
+            dict(method='GET', uri=self.ports_uri,
+                 json={'ports': [self.port2]}),
+        ])
+        self.cloud.list_ports()
+        self.cloud._ports_time -= 10
+        self.assertEqual([self.port], self.cloud.list_ports())
+        self.assertFalse(self.cloud._ports_lock.locked())
+        self.assertEqual([self.port], self.cloud.list_ports())
+        self.assertEqual([self.port2], self.cloud.list_ports())
+        self.assert_calls()
+
+    def test_metrics(self):
+        registry = prometheus_client.CollectorRegistry()
+        self.cloud.config._collector_registry = registry
+        self.cloud._cache_statsd_client = mock.Mock()
+        self.register_uris([
+            dict(method='GET', uri=self.ports_uri,
+                 json={'ports': [self.port]}),
+        ])
+
+        self.cloud.list_ports()
+        self.cloud.list_ports()
+
+        self.cloud._cache_statsd_client.timing.assert_called_once_with(
+            'openstack.api.cache.ports.refresh', mock.ANY)
+        self.cloud._cache_statsd_client.gauge.assert_called_once_with(
+            'openstack.api.cache.ports.staleness', mock.ANY)
+        self.assertEqual(1, registry.get_sample_value(
+            'openstack_cache_refresh_time_count', {'resource': 'ports'}))
+        self.assertIsNotNone(registry.get_sample_value(
+            'openstack_cache_staleness', {'resource': 'ports'}))
+        self.assert_calls()
+
+
+class TestMutationInvalidation(base.TestCase):
+
+    def setUp(self):
+        super(TestMutationInvalidation, self).setUp(
+            cloud_config_fixture='clouds_cache.yaml')
+
+    def test_delete_flavor(self):
+        flavors_uri = '{endpoint}/flavors/detail?is_public=None'.format(
+            endpoint=fakes.COMPUTE_ENDPOINT)
+        self.register_uris([
+            dict(method='GET', uri=flavors_uri,
+                 json={'flavors': fakes.FAKE_FLAVOR_LIST}),
+            self.get_nova_discovery_mock_dict(),
+            dict(method='DELETE',
+                 uri='{endpoint}/flavors/{id}'.format(
+                     endpoint=fakes.COMPUTE_ENDPOINT, id=fakes.FLAVOR_ID)),
+            dict(method='GET', uri=flavors_uri,
+                 json={'flavors': fakes.FAKE_FLAVOR_LIST[1:]}),
+        ])
+        self.assertEqual(3, len(self.cloud.list_flavors()))
+        self.assertEqual(3, len(self.cloud.list_flavors()))
+
+        self.cloud.compute.delete_flavor(fakes.FLAVOR_ID)
+
+        self.assertEqual(2, len(self.cloud.list_flavors()))
+        self.assert_calls()
+
+    def test_delete_server(self):
+        self.cloud._SERVER_AGE = 60
+        fake_server = fakes.make_fake_server('1234', 'name')
+        servers_uri = self.get_mock_url(
+            'compute', 'public', append=['servers', 'detail'])
+        self.register_uris([
+            self.get_nova_discovery_mock_dict(),
+            dict(method='GET', uri=servers_uri,
+                 json={'servers': [fake_server]}),
+            dict(method='DELETE',
+                 uri=self.get_mock_url(
+                     'compute', 'public', append=['servers', '1234'])),
+            dict(method='GET', uri=servers_uri, json={'servers': []}),
+        ])
+        self.assertEqual(1, len(self.cloud.list_servers(bare=True)))
+        self.assertEqual(1, len(self.cloud.list_servers(bare=True)))
+
+        self.cloud.compute.delete_server('1234')
+
+        self.assertEqual([], self.cloud.list_servers(bare=True))
+        self.assert_calls()
+
+    def test_unrelated_change(self):
+        self.cloud._invalidate_cached_lists(mock.Mock(
+            service_type='compute', resource_type=mock.Mock(
+                __name__='Keypair')))
+        self.assertIsNone(self.cloud._servers)
+        self.assertFalse(self.cloud._servers_dirty)
+
+    def _server_event(self):
+        return mock.Mock(service_type='compute', resource_type=mock.Mock(
+            __name__='Server'))
+
+    def test_invalidate_during_refresh(self):
+        self.cloud._servers = [{'id': 'old'}]
+        self.cloud._servers_time = time.time()
+        with self.cloud._servers_lock:
+            # Does not wait for the refresh holding the lock
+            self.cloud._invalidate_cached_lists(self._server_event())
+        self.assertTrue(self.cloud._servers_dirty)
+
+        lists = [[{'id': 'new'}], [{'id': 'newer'}]]
+
+        def list_func():
+            # Changed while listing
+            self.cloud._invalidate_cached_lists(self._server_event())
+            return lists.pop(0)
+
+        self.assertEqual(
+            [{'id': 'new'}],
+            self.cloud._get_batched_list('servers', 60, list_func))
+        self.assertTrue(self.cloud._servers_dirty)
+        self.assertEqual(
+            [{'id': 'newer'}],
+            self.cloud._get_batched_list('servers', 60, list_func))
+
+    def test_invalidate_drops_list_index(self):
+        servers = _utils._index_list([{'id': 'old', 'name': 'old'}])
+        self.cloud._servers = servers
+        self.cloud._servers_time = time.time()
+        _utils._lookup_list(servers, 'old')
+        self.assertIsNotNone(_utils._list_indexes[id(servers)][1])
+
+        self.cloud._invalidate_cached_lists(self._server_event())
+
+        self.assertIsNone(_utils._list_indexes[id(servers)][1])
+
+    def test_refresh_failure_stays_dirty(self):
+        self.cloud._servers = [{'id': 'old'}]
+        self.cloud._servers_time = time.time()
+        self.cloud._invalidate_cached_lists(self._server_event())
+
+        def list_func():
+            raise exceptions.SDKException('failed')
+
+        self.assertRaises(
+            exceptions.SDKException,
+            self.cloud._get_batched_list, 'servers', 60, list_func)
+        self.assertTrue(self.cloud._servers_dirty)
+        self.assertEqual(
+            [{'id': 'new'}],
+            self.cloud._get_batched_list(
+                'servers', 60, lambda: [{'id': 'new'}]))
+        self.assertFalse(self.cloud._servers_dirty)
+
+
+class TestServerWriteThrough(base.TestCase):
+
+    def setUp(self):
+        super(TestServerWriteThrough, self).setUp(
+            cloud_config_fixture='clouds_cache.yaml')
+        self.cloud._SERVER_AGE = 60
+        self.fake_server = fakes.make_fake_server('1234', 'name')
+        self.fake_server2 = fakes.make_fake_server('5678', 'name2')
+        self.servers_uri = self.get_mock_url(
+            'compute', 'public', append=['servers', 'detail'])
+        self.server_uri = self.get_mock_url(
+            'compute', 'public', append=['servers', '1234'])
+
+    def _list_servers(self, servers, uris):
+        self.register_uris([
+            self.get_nova_discovery_mock_dict(),
+            dict(method='GET', uri=self.servers_uri,
+                 json={'servers': servers}),
+        ] + uris)
+        self.cloud.list_servers(bare=True)
+
+    def test_create_server(self):
+        fake_server = fakes.make_fake_server('1234', 'name', 'BUILD')
+        self._list_servers([self.fake_server2], [
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'network', 'public', append=['v2.0', 'networks.json']),
+                 json={'networks': []}),
+            dict(method='POST',
+                 uri=self.get_mock_url(
+                     'compute', 'public', append=['servers']),
+                 json={'server': fake_server}),
+            dict(method='GET', uri=self.server_uri,
+                 json={'server': fake_server}),
+        ])
+        self.cloud.create_server(
+            name='name', image=dict(id='image-id'),
+            flavor=dict(id='flavor-id'), admin_pass='secret')
+
+        servers = self.cloud.list_servers(bare=True)
+        self.assertEqual(['1234', '5678'], [s['id'] for s in servers])
+        self.assertEqual(
+            'BUILD', self.cloud.get_server('1234', bare=True)['status'])
+        self.assertIsNone(servers[0]['adminPass'])
+        self.assert_calls()
+
+    def test_update_server(self):
+        self._list_servers([self.fake_server, self.fake_server2], [
+            dict(method='PUT', uri=self.server_uri,
+                 json={'server': dict(self.fake_server, name='new-name')}),
+        ])
+        self.cloud.update_server('1234', name='new-name', bare=True)
+
+        servers = self.cloud.list_servers(bare=True)
+        self.assertEqual(
+            ['new-name', 'name2'], [s['name'] for s in servers])
+        self.assertEqual(
+            '1234', self.cloud.get_server('new-name', bare=True)['id'])
+        self.assertIsNone(self.cloud.get_server('name', bare=True))
+        self.assert_calls()
+
+    def test_delete_server(self):
+        self._list_servers([self.fake_server, self.fake_server2], [
+            dict(method='DELETE', uri=self.server_uri),
+        ])
+        self.assertTrue(self.cloud.delete_server('1234'))
+
+        self.assertEqual(
+            ['5678'],
+            [s['id'] for s in self.cloud.list_servers(bare=True)])
+        self.assert_calls()
+
+    def test_delete_server_incremental(self):
+        self.cloud._incremental_server_cache = True
+        self._list_servers([self.fake_server, self.fake_server2], [
+            dict(method='DELETE', uri=self.server_uri),
+        ])
+        self.cloud.delete_server('1234')
+
+        self.assertEqual(['5678'], list(self.cloud._servers_by_id))
+        self.assertEqual(
+            ['5678'],
+            [s['id'] for s in self.cloud.list_servers(bare=True)])
+        self.assert_calls()
+
+    def test_not_listed(self):
+        self.cloud._write_through_server('1234', self.fake_server)
+        self.assertIsNone(self.cloud._servers)
+
+
+class TestSharedCache(base.TestCase):
+
+    def setUp(self):
+        super(TestSharedCache, self).setUp(
+            cloud_config_fixture='clouds_cache.yaml')
+        self.cache_dir = self.useFixture(fixtures.TempDir()).path
+        self.cloud = self._make_shared_cloud()
+
+    def _make_shared_cloud(self, **kwargs):
+        cloud_config = self.config.get_one(
+            cloud='_test_cloud_', validate=True, **kwargs)
+        cloud = openstack.connection.Connection(config=cloud_config)
+        cloud._cache = cloud._make_cache(
+            'dogpile.cache.dbm', 60,
+            {'filename': os.path.join(self.cache_dir, 'cache.dbm')})
+        cloud._resource_caches = {}
+        return cloud
+
+    def _get_key(self, cloud, method, *args, **kwargs):
+        return cloud._make_cache_key(None, method.func)(*args, **kwargs)
+
+    def test_list_flavors_shared(self):
+        mock_uri = '{endpoint}/flavors/detail?is_public=None'.format(
+            endpoint=fakes.COMPUTE_ENDPOINT)
+        self.register_uris([
+            dict(method='GET', uri=mock_uri,
+                 json={'flavors': fakes.FAKE_FLAVOR_LIST}),
+        ])
+        flavors = self.cloud.list_flavors()
+
+        # Another connection to the same cloud finds the list in the cache
+        other_cloud = self._make_shared_cloud()
+        self.assertEqual(flavors, other_cloud.list_flavors())
+        self.assert_calls()
+
+    def test_key_stable(self):
+        other_cloud = self._make_shared_cloud()
+        key = self._get_key(self.cloud, self.cloud.list_flavors)
+        self.assertEqual(
+            key, self._get_key(other_cloud, other_cloud.list_flavors))
+        self.assertRegex(key, r'^openstack\.cloud:list_flavors:[0-9a-f]{40}$')
+
+    def test_key_arguments(self):
+        key = self._get_key(
+            self.cloud, self.cloud.list_projects,
+            filters={'name': 'a', 'domain_id': 'b'})
+        self.assertEqual(key, self._get_key(
+            self.cloud, self.cloud.list_projects,
+            filters={'domain_id': 'b', 'name': 'a'}, cache=False))
+        self.assertNotEqual(key, self._get_key(
+            self.cloud, self.cloud.list_projects, filters={'name': 'a'}))
+
+    def test_key_defaults(self):
+        key = self._get_key(self.cloud, self.cloud.list_flavors)
+        self.assertEqual(key, self._get_key(
+            self.cloud, self.cloud.list_flavors, False))
+        self.assertEqual(key, self._get_key(
+            self.cloud, self.cloud.list_flavors, get_extra=False))
+        self.assertNotEqual(key, self._get_key(
+            self.cloud, self.cloud.list_flavors, True))
+
+    def test_key_region(self):
+        other_cloud = self._make_shared_cloud()
+        other_cloud.config.region_name = 'RegionTwo'
+        self.assertNotEqual(
+            self._get_key(self.cloud, self.cloud.list_flavors),
+            self._get_key(other_cloud, other_cloud.list_flavors))
+
+    def test_key_project(self):
+        other_cloud = self._make_shared_cloud()
+        other_cloud.config.config['auth']['project_name'] = 'other'
+        self.assertNotEqual(
+            self._get_key(self.cloud, self.cloud.list_flavors),
+            self._get_key(other_cloud, other_cloud.list_flavors))
+
+    def test_key_no_secret(self):
+        self.assertNotIn(
+            'password', str(self.cloud._get_cache_scope().values()))
+
+
 class TestCacheIgnoresQueuedStatus(base.TestCase):
 
     scenarios = [
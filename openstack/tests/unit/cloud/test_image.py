@@ -11,6 +11,7 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import hashlib
 import operator
 import tempfile
 import uuid
@@ -42,6 +43,9 @@ class BaseTestImage(base.TestCase):
         )
         self.fake_search_return = {'images': [self.fake_image_dict]}
         self.container_name = self.getUniqueString('container')
+        # Hashes already known are used instead of computing them while
+        # uploading the file.
+        self.cloud._get_file_hashes(self.imagefile.name)
 
 
 class TestImage(BaseTestImage):
@@ -366,6 +370,66 @@ class TestImage(BaseTestImage):
         self.assertEqual(self.adapter.request_history[5].text.read(),
                          self.output)
 
+    def test_create_image_put_v2_hash_while_uploading(self):
+        self.cloud.image_api_use_tasks = False
+        imagefile = tempfile.NamedTemporaryFile(delete=False)
+        imagefile.write(b'\3\0')
+        imagefile.close()
+        md5 = hashlib.md5(b'\3\0').hexdigest()
+        sha256 = hashlib.sha256(b'\3\0').hexdigest()
+
+        self.register_uris([
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'image', append=['images'], base_url_append='v2'),
+                 json={'images': []}),
+            dict(method='POST',
+                 uri=self.get_mock_url(
+                     'image', append=['images'], base_url_append='v2'),
+                 json=self.fake_image_dict,
+                 validate=dict(
+                     json={
+                         u'container_format': u'bare',
+                         u'disk_format': u'qcow2',
+                         u'name': self.image_name,
+                         u'owner_specified.openstack.object': self.object_name,
+                         u'visibility': u'private'})
+                 ),
+            dict(method='PUT',
+                 uri=self.get_mock_url(
+                     'image', append=['images', self.image_id, 'file'],
+                     base_url_append='v2'),
+                 request_headers={'Content-Type': 'application/octet-stream'}),
+            dict(method='PATCH',
+                 uri=self.get_mock_url(
+                     'image', append=['images', self.image_id],
+                     base_url_append='v2'),
+                 json=self.fake_image_dict,
+                 validate=dict(
+                     json=[
+                         {u'op': u'replace', u'value': md5,
+                          u'path': u'/owner_specified.openstack.md5'},
+                         {u'op': u'replace', u'value': sha256,
+                          u'path': u'/owner_specified.openstack.sha256'}])),
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'image', append=['images', self.image_id],
+                     base_url_append='v2'),
+                 json=dict(self.fake_image_dict, checksum=md5)),
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'image', append=['images'], base_url_append='v2'),
+                 json=self.fake_search_return)
+        ])
+
+        self.cloud.create_image(
+            self.image_name, imagefile.name, wait=True, timeout=1,
+            is_public=False)
+
+        self.assert_calls()
+        self.assertEqual(
+            (md5, sha256), self.cloud._get_cached_file_hashes(imagefile.name))
+
     def test_create_image_task(self):
         self.cloud.image_api_use_tasks = True
         endpoint = self.cloud._object_store_client.get_endpoint()
@@ -662,6 +726,7 @@ class TestImage(BaseTestImage):
         imagefile = tempfile.NamedTemporaryFile(delete=False)
         imagefile.write(b'\0')
         imagefile.close()
+        self.cloud._get_file_hashes(imagefile.name)
         self.cloud.create_image(
             name, imagefile.name, wait=True, timeout=1,
             is_public=False, **kwargs)
@@ -14,6 +14,7 @@ import mock
 
 from openstack.cloud import inventory
 import openstack.config
+from openstack import exceptions
 from openstack.tests import fakes
 from openstack.tests.unit import base
 
@@ -113,6 +114,78 @@ class TestInventory(base.TestCase):
         self.assertFalse(inv.clouds[0].get_openstack_vars.called)
         self.assertEqual([server], ret)
 
+    def _make_inventory(self, mock_cloud, mock_config, count, **kwargs):
+        mock_config.return_value.get_all.return_value = [{}] * count
+        mock_cloud.side_effect = lambda *args, **kwargs: mock.Mock()
+        inv = inventory.OpenStackInventory(**kwargs)
+        for i, cloud in enumerate(inv.clouds):
+            cloud.list_servers.return_value = [
+                dict(id='server_%d' % i, name='server_%d' % i)]
+        return inv
+
+    @mock.patch("openstack.config.loader.OpenStackConfig")
+    @mock.patch("openstack.connection.Connection")
+    def test_list_hosts_several_clouds(self, mock_cloud, mock_config):
+        inv = self._make_inventory(mock_cloud, mock_config, 3)
+
+        ret = inv.list_hosts()
+
+        for cloud in inv.clouds:
+            cloud.list_servers.assert_called_once_with(detailed=True,
+                                                       all_projects=False)
+        self.assertEqual(['server_0', 'server_1', 'server_2'],
+                         [server['id'] for server in ret])
+
+    @mock.patch("openstack.config.loader.OpenStackConfig")
+    @mock.patch("openstack.connection.Connection")
+    def test_list_hosts_cloud_failure(self, mock_cloud, mock_config):
+        inv = self._make_inventory(mock_cloud, mock_config, 3)
+        inv.clouds[1].list_servers.side_effect = (
+            exceptions.OpenStackCloudException('broken cloud'))
+
+        self.assertRaises(exceptions.OpenStackCloudException, inv.list_hosts)
+
+    @mock.patch("openstack.config.loader.OpenStackConfig")
+    @mock.patch("openstack.connection.Connection")
+    def test_list_hosts_cloud_failure_ignored(self, mock_cloud, mock_config):
+        inv = self._make_inventory(mock_cloud, mock_config, 3)
+        inv.clouds[1].list_servers.side_effect = (
+            exceptions.OpenStackCloudException('broken cloud'))
+
+        ret = inv.list_hosts(fail_on_cloud_config=False)
+
+        self.assertEqual(['server_0', 'server_2'],
+                         [server['id'] for server in ret])
+
+    @mock.patch("concurrent.futures.ThreadPoolExecutor")
+    @mock.patch("openstack.config.loader.OpenStackConfig")
+    @mock.patch("openstack.connection.Connection")
+    def test_list_hosts_max_workers(self, mock_cloud, mock_config,
+                                    mock_executor):
+        inv = self._make_inventory(mock_cloud, mock_config, 3, max_workers=2)
+        executor = mock_executor.return_value.__enter__.return_value
+        executor.submit.side_effect = (
+            lambda func, *args: mock.Mock(result=lambda: func(*args)))
+
+        ret = inv.list_hosts()
+
+        mock_executor.assert_called_once_with(2)
+        self.assertEqual(3, len(ret))
+
+    @mock.patch("concurrent.futures.ThreadPoolExecutor")
+    @mock.patch("openstack.config.loader.OpenStackConfig")
+    @mock.patch("openstack.connection.Connection")
+    def test_list_hosts_default_workers(self, mock_cloud, mock_config,
+                                        mock_executor):
+        inv = self._make_inventory(mock_cloud, mock_config, 3)
+        executor = mock_executor.return_value.__enter__.return_value
+        executor.submit.side_effect = (
+            lambda func, *args: mock.Mock(result=lambda: func(*args)))
+
+        inv.list_hosts()
+
+        mock_executor.assert_called_once_with(3)
+
     @mock.patch("openstack.config.loader.OpenStackConfig")
     @mock.patch("openstack.connection.Connection")
     def test_search_hosts(self, mock_cloud, mock_config):
@@ -15,6 +15,7 @@
 import mock
 
 from openstack import connection
+from openstack.cloud import exc
 from openstack.cloud import meta
 from openstack.tests import fakes
 from openstack.tests.unit import base
@@ -1124,3 +1125,119 @@ class TestMeta(base.TestCase):
         self.assertIn('foo', obj_dict)
         self.assertEqual(obj_dict['additional'], 1)
         self.assertEqual(obj_dict['foo'], 'bar')
+
+
+class TestServerDetailsIndex(base.TestCase):
+
+    def setUp(self):
+        super(TestServerDetailsIndex, self).setUp()
+        self.mock_cloud = mock.MagicMock()
+        self.mock_cloud._has_secgroups.return_value = True
+        self.mock_cloud._use_neutron_secgroups.return_value = True
+        self.mock_cloud._normalize_secgroups.side_effect = list
+        self.mock_cloud.list_ports.return_value = [
+            {'id': 'port-0', 'device_id': 'server-0',
+             'mac_address': 'fa:16:3e:00:00:00',
+             'security_groups': ['sg-0']},
+            {'id': 'port-1', 'device_id': 'server-1',
+             'mac_address': 'fa:16:3e:00:00:01',
+             'security_groups': ['sg-0', 'sg-1']}]
+        self.mock_cloud.list_floating_ips.return_value = [
+            {'id': 'fip-0', 'port_id': 'port-0',
+             'fixed_ip_address': '10.0.0.0',
+             'floating_ip_address': PUBLIC_V4}]
+        self.mock_cloud.list_flavors.return_value = [
+            {'id': '101', 'name': 'small'}]
+        self.mock_cloud.list_images.return_value = [
+            {'id': 'image-id', 'name': 'cirros'}]
+        self.mock_cloud.list_security_groups.return_value = [
+            mock.Mock(to_dict=mock.Mock(return_value=group))
+            for group in ({'id': 'sg-0', 'name': 'default'},
+                          {'id': 'sg-1', 'name': 'web'})]
+        self.mock_cloud.list_volumes.return_value = [
+            {'id': 'volume-0',
+             'attachments': [{'server_id': 'server-1',
+                              'device': '/dev/vdb'}]}]
+        self.servers = [
+            meta.obj_to_munch(fakes.make_fake_server(
+                server_id='server-%d' % i, name='server-%d' % i,
+                addresses={'private': [{'OS-EXT-IPS:type': 'fixed',
+                                        'addr': '10.0.0.%d' % i,
+                                        'version': 4}]},
+                flavor={'id': '101'}, image={'id': 'image-id'}))
+            for i in range(3)]
+
+    @mock.patch.object(meta, 'get_server_external_ipv6')
+    @mock.patch.object(meta, 'get_server_external_ipv4')
+    def test_get_hostvars(self, mock_get_server_external_ipv4,
+                          mock_get_server_external_ipv6):
+        mock_get_server_external_ipv4.return_value = None
+        mock_get_server_external_ipv6.return_value = None
+        details = meta.ServerDetailsIndex(self.mock_cloud)
+
+        hostvars = [
+            meta.get_hostvars_from_server(
+                self.mock_cloud, server, details=details)
+            for server in self.servers]
+
+        for name in ('list_ports', 'list_floating_ips', 'list_images',
+                     'list_security_groups', 'list_volumes'):
+            getattr(self.mock_cloud, name).assert_called_once_with()
+        self.mock_cloud.list_flavors.assert_called_once_with(get_extra=False)
+        for name in ('search_ports', 'search_floating_ips',
+                     'list_server_security_groups', 'get_flavor_name',
+                     'get_image_name', 'get_volumes'):
+            self.assertFalse(getattr(self.mock_cloud, name).called)
+
+        self.assertEqual(
+            [PUBLIC_V4],
+            [address['addr'] for address in hostvars[0]['addresses']['private']
+             if address['OS-EXT-IPS:type'] == 'floating'])
+        self.assertEqual(1, len(hostvars[1]['addresses']['private']))
+        self.assertEqual(
+            [['default'], ['default', 'web'], []],
+            [[group['name'] for group in server['security_groups']]
+             for server in hostvars])
+        self.assertEqual(
+            [[], ['volume-0'], []],
+            [[volume['id'] for volume in server['volumes']]
+             for server in hostvars])
+        self.assertEqual('/dev/vdb', hostvars[1]['volumes'][0]['device'])
+        for server in hostvars:
+            self.assertEqual('small', server['flavor']['name'])
+            self.assertEqual('cirros', server['image']['name'])
+
+    def test_get_security_groups_nova(self):
+        self.mock_cloud._use_neutron_secgroups.return_value = False
+        self.mock_cloud.list_security_groups.return_value = [
+            {'id': 'sg-0', 'name': 'default'}]
+        self.servers[0]['security_groups'] = [{'name': 'default'}]
+        details = meta.ServerDetailsIndex(self.mock_cloud)
+
+        self.assertEqual(
+            [{'id': 'sg-0', 'name': 'default'}],
+            details.get_security_groups(self.servers[0]))
+        self.assertFalse(self.mock_cloud.list_ports.called)
+
+    def test_get_security_groups_unknown(self):
+        self.mock_cloud.list_ports.return_value[0]['security_groups'] = [
+            'sg-other']
+        self.mock_cloud.list_server_security_groups.return_value = [
+            {'id': 'sg-other', 'name': 'other'}]
+        details = meta.ServerDetailsIndex(self.mock_cloud)
+
+        self.assertEqual(
+            [{'id': 'sg-other', 'name': 'other'}],
+            details.get_security_groups(self.servers[0]))
+        self.mock_cloud.list_server_security_groups.assert_called_once_with(
+            self.servers[0])
+
+    def test_listing_failure(self):
+        self.mock_cloud.list_ports.side_effect = (
+            exc.OpenStackCloudException('No ports'))
+        details = meta.ServerDetailsIndex(self.mock_cloud)
+
+        for server in self.servers:
+            self.assertRaises(
+                exc.OpenStackCloudException, details.get_ports, server)
+        self.mock_cloud.list_ports.assert_called_once_with()
@@ -12,13 +12,16 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import hashlib
 import tempfile
 
+import fixtures
 import mock
 import testtools
 
 import openstack.cloud
 import openstack.cloud.openstackcloud as oc_oc
+from openstack.cloud import _utils
 from openstack.cloud import exc
 from openstack import exceptions
 from openstack.tests.unit import base
@@ -1306,3 +1309,540 @@ class TestObjectUploads(BaseTestObject):
             data=self.content)
 
         self.assert_calls()
+
+    def _make_unhashed_file(self):
+        content = self.getUniqueString().encode('latin-1') * 4
+        object_file = tempfile.NamedTemporaryFile(delete=False)
+        object_file.write(content)
+        object_file.close()
+        return (object_file.name, content,
+                hashlib.md5(content).hexdigest(),
+                hashlib.sha256(content).hexdigest())
+
+    def _count_hashed(self):
+        """Patch FileHasher.update to count the bytes read from files.
+
+        All the data read from the file, while uploading it or afterwards
+        by hexdigests, goes through it.
+        """
+        return self.useFixture(fixtures.MockPatchObject(
+            _utils.FileHasher, 'update', autospec=True,
+            side_effect=_utils.FileHasher.update)).mock
+
+    def _hashed_size(self, update):
+        return sum(len(data) for (_, _, data), _ in update.call_args_list)
+
+    def test_create_object_hash_while_uploading(self):
+        (filename, content, md5, sha256) = self._make_unhashed_file()
+        update = self._count_hashed()
+
+        self.register_uris([
+            dict(method='GET',
+                 uri='https://object-store.example.com/info',
+                 json=dict(
+                     swift={'max_file_size': 1000},
+                     slo={'min_segment_size': 500})),
+            dict(method='HEAD',
+                 uri='{endpoint}/{container}/{object}'.format(
+                     endpoint=self.endpoint, container=self.container,
+                     object=self.object),
+                 status_code=404),
+            dict(method='PUT',
+                 uri='{endpoint}/{container}/{object}'.format(
+                     endpoint=self.endpoint,
+                     container=self.container, object=self.object),
+                 status_code=201,
+                 validate=dict(headers={'x-object-meta-foo': 'bar'})),
+            dict(method='POST',
+                 uri='{endpoint}/{container}/{object}'.format(
+                     endpoint=self.endpoint,
+                     container=self.container, object=self.object),
+                 status_code=202,
+                 validate=dict(
+                     headers={
+                         'x-object-meta-foo': 'bar',
+                         'x-object-meta-x-sdk-md5': md5,
+                         'x-object-meta-x-sdk-sha256': sha256,
+                     }))
+        ])
+
+        self.cloud.create_object(
+            container=self.container, name=self.object,
+            filename=filename, metadata={'foo': 'bar'})
+
+        self.assert_calls()
+        self.assertNotIn(
+            'x-object-meta-x-sdk-md5',
+            self.adapter.request_history[-2].headers)
+        self.assertEqual(
+            (md5, sha256), self.cloud._get_cached_file_hashes(filename))
+        # Each byte is only read once, by the upload
+        self.assertEqual(len(content), self._hashed_size(update))
+
+    def test_create_object_existing_with_checksums(self):
+        (filename, content, md5, sha256) = self._make_unhashed_file()
+
+        self.register_uris([
+            dict(method='GET',
+                 uri='https://object-store.example.com/info',
+                 json=dict(
+                     swift={'max_file_size': 1000},
+                     slo={'min_segment_size': 500})),
+            dict(method='HEAD',
+                 uri='{endpoint}/{container}/{object}'.format(
+                     endpoint=self.endpoint, container=self.container,
+                     object=self.object),
+                 headers={
+                     'X-Object-Meta-X-Sdk-Md5': 'old',
+                     'X-Object-Meta-X-Sdk-Sha256': 'old'}),
+            dict(method='PUT',
+                 uri='{endpoint}/{container}/{object}'.format(
+                     endpoint=self.endpoint,
+                     container=self.container, object=self.object),
+                 status_code=201,
+                 validate=dict(
+                     headers={
+                         'x-object-meta-x-sdk-md5': md5,
+                         'x-object-meta-x-sdk-sha256': sha256,
+                     }))
+        ])
+
+        self.cloud.create_object(
+            container=self.container, name=self.object, filename=filename)
+
+        self.assert_calls()
+
+    def test_create_static_large_object_hash_while_uploading(self):
+        (filename, content, md5, sha256) = self._make_unhashed_file()
+        max_file_size = 25
+
+        uris_to_mock = [
+            dict(method='GET', uri='https://object-store.example.com/info',
+                 json=dict(
+                     swift={'max_file_size': max_file_size},
+                     slo={'min_segment_size': 1})),
+            dict(method='HEAD',
+                 uri='{endpoint}/{container}/{object}'.format(
+                     endpoint=self.endpoint,
+                     container=self.container, object=self.object),
+                 status_code=404)
+        ]
+        uris_to_mock.extend([
+            dict(method='PUT',
+                 uri='{endpoint}/{container}/{object}/{index:0>6}'.format(
+                     endpoint=self.endpoint,
+                     container=self.container,
+                     object=self.object,
+                     index=index),
+                 status_code=201,
+                 headers=dict(Etag='etag{index}'.format(index=index)))
+            for index, offset in enumerate(
+                range(0, len(content), max_file_size))
+        ])
+        uris_to_mock.append(
+            dict(method='PUT',
+                 uri='{endpoint}/{container}/{object}'
+                     '?multipart-manifest=put'.format(
+                         endpoint=self.endpoint,
+                         container=self.container, object=self.object),
+                 status_code=201,
+                 validate=dict(
+                     headers={
+                         'x-object-meta-x-sdk-md5': md5,
+                         'x-object-meta-x-sdk-sha256': sha256,
+                     })))
+        self.register_uris(uris_to_mock)
+
+        update = self._count_hashed()
+
+        self.cloud.create_object(
+            container=self.container, name=self.object,
+            filename=filename, use_slo=True)
+
+        # The segments are uploaded concurrently, in an indeterminate order
+        self.assert_calls(stop_after=2)
+        self.assertEqual(len(self.calls), len(self.adapter.request_history))
+        self.assertEqual(
+            (md5, sha256), self.cloud._get_cached_file_hashes(filename))
+        # The segments read ahead were kept rather than read again
+        self.assertEqual(len(content), self._hashed_size(update))
+
+    def _list_segments(self, content, segment_size, indexes, bad=()):
+        segments = []
+        for index in indexes:
+            data = content[index * segment_size:(index + 1) * segment_size]
+            segments.append({
+                'name': '{object}/{index:0>6}'.format(
+                    object=self.object, index=index),
+                'hash': hashlib.md5(
+                    b'other' if index in bad else data).hexdigest(),
+                'bytes': len(data),
+            })
+        return [
+            dict(method='GET',
+                 uri='{endpoint}/{container}?format=json&prefix='
+                     '{object}/'.format(
+                         endpoint=self.endpoint, container=self.container,
+                         object=self.object),
+                 complete_qs=True,
+                 json=segments),
+        ]
+
+    def _put_segments(self, indexes):
+        return [
+            dict(method='PUT',
+                 uri='{endpoint}/{container}/{object}/{index:0>6}'.format(
+                     endpoint=self.endpoint,
+                     container=self.container,
+                     object=self.object,
+                     index=index),
+                 status_code=201,
+                 headers=dict(Etag='etag{index}'.format(index=index)))
+            for index in indexes]
+
+    def test_create_static_large_object_resume(self):
+        max_file_size = 25
+        uploaded_md5 = hashlib.md5(self.content[:25]).hexdigest()
+
+        uris_to_mock = [
+            dict(method='GET', uri='https://object-store.example.com/info',
+                 json=dict(
+                     swift={'max_file_size': max_file_size},
+                     slo={'min_segment_size': 1})),
+            dict(method='HEAD',
+                 uri='{endpoint}/{container}/{object}'.format(
+                     endpoint=self.endpoint,
+                     container=self.container, object=self.object),
+                 status_code=404),
+        ]
+        # The first segment is reused, the second has other contents and
+        # the third is missing.
+        uris_to_mock.extend(
+            self._list_segments(self.content, max_file_size, [0, 1, 3],
+                                bad=[1]))
+        uris_to_mock.extend(self._put_segments([1, 2]))
+        uris_to_mock.append(
+            dict(method='PUT',
+                 uri='{endpoint}/{container}/{object}'
+                     '?multipart-manifest=put'.format(
+                         endpoint=self.endpoint,
+                         container=self.container, object=self.object),
+                 status_code=201,
+                 validate=dict(
+                     headers={
+                         'x-object-meta-x-sdk-md5': self.md5,
+                         'x-object-meta-x-sdk-sha256': self.sha256,
+                     })))
+        self.register_uris(uris_to_mock)
+
+        self.cloud.create_object(
+            container=self.container, name=self.object,
+            filename=self.object_file.name, use_slo=True, resume=True)
+
+        # After the listing, order become indeterminate because of thread
+        # pool
+        self.assert_calls(stop_after=3)
+        self.assertEqual(len(self.calls), len(self.adapter.request_history))
+        self.assertEqual(
+            [uploaded_md5, 'etag1', 'etag2',
+             hashlib.md5(self.content[75:]).hexdigest()],
+            [entry['etag']
+             for entry in self.adapter.request_history[-1].json()])
+
+    def test_create_static_large_object_resume_hash_while_uploading(self):
+        (filename, content, md5, sha256) = self._make_unhashed_file()
+        max_file_size = 25
+
+        uris_to_mock = [
+            dict(method='GET', uri='https://object-store.example.com/info',
+                 json=dict(
+                     swift={'max_file_size': max_file_size},
+                     slo={'min_segment_size': 1})),
+            dict(method='HEAD',
+                 uri='{endpoint}/{container}/{object}'.format(
+                     endpoint=self.endpoint,
+                     container=self.container, object=self.object),
+                 status_code=404),
+        ]
+        uris_to_mock.extend(
+            self._list_segments(content, max_file_size, [0, 2]))
+        uris_to_mock.extend(self._put_segments([
+            index for index, offset in enumerate(
+                range(0, len(content), max_file_size))
+            if index not in (0, 2)]))
+        uris_to_mock.append(
+            dict(method='PUT',
+                 uri='{endpoint}/{container}/{object}'
+                     '?multipart-manifest=put'.format(
+                         endpoint=self.endpoint,
+                         container=self.container, object=self.object),
+                 status_code=201,
+                 validate=dict(
+                     headers={
+                         'x-object-meta-x-sdk-md5': md5,
+                         'x-object-meta-x-sdk-sha256': sha256,
+                     })))
+        self.register_uris(uris_to_mock)
+
+        self.cloud.create_object(
+            container=self.container, name=self.object,
+            filename=filename, use_slo=True, resume=True)
+
+        self.assert_calls(stop_after=3)
+        self.assertEqual(len(self.calls), len(self.adapter.request_history))
+
+    def test_create_dynamic_large_object_resume(self):
+        max_file_size = 25
+
+        uris_to_mock = [
+            dict(method='GET', uri='https://object-store.example.com/info',
+                 json=dict(
+                     swift={'max_file_size': max_file_size},
+                     slo={'min_segment_size': 1})),
+            dict(method='HEAD',
+                 uri='{endpoint}/{container}/{object}'.format(
+                     endpoint=self.endpoint,
+                     container=self.container, object=self.object),
+                 status_code=404),
+        ]
+        # A previous upload of a larger file left more segments
+        uris_to_mock.extend(self._list_segments(
+            self.content + b'x' * 50, max_file_size, range(6)))
+        uris_to_mock.append(
+            dict(method='PUT',
+                 uri='{endpoint}/{container}/{object}/000003'.format(
+                     endpoint=self.endpoint,
+                     container=self.container,
+                     object=self.object),
+                 status_code=201))
+        uris_to_mock.extend([
+            dict(method='DELETE',
+                 uri='{endpoint}/{container}/{object}/{index:0>6}'.format(
+                     endpoint=self.endpoint,
+                     container=self.container,
+                     object=self.object,
+                     index=index),
+                 status_code=204)
+            for index in (4, 5)])
+        uris_to_mock.append(
+            dict(method='PUT',
+                 uri='{endpoint}/{container}/{object}'.format(
+                     endpoint=self.endpoint,
+                     container=self.container, object=self.object),
+                 status_code=201,
+                 validate=dict(
+                     headers={
+                         'x-object-manifest': '{container}/{object}'.format(
+                             container=self.container, object=self.object),
+                     })))
+        self.register_uris(uris_to_mock)
+
+        self.cloud.create_object(
+            container=self.container, name=self.object,
+            filename=self.object_file.name, use_slo=False, resume=True)
+
+        self.assert_calls()
+
+    def _chunks(self, content, size):
+        for offset in range(0, len(content), size):
+            yield content[offset:offset + size]
+
+    def test_create_static_large_object_from_stream(self):
+        max_file_size = 25
+
+        uris_to_mock = [
+            dict(method='GET', uri='https://object-store.example.com/info',
+                 json=dict(
+                     swift={'max_file_size': max_file_size},
+                     slo={'min_segment_size': 1})),
+        ]
+        uris_to_mock.extend(self._put_segments(
+            range(len(range(0, len(self.content), max_file_size)))))
+        uris_to_mock.append(
+            dict(method='PUT',
+                 uri='{endpoint}/{container}/{object}'
+                     '?multipart-manifest=put'.format(
+                         endpoint=self.endpoint,
+                         container=self.container, object=self.object),
+                 status_code=201,
+                 validate=dict(
+                     headers={
+                         'x-object-meta-foo': 'bar',
+                         'x-object-meta-x-sdk-md5': self.md5,
+                         'x-object-meta-x-sdk-sha256': self.sha256,
+                     })))
+        self.register_uris(uris_to_mock)
+
+        self.cloud.create_object(
+            container=self.container, name=self.object,
+            data=self._chunks(self.content, 7), metadata={'foo': 'bar'})
+
+        # After call 1, order become indeterminate because of thread pool
+        self.assert_calls(stop_after=1)
+        self.assertEqual(len(self.calls), len(self.adapter.request_history))
+        segments = [
+            history.body for history in self.adapter.request_history
+            if history.url.rsplit('/', 1)[-1].isdigit()]
+        self.assertEqual(
+            sorted(self._chunks(self.content, max_file_size)),
+            sorted(segments))
+        self.assertFalse(any(
+            'x-object-meta-x-sdk-md5' in history.headers
+            for history in self.adapter.request_history
+            if history.url.rsplit('/', 1)[-1].isdigit()))
+        manifest = self.adapter.request_history[-1].json()
+        self.assertEqual(
+            [dict(path='/{container}/{object}/{index:0>6}'.format(
+                container=self.container, object=self.object, index=index),
+                size_bytes=len(segment),
+                etag='etag{index}'.format(index=index))
+             for index, segment in enumerate(
+                 self._chunks(self.content, max_file_size))],
+            manifest)
+
+    def test_create_dynamic_large_object_from_file_object(self):
+        self.register_uris([
+            dict(method='GET', uri='https://object-store.example.com/info',
+                 json=dict(
+                     swift={'max_file_size': 1000},
+                     slo={'min_segment_size': 1})),
+        ] + self._put_segments([0, 1]) + [
+            dict(method='PUT',
+                 uri='{endpoint}/{container}/{object}'.format(
+                     endpoint=self.endpoint,
+                     container=self.container, object=self.object),
+                 status_code=201,
+                 validate=dict(
+                     headers={
+                         'x-object-manifest': '{container}/{object}'.format(
+                             container=self.container, object=self.object),
+                     })),
+        ])
+
+        with open(self.object_file.name, 'rb') as data:
+            self.cloud.create_object(
+                container=self.container, name=self.object,
+                data=data, segment_size=len(self.content) - 1, use_slo=False)
+
+        self.assert_calls(stop_after=1)
+        self.assertEqual(len(self.calls), len(self.adapter.request_history))
+
+    def test_create_large_object_from_stream_no_checksums(self):
+        self.register_uris([
+            dict(method='GET', uri='https://object-store.example.com/info',
+                 json=dict(
+                     swift={'max_file_size': 1000},
+                     slo={'min_segment_size': 1})),
+        ] + self._put_segments([0, 1]) + [
+            dict(method='PUT',
+                 uri='{endpoint}/{container}/{object}'
+                     '?multipart-manifest=put'.format(
+                         endpoint=self.endpoint,
+                         container=self.container, object=self.object),
+                 status_code=201),
+        ])
+
+        self.cloud.create_object(
+            container=self.container, name=self.object,
+            data=self._chunks(self.content, 7),
+            segment_size=len(self.content) - 1, generate_checksums=False)
+
+        self.assert_calls(stop_after=1)
+        self.assertNotIn(
+            'x-object-meta-x-sdk-md5',
+            self.adapter.request_history[-1].headers)
+
+    def test_create_object_from_bytearray(self):
+        self.register_uris([
+            dict(method='PUT',
+                 uri='{endpoint}/{container}/{object}'.format(
+                     endpoint=self.endpoint,
+                     container=self.container, object=self.object),
+                 status_code=201),
+        ])
+
+        self.cloud.create_object(
+            container=self.container, name=self.object,
+            data=bytearray(self.content))
+
+        self.assert_calls()
+        self.assertEqual(
+            self.content, bytes(self.adapter.request_history[-1].body))
+
+    def test_create_object_from_small_stream(self):
+        self.register_uris([
+            dict(method='GET', uri='https://object-store.example.com/info',
+                 json=dict(
+                     swift={'max_file_size': 1000},
+                     slo={'min_segment_size': 1})),
+            dict(method='PUT',
+                 uri='{endpoint}/{container}/{object}'.format(
+                     endpoint=self.endpoint,
+                     container=self.container, object=self.object),
+                 status_code=201),
+        ])
+
+        self.cloud.create_object(
+            container=self.container, name=self.object,
+            data=self._chunks(self.content, 7))
+
+        self.assert_calls()
+        self.assertEqual(
+            self.content, self.adapter.request_history[-1].body)
+
+    def test_create_large_object_from_stream_segment_failure(self):
+        self.register_uris([
+            dict(method='GET', uri='https://object-store.example.com/info',
+                 json=dict(
+                     swift={'max_file_size': 1000},
+                     slo={'min_segment_size': 1})),
+            dict(method='PUT',
+                 uri='{endpoint}/{container}/{object}/000000'.format(
+                     endpoint=self.endpoint,
+                     container=self.container, object=self.object),
+                 status_code=201),
+            dict(method='PUT',
+                 uri='{endpoint}/{container}/{object}/000001'.format(
+                     endpoint=self.endpoint,
+                     container=self.container, object=self.object),
+                 status_code=501),
+            dict(method='PUT',
+                 uri='{endpoint}/{container}/{object}/000001'.format(
+                     endpoint=self.endpoint,
+                     container=self.container, object=self.object),
+                 status_code=501),
+        ])
+
+        self.assertRaises(
+            exc.OpenStackCloudException,
+            self.cloud.create_object,
+            container=self.container, name=self.object,
+            data=self._chunks(self.content, 7),
+            segment_size=len(self.content) - 1)
+
+    def test_proxy_create_large_object_from_stream(self):
+        self.register_uris([
+            dict(method='GET', uri='https://object-store.example.com/info',
+                 json=dict(
+                     swift={'max_file_size': 1000},
+                     slo={'min_segment_size': 1})),
+        ] + self._put_segments([0, 1]) + [
+            dict(method='PUT',
+                 uri='{endpoint}/{container}/{object}'
+                     '?multipart-manifest=put'.format(
+                         endpoint=self.endpoint,
+                         container=self.container, object=self.object),
+                 status_code=201),
+        ])
+
+        self.cloud.object_store.create_object(
+            container=self.container, name=self.object,
+            data=self._chunks(self.content, 7),
+            segment_size=len(self.content) - 1)
+
+        self.assert_calls(stop_after=1)
+        self.assertEqual(len(self.calls), len(self.adapter.request_history))
+        self.assertEqual(
+            [len(self.content) - 1, 1],
+            [entry['size_bytes']
+             for entry in self.adapter.request_history[-1].json()])
@@ -10,12 +10,16 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
+import datetime
+import fixtures
 import mock
 import uuid
 
 import testtools
 
 from openstack.cloud import exc
+from openstack.cloud import _utils
 from openstack import connection
 from openstack.tests import fakes
 from openstack.tests.unit import base
@@ -463,6 +467,107 @@ class TestShade(base.TestCase):
 
         self.assert_calls()
 
+    def test_list_servers_incremental(self):
+        self.cloud._incremental_server_cache = True
+        servers = [
+            fakes.make_fake_server(str(uuid.uuid4()), 'server-%d' % i)
+            for i in range(3)]
+        updated = fakes.make_fake_server(servers[0]['id'], 'updated')
+        updated['updated'] = '2017-03-24T00:00:00Z'
+        deleted = fakes.make_fake_server(
+            servers[1]['id'], 'server-1', status='DELETED')
+        self.useFixture(fixtures.MockPatchObject(
+            self.cloud, '_get_servers_changes_since', side_effect=[
+                '2017-03-23T23:00:00Z', '2017-03-24T00:00:00Z',
+                '2017-03-24T01:00:00Z']))
+        self.register_uris([
+            self.get_nova_discovery_mock_dict(),
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'compute', 'public', append=['servers', 'detail']),
+                 complete_qs=True,
+                 json={'servers': servers[:2]}),
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'compute', 'public', append=['servers', 'detail'],
+                     qs_elements=['changes-since=2017-03-23T23:00:00Z']),
+                 complete_qs=True,
+                 json={'servers': [servers[2], updated, deleted]}),
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'compute', 'public', append=['servers', 'detail'],
+                     qs_elements=['changes-since=2017-03-24T00:00:00Z']),
+                 complete_qs=True,
+                 json={'servers': []}),
+        ])
+
+        r = self.cloud.list_servers()
+        self.assertEqual(['server-0', 'server-1'], [s['name'] for s in r])
+        r = self.cloud.list_servers()
+        self.assertEqual(['server-2', 'updated'], [s['name'] for s in r])
+        r = self.cloud.list_servers()
+        self.assertEqual(['server-2', 'updated'], [s['name'] for s in r])
+
+        self.assert_calls()
+
+    def test_list_servers_incremental_resync(self):
+        self.cloud._incremental_server_cache = True
+        self.cloud._incremental_server_cache_resync = 600
+        server = fakes.make_fake_server(str(uuid.uuid4()), 'server')
+        self.register_uris([
+            self.get_nova_discovery_mock_dict(),
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'compute', 'public', append=['servers', 'detail']),
+                 complete_qs=True,
+                 json={'servers': [server]}),
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'compute', 'public', append=['servers', 'detail']),
+                 complete_qs=True,
+                 json={'servers': []}),
+        ])
+
+        with mock.patch('time.time', return_value=1000):
+            self.cloud.list_servers()
+        with mock.patch('time.time', return_value=1600):
+            r = self.cloud.list_servers()
+
+        # Deleted servers purged from nova are only seen by a full listing
+        self.assertEqual([], r)
+        self.assert_calls()
+
+    def test_get_servers_changes_since(self):
+        changes_since = datetime.datetime.strptime(
+            self.cloud._get_servers_changes_since(), '%Y-%m-%dT%H:%M:%SZ')
+        skew = datetime.datetime.utcnow() - changes_since
+        self.assertGreaterEqual(skew.total_seconds(), 59)
+        self.assertLess(skew.total_seconds(), 70)
+
+    def test_list_servers_incremental_other_listing(self):
+        self.cloud._incremental_server_cache = True
+        server = fakes.make_fake_server(str(uuid.uuid4()), 'server')
+        self.register_uris([
+            self.get_nova_discovery_mock_dict(),
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'compute', 'public', append=['servers', 'detail']),
+                 complete_qs=True,
+                 json={'servers': [server]}),
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'compute', 'public', append=['servers', 'detail'],
+                     qs_elements=['all_tenants=True']),
+                 complete_qs=True,
+                 json={'servers': [server]}),
+        ])
+
+        self.cloud.list_servers()
+        r = self.cloud.list_servers(all_projects=True)
+
+        self.assertEqual(1, len(r))
+        self.assert_calls()
+
     def test_iterate_timeout_bad_wait(self):
         with testtools.ExpectedException(
                 exc.OpenStackCloudException,
@@ -730,3 +835,15 @@ class TestShade(base.TestCase):
         self.assertIsInstance(retval, list)
         self.assertEqual(1, len(retval))
         self.assertEqual([RANGE_DATA[0]], retval)
+
+    def test_range_search_no_match_first(self):
+        filters = collections.OrderedDict([("key1", "7"), ("key2", "min")])
+        retval = self.cloud.range_search(RANGE_DATA, filters)
+        self.assertEqual([], retval)
+
+    def test_range_search_filter_object(self):
+        range_filter = _utils.RangeFilter({"key1": "<=2", "key2": ">10"})
+        retval = self.cloud.range_search(RANGE_DATA, range_filter)
+        self.assertEqual([RANGE_DATA[1], RANGE_DATA[3]], retval)
+        retval = self.cloud.range_search(RANGE_DATA[:2], range_filter)
+        self.assertEqual([RANGE_DATA[1]], retval)
@@ -344,17 +344,20 @@ class TestClusterProxy(test_proxy_base.TestProxyBase):
         self.proxy.wait_for_status(mock_resource, 'ACTIVE')
 
         mock_wait.assert_called_once_with(self.proxy, mock_resource,
-                                          'ACTIVE', [], 2, 120)
+                                          'ACTIVE', [], 2, 120,
+                                          strategy=None, max_wait=None)
 
     @mock.patch("openstack.resource.wait_for_status")
     def test_wait_for_params(self, mock_wait):
         mock_resource = mock.Mock()
         mock_wait.return_value = mock_resource
 
-        self.proxy.wait_for_status(mock_resource, 'ACTIVE', ['ERROR'], 1, 2)
+        self.proxy.wait_for_status(mock_resource, 'ACTIVE', ['ERROR'], 1, 2,
+                                   strategy='jitter', max_wait=30)
 
         mock_wait.assert_called_once_with(self.proxy, mock_resource,
-                                          'ACTIVE', ['ERROR'], 1, 2)
+                                          'ACTIVE', ['ERROR'], 1, 2,
+                                          strategy='jitter', max_wait=30)
 
     @mock.patch("openstack.resource.wait_for_delete")
     def test_wait_for_delete(self, mock_wait):
@@ -363,13 +366,16 @@ class TestClusterProxy(test_proxy_base.TestProxyBase):
 
         self.proxy.wait_for_delete(mock_resource)
 
-        mock_wait.assert_called_once_with(self.proxy, mock_resource, 2, 120)
+        mock_wait.assert_called_once_with(self.proxy, mock_resource, 2, 120,
+                                          strategy=None, max_wait=None)
 
     @mock.patch("openstack.resource.wait_for_delete")
     def test_wait_for_delete_params(self, mock_wait):
         mock_resource = mock.Mock()
         mock_wait.return_value = mock_resource
 
-        self.proxy.wait_for_delete(mock_resource, 1, 2)
+        self.proxy.wait_for_delete(mock_resource, 1, 2, strategy='exponential',
+                                   max_wait=30)
 
-        mock_wait.assert_called_once_with(self.proxy, mock_resource, 1, 2)
+        mock_wait.assert_called_once_with(self.proxy, mock_resource, 1, 2,
+                                          strategy='exponential', max_wait=30)
@@ -235,7 +235,17 @@ class TestComputeProxy(test_proxy_base.TestProxyBase):
         self.verify_wait_for_status(
             self.proxy.wait_for_server,
             method_args=[value],
-            expected_args=[value, 'ACTIVE', ['ERROR'], 2, 120])
+            expected_args=[value, 'ACTIVE', ['ERROR'], 2, 120],
+            expected_kwargs={'strategy': None, 'max_wait': None})
+
+    def test_servers_wait_for(self):
+        value = [server.Server(id='1234')]
+        self.verify_wait_for_status(
+            self.proxy.wait_for_servers,
+            mock_method="openstack.resource.wait_for_statuses",
+            method_args=[value],
+            expected_args=[value, 'ACTIVE', None, 2, 120],
+            expected_kwargs={'strategy': None, 'max_wait': None})
 
     def test_server_resize(self):
         self._verify("openstack.compute.v2.server.Server.resize",
@@ -44,6 +44,9 @@ USER_CONF = {
             'server': 5,
             'image': '7',
         },
+        'file_hashes': {
+            'max_entries': 10,
+        },
     },
     'client': {
         'force_ipv4': True,
@@ -241,3 +244,4 @@ class TestCase(base.TestCase):
         self.assertEqual(cc.get_cache_expiration_time(), 1)
         self.assertEqual(cc.get_cache_resource_expiration('server'), 5.0)
         self.assertEqual(cc.get_cache_resource_expiration('image'), 7.0)
+        self.assertEqual({'max_entries': '10'}, cc.get_cache_file_hashes())
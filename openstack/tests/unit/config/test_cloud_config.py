@@ -181,6 +181,47 @@ class TestCloudRegion(base.TestCase):
         self.assertEqual(1, cc.get_connect_retries('compute'))
         self.assertEqual(3, cc.get_connect_retries('baremetal'))
 
+    def test_get_wait_strategy(self):
+        cc = cloud_region.CloudRegion(
+            "test1", "region-al", {'wait_strategy': 'jitter'})
+        self.assertEqual('jitter', cc.get_wait_strategy())
+        self.assertEqual('jitter', cc.get_wait_strategy('compute'))
+
+        cc = cloud_region.CloudRegion(
+            "test1", "region-al",
+            {'wait_strategy': {'compute': 'exponential'}})
+        self.assertEqual('exponential', cc.get_wait_strategy('compute'))
+        self.assertIsNone(cc.get_wait_strategy('volume'))
+
+    def test_get_wait_max_interval(self):
+        cc = cloud_region.CloudRegion(
+            "test1", "region-al", {'wait_max_interval': 30})
+        self.assertEqual(30, cc.get_wait_max_interval())
+        self.assertEqual(30, cc.get_wait_max_interval('compute'))
+
+        cc = cloud_region.CloudRegion(
+            "test1", "region-al",
+            {'wait_max_interval': {'compute': 60}})
+        self.assertEqual(60, cc.get_wait_max_interval('compute'))
+        self.assertIsNone(cc.get_wait_max_interval('volume'))
+
+    def test_get_concurrency(self):
+        cc = cloud_region.CloudRegion(
+            "test1", "region-al", {'concurrency': 8})
+        self.assertEqual(8, cc.get_concurrency('compute'))
+        self.assertEqual(8, cc.get_max_concurrency())
+
+        cc = cloud_region.CloudRegion(
+            "test1", "region-al",
+            {'concurrency': {'compute': 20, 'network': 10}})
+        self.assertEqual(20, cc.get_concurrency('compute'))
+        self.assertIsNone(cc.get_concurrency('volume'))
+        self.assertEqual(20, cc.get_max_concurrency())
+
+        cc = cloud_region.CloudRegion("test1", "region-al", {})
+        self.assertIsNone(cc.get_concurrency('compute'))
+        self.assertIsNone(cc.get_max_concurrency())
+
     def test_get_region_name(self):
 
         def assert_region_name(default, compute):
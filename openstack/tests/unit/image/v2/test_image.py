@@ -433,6 +433,47 @@ class TestImage(base.TestCase):
         output_file.seek(0)
         self.assertEqual(b'0102', output_file.read())
 
+    def _ranged_get(self, data, checksum):
+        def get(url, headers=None, **kwargs):
+            if not url.endswith('/file'):
+                return FakeResponse(
+                    {'id': 'IDENTIFIER', 'size': len(data),
+                     'checksum': checksum})
+            start, end = headers['Range'][len('bytes='):].split('-')
+            response = mock.Mock()
+            response.status_code = 206
+            response.iter_content.return_value = [
+                data[int(start):int(end) + 1]]
+            return response
+        return mock.Mock(side_effect=get)
+
+    def test_image_download_in_parts(self):
+        data = b'0123456789'
+        sot = image.Image(**EXAMPLE)
+        self.sess.get = self._ranged_get(
+            data, calculate_md5_checksum([data]))
+
+        output_file = tempfile.NamedTemporaryFile()
+        rv = sot.download(
+            self.sess, output=output_file.name, workers=2, part_size=4)
+
+        self.assertIs(sot, rv)
+        self.assertEqual(data, output_file.read())
+        self.assertEqual(
+            ['bytes=0-3', 'bytes=4-7', 'bytes=8-9'],
+            [c[1]['headers']['Range']
+             for c in self.sess.get.call_args_list[1:]])
+
+    def test_image_download_in_parts_checksum_mismatch(self):
+        data = b'0123456789'
+        sot = image.Image(**EXAMPLE)
+        self.sess.get = self._ranged_get(data, '0' * 32)
+
+        output_file = tempfile.NamedTemporaryFile()
+        self.assertRaises(
+            exceptions.InvalidResponse, sot.download, self.sess,
+            output=output_file.name, workers=2, part_size=4)
+
     def test_image_update(self):
         values = EXAMPLE.copy()
         del values['instance_uuid']
@@ -22,6 +22,7 @@ from openstack.image.v2 import task
 from openstack.image.v2 import service_info as si
 from openstack.tests.unit.image.v2 import test_image as fake_image
 from openstack.tests.unit import test_proxy_base
+from openstack import utils
 
 EXAMPLE = fake_image.EXAMPLE
 
@@ -92,7 +93,9 @@ class TestImageProxy(test_proxy_base.TestProxyBase):
                      },
                      expected_kwargs={'output': 'some_output',
                                       'chunk_size': 1,
-                                      'stream': True})
+                                      'stream': True,
+                                      'workers': None,
+                                      'part_size': None})
 
     @mock.patch("openstack.image.v2.image.Image.fetch")
     def test_image_stage(self, mock_fetch):
@@ -286,6 +289,20 @@ class TestImageProxy(test_proxy_base.TestProxyBase):
 
         self.assertTrue(result, res)
 
+    @mock.patch.object(utils, 'iterate_timeout', return_value=iter([1]))
+    def test_wait_for_task_strategy(self, mock_iterate):
+        res = task.Task(id='1234', status='waiting')
+
+        with mock.patch.object(task.Task, 'fetch',
+                               return_value=task.Task(
+                                   id='1234', status='success')):
+            self.proxy.wait_for_task(
+                res, interval=1, wait=3, strategy='jitter', max_wait=30)
+
+        mock_iterate.assert_called_once_with(
+            timeout=3, message=mock.ANY, wait=1, strategy='jitter',
+            max_wait=30)
+
     def test_wait_for_task_error_396(self):
         # Ensure we create a new task when we get 396 error
         res = task.Task(
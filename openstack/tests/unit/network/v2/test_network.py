@@ -98,6 +98,7 @@ class TestNetwork(base.TestCase):
             {'limit': 'limit',
              'marker': 'marker',
              'description': 'description',
+             'id': 'id',
              'name': 'name',
              'project_id': 'tenant_id',
              'status': 'status',
@@ -299,6 +299,15 @@ class TestNetworkProxy(test_proxy_base.TestProxyBase):
     def test_network_create_attrs(self):
         self.verify_create(self.proxy.create_network, network.Network)
 
+    def test_networks_create(self):
+        data = [{"x": 1}, {"y": 2}]
+        self._verify2("openstack.proxy.Proxy._bulk_create",
+                      self.proxy.create_networks,
+                      method_args=[data],
+                      expected_args=[network.Network, data],
+                      expected_kwargs={"chunk_size": 100},
+                      expected_result=["result"])
+
     def test_network_delete(self):
         self.verify_delete(self.proxy.delete_network, network.Network, False)
 
@@ -447,6 +456,15 @@ class TestNetworkProxy(test_proxy_base.TestProxyBase):
     def test_port_create_attrs(self):
         self.verify_create(self.proxy.create_port, port.Port)
 
+    def test_ports_create(self):
+        data = [{"x": 1}, {"y": 2}]
+        self._verify2("openstack.proxy.Proxy._bulk_create",
+                      self.proxy.create_ports,
+                      method_args=[data],
+                      expected_args=[port.Port, data],
+                      expected_kwargs={"chunk_size": 100},
+                      expected_result=["result"])
+
     def test_port_delete(self):
         self.verify_delete(self.proxy.delete_port, port.Port, False)
 
@@ -1000,6 +1018,16 @@ class TestNetworkProxy(test_proxy_base.TestProxyBase):
         self.verify_create(self.proxy.create_security_group_rule,
                            security_group_rule.SecurityGroupRule)
 
+    def test_security_group_rules_create(self):
+        data = [{"x": 1}, {"y": 2}]
+        self._verify2("openstack.proxy.Proxy._bulk_create",
+                      self.proxy.create_security_group_rules,
+                      method_args=[data],
+                      expected_args=[security_group_rule.SecurityGroupRule,
+                                     data],
+                      expected_kwargs={"chunk_size": 100},
+                      expected_result=["result"])
+
     def test_security_group_rule_delete(self):
         self.verify_delete(self.proxy.delete_security_group_rule,
                            security_group_rule.SecurityGroupRule, False)
@@ -1044,6 +1072,15 @@ class TestNetworkProxy(test_proxy_base.TestProxyBase):
     def test_subnet_create_attrs(self):
         self.verify_create(self.proxy.create_subnet, subnet.Subnet)
 
+    def test_subnets_create(self):
+        data = [{"x": 1}, {"y": 2}]
+        self._verify2("openstack.proxy.Proxy._bulk_create",
+                      self.proxy.create_subnets,
+                      method_args=[data],
+                      expected_args=[subnet.Subnet, data],
+                      expected_kwargs={"chunk_size": 100},
+                      expected_result=["result"])
+
     def test_subnet_delete(self):
         self.verify_delete(self.proxy.delete_subnet, subnet.Subnet, False)
 
@@ -10,10 +10,17 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import hashlib
+import os
 import random
 import string
 import tempfile
 
+import fixtures
+import six
+
+from openstack import exceptions
+
 from openstack.object_store.v1 import account
 from openstack.object_store.v1 import container
 from openstack.object_store.v1 import obj
@@ -183,20 +190,56 @@ class TestObjectStoreProxy(test_proxy_base.TestProxyBase):
         self.imagefile.write(content)
         self.imagefile.close()
 
-        segments = self.proxy._get_file_segments(
+        segments = list(self.proxy._get_file_segments(
             endpoint='test_container/test_image',
             filename=self.imagefile.name,
             file_size=file_size,
-            segment_size=1000)
+            segment_size=1000))
         self.assertEqual(len(segments), 5)
         segment_content = b''
-        for (index, (name, segment)) in enumerate(segments.items()):
+        for (index, (name, segment)) in enumerate(segments):
             self.assertEqual(
                 'test_container/test_image/{index:0>6}'.format(index=index),
                 name)
             segment_content += segment.read()
         self.assertEqual(content, segment_content)
 
+        # Retried uploads read the segment again from its start
+        segment = segments[1][1]
+        segment.seek(0)
+        self.assertEqual(content[1000:2000], segment.read())
+
+    def test_file_segment_lazy_open(self):
+        self.imagefile = tempfile.NamedTemporaryFile(delete=False)
+        self.imagefile.write(b'0123456789')
+        self.imagefile.close()
+
+        segments = self.proxy._get_file_segments(
+            endpoint='test_container/test_image',
+            filename=self.imagefile.name,
+            file_size=10,
+            segment_size=4)
+        first = next(segments)[1]
+        second = next(segments)[1]
+        shared_file = first._file
+        self.assertIs(shared_file, second._file)
+        self.assertIsNone(shared_file._fd)
+
+        # Both segments read from the same descriptor
+        self.assertEqual(b'01', first.read(2))
+        fd = shared_file._fd
+        self.assertIsNotNone(fd)
+        self.assertEqual(b'45', second.read(2))
+        self.assertEqual(fd, shared_file._fd)
+
+        # The file is closed once no segment is reading it
+        self.assertEqual(b'23', first.read())
+        self.assertIsNotNone(shared_file._fd)
+        second.close()
+        self.assertIsNone(shared_file._fd)
+        self.assertEqual(b'89', next(segments)[1].read())
+        self.assertIsNone(shared_file._fd)
+
 
 class TestDownloadObject(base_test_object.BaseTestObject):
 
@@ -237,3 +280,257 @@ class TestDownloadObject(base_test_object.BaseTestObject):
             self.assertLessEqual(chunk_len, chunk_size)
             self.assertEqual(chunk, self.the_data[start:end])
         self.assert_calls()
+
+
+class TestDownloadObjectInParts(base_test_object.BaseTestObject):
+
+    def setUp(self):
+        super(TestDownloadObjectInParts, self).setUp()
+        self.the_data = b'test body of the object'
+        self.md5 = hashlib.md5(self.the_data).hexdigest()
+        self.requested_ranges = []
+
+    def _head(self, etag=None, **headers):
+        headers.update({
+            'Content-Length': str(len(self.the_data)),
+            'Content-Type': 'application/octet-stream',
+            'Accept-Ranges': 'bytes',
+            'Etag': '"{etag}"'.format(etag=etag or self.md5),
+        })
+        return dict(method='HEAD', uri=self.object_endpoint, headers=headers)
+
+    def _get_range(self, status_code=206):
+        def content(request, context):
+            start, end = request.headers['Range'][len('bytes='):].split('-')
+            self.requested_ranges.append((int(start), int(end)))
+            context.status_code = status_code
+            return self.the_data[int(start):int(end) + 1]
+        return dict(method='GET', uri=self.object_endpoint, content=content)
+
+    def test_download_in_parts(self):
+        self.register_uris(
+            [self._head()] + [self._get_range() for i in range(6)])
+        output = os.path.join(self.useFixture(fixtures.TempDir()).path, 'o')
+
+        self.cloud.object_store.download_object(
+            self.object, container=self.container, output=output,
+            workers=3, part_size=4)
+
+        with open(output, 'rb') as f:
+            self.assertEqual(self.the_data, f.read())
+        self.assertEqual(
+            [(0, 3), (4, 7), (8, 11), (12, 15), (16, 19), (20, 22)],
+            sorted(self.requested_ranges))
+        self.assertEqual(
+            self.md5,
+            self.adapter.request_history[-1].headers['If-Match'])
+        self.assert_calls()
+
+    def test_download_large_object_in_parts(self):
+        self.register_uris([
+            self._head(
+                etag='segments-etag', **{
+                    'X-Static-Large-Object': 'True',
+                    'X-Object-Meta-X-Sdk-Md5': self.md5,
+                }),
+            self._get_range(),
+            self._get_range(),
+        ])
+        output = tempfile.TemporaryFile()
+        self.addCleanup(output.close)
+
+        self.cloud.object_store.download_object(
+            self.object, container=self.container, output=output,
+            workers=2, part_size=16)
+
+        output.seek(0)
+        self.assertEqual(self.the_data, output.read())
+        self.assertNotIn(
+            'If-Match', self.adapter.request_history[-1].headers)
+        self.assert_calls()
+
+    def test_download_in_parts_checksum_mismatch(self):
+        self.register_uris([
+            self._head(etag='0' * 32),
+            self._get_range(),
+        ])
+        output = tempfile.TemporaryFile()
+        self.addCleanup(output.close)
+
+        self.assertRaises(
+            exceptions.InvalidResponse,
+            self.cloud.object_store.download_object,
+            self.object, container=self.container, output=output,
+            workers=2, part_size=32)
+        self.assert_calls()
+
+    def test_download_in_parts_ranges_not_supported(self):
+        self.register_uris([
+            self._head(),
+            self._get_range(status_code=200),
+        ])
+        output = tempfile.TemporaryFile()
+        self.addCleanup(output.close)
+
+        self.assertRaises(
+            exceptions.SDKException,
+            self.cloud.object_store.download_object,
+            self.object, container=self.container, output=output,
+            workers=2, part_size=32)
+        self.assert_calls()
+
+    def test_download_to_file_object(self):
+        self.register_uris([
+            self._head(),
+            dict(method='GET', uri=self.object_endpoint,
+                 content=self.the_data),
+        ])
+        output = six.BytesIO()
+
+        self.cloud.object_store.download_object(
+            self.object, container=self.container, output=output,
+            workers=4)
+
+        self.assertEqual(self.the_data, output.getvalue())
+        self.assert_calls()
+
+
+class TestSyncDirectory(base_test_object.BaseTestObject):
+
+    def setUp(self):
+        super(TestSyncDirectory, self).setUp()
+        self.local_path = self.useFixture(fixtures.TempDir()).path
+        self.progress = []
+
+    def _write(self, name, content):
+        path = os.path.join(self.local_path, *name.split('/'))
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def _object_uri(self, name):
+        return '{endpoint}/{name}'.format(
+            endpoint=self.container_endpoint, name=name)
+
+    def _listing(self, objects):
+        return dict(
+            method='GET',
+            uri='{endpoint}?format=json&prefix=backup/'.format(
+                endpoint=self.container_endpoint),
+            complete_qs=True,
+            json=[dict(name=name, hash=etag, bytes=size)
+                  for name, etag, size in objects])
+
+    def _on_progress(self, name, count, total):
+        self.progress.append((name, count, total))
+
+    def _upload(self, name, head_status=404, hashed=False):
+        uris = [
+            dict(method='GET', uri='https://object-store.example.com/info',
+                 json=dict(
+                     swift={'max_file_size': 1000},
+                     slo={'min_segment_size': 1})),
+            dict(method='HEAD', uri=self._object_uri(name),
+                 status_code=head_status),
+            dict(method='PUT', uri=self._object_uri(name), status_code=201),
+        ]
+        if not hashed:
+            # The checksums computed while uploading are set afterwards
+            uris.append(dict(method='POST', uri=self._object_uri(name),
+                             status_code=202))
+        return uris
+
+    def test_sync_directory(self):
+        self._write('a', b'aaa')
+        self._write('b', b'bbbb')
+        self._write('big', b'big data')
+        self._write('e', b'eeee')
+        self._write('sub/c', b'c')
+        md5 = hashlib.md5
+        big_headers = {
+            'X-Static-Large-Object': 'True',
+            'X-Object-Meta-X-Sdk-Md5': md5(b'big data').hexdigest(),
+            'X-Object-Meta-X-Sdk-Sha256': hashlib.sha256(
+                b'big data').hexdigest(),
+        }
+        self.register_uris(
+            [self._listing([
+                ('backup/a', md5(b'aaa').hexdigest(), 3),
+                ('backup/b', md5(b'bb').hexdigest(), 2),
+                ('backup/big', 'slo-etag', 8),
+                ('backup/big/000000', md5(b'big data').hexdigest(), 8),
+                ('backup/d', md5(b'd').hexdigest(), 1),
+                ('backup/e', md5(b'ffff').hexdigest(), 4),
+            ])]
+            + self._upload('backup/b', head_status=200)
+            + [dict(method='HEAD', uri=self._object_uri('backup/big'),
+                    headers=big_headers)]
+            + self._upload('backup/e', head_status=200, hashed=True)
+            + self._upload('backup/sub/c')
+            + [dict(method='HEAD', uri=self._object_uri('backup/d')),
+               dict(method='DELETE', uri=self._object_uri('backup/d'))])
+
+        result = self.cloud.object_store.sync_directory(
+            self.local_path, self.container, prefix='backup', delete=True,
+            workers=1, progress=self._on_progress)
+
+        self.assert_calls()
+        self.assertEqual(
+            dict(uploaded=['backup/b', 'backup/e', 'backup/sub/c'],
+                 deleted=['backup/d']),
+            result)
+        self.assertEqual(
+            [('backup/a', 1, 6), ('backup/b', 2, 6), ('backup/big', 3, 6),
+             ('backup/e', 4, 6), ('backup/sub/c', 5, 6), ('backup/d', 6, 6)],
+            self.progress)
+
+    def test_download_directory(self):
+        self._write('a', b'aaa')
+        self._write('b', b'bbbb')
+        stale = self._write('sub/c', b'c')
+        md5 = hashlib.md5
+        self.register_uris([
+            self._listing([
+                ('backup/../evil', md5(b'evil').hexdigest(), 4),
+                ('backup/a', md5(b'aaa').hexdigest(), 3),
+                ('backup/b', md5(b'bb').hexdigest(), 2),
+                ('backup/big', 'slo-etag', 8),
+                ('backup/big/000000', md5(b'big data').hexdigest(), 8),
+                ('backup/dir/', md5(b'').hexdigest(), 0),
+            ]),
+            dict(method='HEAD', uri=self._object_uri('backup/b'),
+                 headers={'Etag': md5(b'bb').hexdigest(),
+                          'Content-Length': '2'}),
+            dict(method='GET', uri=self._object_uri('backup/b'),
+                 content=b'bb'),
+            dict(method='HEAD', uri=self._object_uri('backup/big'),
+                 headers={'Etag': '"slo-etag"',
+                          'Content-Length': '8',
+                          'X-Static-Large-Object': 'True',
+                          'X-Object-Meta-X-Sdk-Md5': md5(
+                              b'big data').hexdigest()}),
+            dict(method='GET', uri=self._object_uri('backup/big'),
+                 content=b'big data'),
+        ])
+
+        result = self.cloud.object_store.download_directory(
+            self.container, self.local_path, prefix='backup/', delete=True,
+            workers=1, progress=self._on_progress)
+
+        self.assert_calls()
+        self.assertEqual(
+            dict(downloaded=['backup/b', 'backup/big'], deleted=[stale]),
+            result)
+        for name, content in [('a', b'aaa'), ('b', b'bb'),
+                              ('big', b'big data')]:
+            with open(os.path.join(self.local_path, name), 'rb') as f:
+                self.assertEqual(content, f.read())
+        self.assertFalse(os.path.exists(stale))
+        self.assertFalse(os.path.exists(os.path.join(
+            os.path.dirname(self.local_path), 'evil')))
+        self.assertEqual(
+            [('backup/a', 1, 4), ('backup/b', 2, 4), ('backup/big', 3, 4),
+             (stale, 4, 4)],
+            self.progress)
@@ -10,7 +10,9 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import concurrent.futures
 import os
+import threading
 
 import fixtures
 from keystoneauth1 import session
@@ -336,6 +338,156 @@ class TestAuthorize(base.TestCase):
                           self.cloud.authorize)
 
 
+class TestBatch(base.TestCase):
+
+    def setUp(self):
+        super(TestBatch, self).setUp()
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def _call(self, item):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            # Later items finish first. time.sleep is patched out in tests.
+            threading.Event().wait(0.01 * (5 - item % 5))
+            if item < 0:
+                raise ValueError(item)
+            return item * 2
+        finally:
+            with self.lock:
+                self.running -= 1
+
+    def test_batch(self):
+        self.assertEqual([0, 2, 4, 6, 8, 10, 12],
+                         self.cloud.batch(self._call, range(7)))
+        self.assertEqual(5, self.max_running)
+
+    def test_batch_empty(self):
+        self.assertEqual([], self.cloud.batch(self._call, []))
+
+    def test_batch_max_workers(self):
+        self.assertEqual([0, 2, 4, 6, 8],
+                         self.cloud.batch(self._call, range(5),
+                                          max_workers=2))
+        self.assertEqual(2, self.max_running)
+
+    def test_batch_return_exceptions(self):
+        results = self.cloud.batch(self._call, [1, -1, 2])
+
+        self.assertEqual(2, results[0])
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(4, results[2])
+
+    def test_batch_raise(self):
+        calls = []
+
+        def call(item):
+            calls.append(item)
+            return self._call(item)
+
+        self.assertRaises(ValueError, self.cloud.batch, call,
+                          [1, -1] + list(range(10)),
+                          max_workers=2, return_exceptions=False)
+        self.assertLess(len(calls), 12)
+
+    def test_batch_raise_cancels_pending(self):
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        conn = connection.Connection(config=self.cloud.config,
+                                     pool_executor=executor)
+        calls = []
+
+        def call(item):
+            calls.append(item)
+            return self._call(item)
+
+        self.assertRaises(ValueError, conn.batch, call, [-1] + list(range(10)),
+                          return_exceptions=False)
+        self.assertLess(len(calls), 11)
+
+    def test_batch_service_concurrency(self):
+        self.useFixture(fixtures.MockPatchObject(
+            self.cloud.config, 'get_concurrency', return_value=3))
+
+        self.cloud.batch(self._call, range(5), service_type='network')
+
+        self.assertEqual(3, self.max_running)
+        self.cloud.config.get_concurrency.assert_called_once_with('network')
+
+    def test_batch_proxy_concurrency(self):
+        self.useFixture(fixtures.MockPatchObject(
+            self.cloud.config, 'get_concurrency', return_value=2))
+        self.useFixture(fixtures.MockPatchObject(
+            proxy.Proxy, 'double', create=True,
+            new=lambda proxy_self, item: self._call(item)))
+
+        self.assertEqual([0, 2, 4, 6],
+                         self.cloud.batch(self.cloud.network.double,
+                                          range(4), max_workers=4))
+
+        self.assertEqual(2, self.max_running)
+        self.cloud.config.get_concurrency.assert_called_with('network')
+
+    def test_batch_capped_by_pool(self):
+        self.cloud.batch(self._call, range(10), max_workers=10)
+
+        self.assertLessEqual(self.max_running, connection.DEFAULT_POOL_SIZE)
+
+    def test_pool_executor_concurrency(self):
+        self.useFixture(fixtures.MockPatchObject(
+            self.cloud.config, 'get_max_concurrency', return_value=8))
+        conn = connection.Connection(config=self.cloud.config)
+        self.addCleanup(conn.close)
+
+        started = []
+        all_started = threading.Event()
+
+        def call(item):
+            with self.lock:
+                started.append(item)
+                if len(started) == 8:
+                    all_started.set()
+            # Only returns once all the calls run at once
+            self.assertTrue(all_started.wait(5))
+            return item
+
+        self.assertEqual(
+            list(range(8)),
+            conn.batch(call, range(8), max_workers=8,
+                       return_exceptions=False))
+        self.assertEqual(8, conn._pool_executor._max_workers)
+
+    def test_pool_executor(self):
+        executor = mock.Mock()
+        conn = connection.Connection(config=self.cloud.config,
+                                     pool_executor=executor)
+        self.assertIs(executor, conn._pool_executor)
+        conn.close()
+        executor.shutdown.assert_not_called()
+
+    def test_close(self):
+        executor = self.cloud._pool_executor
+        self.cloud.close()
+        self.assertRaises(RuntimeError, executor.submit, self._call, 1)
+
+    def test_close_file_hash_cache(self):
+        cache = self.cloud._file_hash_cache
+        with mock.patch.object(cache, 'close') as close:
+            self.cloud.close()
+        close.assert_called_once_with()
+
+    def test_close_file_hash_cache_not_owned(self):
+        cache = mock.Mock()
+        conn = connection.Connection(config=self.cloud.config,
+                                     file_hash_cache=cache)
+        self.assertIs(cache, conn._file_hash_cache)
+        conn.close()
+        cache.close.assert_not_called()
+
+
 class TestNewService(base.TestCase):
 
     def test_add_service_v1(self):
@@ -0,0 +1,78 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+
+from openstack.compute.v2 import server
+from openstack import events
+from openstack.network.v2 import port
+from openstack.tests.unit import base
+
+
+class TestMutationEvents(base.TestCase):
+
+    def setUp(self):
+        super(TestMutationEvents, self).setUp()
+        self.sot = events.MutationEvents()
+        self.server = server.Server(id='server-id')
+        self.port = port.Port(id='port-id')
+
+    def test_emit(self):
+        callback = mock.Mock()
+        self.sot.subscribe(callback)
+
+        self.sot.emit(events.CREATE, 'compute', self.server)
+
+        callback.assert_called_once_with(events.MutationEvent(
+            events.CREATE, 'compute', server.Server, 'server-id',
+            self.server))
+
+    def test_filters(self):
+        by_service = mock.Mock()
+        by_resource = mock.Mock()
+        by_action = mock.Mock()
+        self.sot.subscribe(by_service, service_type='network')
+        self.sot.subscribe(by_resource, resource_name='Server')
+        self.sot.subscribe(by_action, action=events.DELETE)
+
+        self.sot.emit(events.UPDATE, 'compute', self.server)
+        self.sot.emit(events.DELETE, 'network', self.port)
+
+        self.assertEqual(
+            [events.DELETE],
+            [c[0][0].action for c in by_service.call_args_list])
+        self.assertEqual(
+            [events.UPDATE],
+            [c[0][0].action for c in by_resource.call_args_list])
+        self.assertEqual(
+            ['port-id'],
+            [c[0][0].resource_id for c in by_action.call_args_list])
+
+    def test_unsubscribe(self):
+        callback = mock.Mock()
+        self.sot.subscribe(callback)
+        self.sot.unsubscribe(callback)
+
+        self.sot.emit(events.CREATE, 'compute', self.server)
+
+        callback.assert_not_called()
+
+    def test_failing_subscriber(self):
+        failing = mock.Mock(side_effect=ValueError)
+        callback = mock.Mock()
+        self.sot.subscribe(failing)
+        self.sot.subscribe(callback)
+
+        self.sot.emit(events.CREATE, 'compute', self.server)
+
+        failing.assert_called_once_with(mock.ANY)
+        callback.assert_called_once_with(mock.ANY)
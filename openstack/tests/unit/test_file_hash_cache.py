@@ -0,0 +1,132 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+
+import fixtures
+import mock
+
+from openstack.config import cloud_region
+from openstack import exceptions
+from openstack import file_hash_cache
+from openstack.tests.unit import base
+
+
+class _TestFileHashCache(object):
+
+    def setUp(self):
+        super(_TestFileHashCache, self).setUp()
+        self.tmpdir = self.useFixture(fixtures.TempDir()).path
+        self.files = []
+        for index in range(3):
+            filename = os.path.join(self.tmpdir, 'file%d' % index)
+            with open(filename, 'w') as file_obj:
+                file_obj.write('content %d' % index)
+            self.files.append(filename)
+
+    def test_get_set(self):
+        cache = self._make_cache()
+        self.assertIsNone(cache.get(self.files[0]))
+
+        cache.set(self.files[0], 'md5', 'sha256')
+
+        self.assertEqual(('md5', 'sha256'), cache.get(self.files[0]))
+        self.assertIsNone(cache.get(self.files[1]))
+
+    def test_modified_file(self):
+        cache = self._make_cache()
+        cache.set(self.files[0], 'md5', 'sha256')
+
+        with open(self.files[0], 'a') as file_obj:
+            file_obj.write('more')
+
+        self.assertIsNone(cache.get(self.files[0]))
+
+    def test_replaced_file(self):
+        cache = self._make_cache()
+        cache.set(self.files[0], 'md5', 'sha256')
+        stat = os.stat(self.files[0])
+
+        os.rename(self.files[1], self.files[0])
+        os.utime(self.files[0], (stat.st_atime, stat.st_mtime))
+
+        self.assertIsNone(cache.get(self.files[0]))
+
+    def test_lru(self):
+        cache = self._make_cache(max_entries=2)
+        with mock.patch('time.time', side_effect=range(100)):
+            cache.set(self.files[0], 'md5-0', 'sha256-0')
+            cache.set(self.files[1], 'md5-1', 'sha256-1')
+            # Use the first file so that the second one is evicted
+            self.assertIsNotNone(cache.get(self.files[0]))
+            cache.set(self.files[2], 'md5-2', 'sha256-2')
+
+        self.assertEqual(2, len(cache))
+        self.assertEqual(('md5-0', 'sha256-0'), cache.get(self.files[0]))
+        self.assertIsNone(cache.get(self.files[1]))
+        self.assertEqual(('md5-2', 'sha256-2'), cache.get(self.files[2]))
+
+
+class TestMemoryFileHashCache(_TestFileHashCache, base.TestCase):
+
+    def _make_cache(self, **kwargs):
+        return file_hash_cache.MemoryFileHashCache(**kwargs)
+
+
+class TestSqliteFileHashCache(_TestFileHashCache, base.TestCase):
+
+    def _make_cache(self, **kwargs):
+        cache = file_hash_cache.SqliteFileHashCache(
+            os.path.join(self.tmpdir, 'cache', 'hashes.sqlite'), **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_shared(self):
+        cache = self._make_cache()
+        cache.set(self.files[0], 'md5', 'sha256')
+        cache.close()
+
+        self.assertEqual(
+            ('md5', 'sha256'), self._make_cache().get(self.files[0]))
+        # The database is opened again when needed
+        self.assertEqual(('md5', 'sha256'), cache.get(self.files[0]))
+
+
+class TestFromConfig(base.TestCase):
+
+    def _make_config(self, file_hashes):
+        return cloud_region.CloudRegion(
+            config={}, cache_path='/cache', cache_file_hashes=file_hashes)
+
+    def test_default(self):
+        cache = file_hash_cache.from_config(self._make_config(None))
+
+        self.assertIsInstance(cache, file_hash_cache.MemoryFileHashCache)
+        self.assertEqual(
+            file_hash_cache.DEFAULT_MAX_ENTRIES, cache.max_entries)
+
+    def test_sqlite(self):
+        cache = file_hash_cache.from_config(
+            self._make_config({'backend': 'sqlite', 'max_entries': '10'}))
+
+        self.assertIsInstance(cache, file_hash_cache.SqliteFileHashCache)
+        self.assertEqual('/cache/file_hashes.sqlite', cache.path)
+        self.assertEqual(10, cache.max_entries)
+
+    def test_unknown(self):
+        self.assertRaises(
+            exceptions.ConfigException, file_hash_cache.from_config,
+            self._make_config({'backend': 'redis'}))
+
+    def test_connection(self):
+        self.assertIsInstance(
+            self.cloud._file_hash_cache, file_hash_cache.MemoryFileHashCache)
@@ -15,6 +15,7 @@ import mock
 import munch
 from openstack.tests.unit import base
 
+from openstack import events
 from openstack import exceptions
 from openstack import proxy
 from openstack import resource
@@ -219,6 +220,27 @@ class TestProxyDelete(base.TestCase):
         rv = self.sot._delete(DeleteableResource, self.fake_id)
         self.assertIsNone(rv)
 
+    def test_delete_event(self):
+        emitted = []
+        self.cloud.mutation_events.subscribe(emitted.append)
+
+        self.sot._delete(DeleteableResource, self.res)
+
+        self.assertEqual(1, len(emitted))
+        self.assertEqual(events.DELETE, emitted[0].action)
+        self.assertEqual(self.fake_id, emitted[0].resource_id)
+        self.assertIs(self.res, emitted[0].resource)
+
+    def test_delete_missing_no_event(self):
+        emitted = []
+        self.cloud.mutation_events.subscribe(emitted.append)
+        self.res.delete.side_effect = exceptions.ResourceNotFound(
+            message="test", http_status=404)
+
+        self.sot._delete(DeleteableResource, self.fake_id)
+
+        self.assertEqual([], emitted)
+
     def test_delete_NotFound(self):
         self.res.delete.side_effect = exceptions.ResourceNotFound(
             message="test", http_status=404)
@@ -280,6 +302,16 @@ class TestProxyUpdate(base.TestCase):
         self.assertEqual(rv, self.fake_result)
         self.res.commit.assert_called_once_with(self.sot, base_path=None)
 
+    def test_update_event(self):
+        emitted = []
+        self.cloud.mutation_events.subscribe(emitted.append)
+
+        self.sot._update(UpdateableResource, self.res, **self.attrs)
+
+        self.assertEqual(1, len(emitted))
+        self.assertEqual(events.UPDATE, emitted[0].action)
+        self.assertEqual(self.fake_result, emitted[0].resource)
+
 
 class TestProxyCreate(base.TestCase):
 
@@ -319,6 +351,17 @@ class TestProxyCreate(base.TestCase):
             connection=self.cloud, **attrs)
         self.res.create.assert_called_once_with(self.sot, base_path=base_path)
 
+    def test_create_event(self):
+        CreateableResource.new = mock.Mock(return_value=self.res)
+        emitted = []
+        self.cloud.mutation_events.subscribe(emitted.append)
+
+        self.sot._create(CreateableResource, x=1)
+
+        self.assertEqual(1, len(emitted))
+        self.assertEqual(events.CREATE, emitted[0].action)
+        self.assertEqual(self.fake_result, emitted[0].resource)
+
 
 class TestProxyGet(base.TestCase):
 
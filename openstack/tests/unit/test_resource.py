@@ -22,6 +22,7 @@ import six
 from openstack import exceptions
 from openstack import format
 from openstack import resource
+from openstack import utils
 from openstack.tests.unit import base
 
 
@@ -602,6 +603,29 @@ class TestResource(base.TestCase):
         self.assertIn("y", Test._uri_mapping())
         self.assertIn("z", Test._uri_mapping())
 
+    def test__get_schema_cached_per_class(self):
+        class Parent(resource.Resource):
+            foo = resource.Body("foo")
+
+        class Child(Parent):
+            bar = resource.Body("bar", alternate_id=True)
+
+        self.assertIs(Parent._get_schema(), Parent._get_schema())
+        self.assertIsNot(Parent._get_schema(), Child._get_schema())
+        self.assertEqual("", Parent._alternate_id())
+        self.assertEqual("bar", Child._alternate_id())
+        self.assertNotIn("bar", Parent._body_mapping())
+        self.assertIn("bar", Child._body_mapping())
+
+    def test__get_mapping_returns_copy(self):
+        class Test(resource.Resource):
+            foo = resource.Body("foo")
+
+        mapping = Test._body_mapping()
+        mapping.pop("foo")
+
+        self.assertIn("foo", Test._body_mapping())
+
     def test__getattribute__id_in_body(self):
         id = "lol"
         sot = resource.Resource(id=id)
@@ -896,6 +920,72 @@ class TestResource(base.TestCase):
         actual = json.dumps(res, sort_keys=True)
         self.assertEqual(expected, actual)
 
+    def test_lazy_dict(self):
+        class Test(resource.Resource):
+            foo = resource.Body('foo_remote')
+
+        conn = mock.Mock(lazy_resource_dict=True, current_location=None)
+        res = Test(foo='bar', connection=conn)
+
+        self.assertTrue(res._dict_stale)
+        self.assertEqual(['id'], list(dict.keys(res)))
+        self.assertEqual('bar', res.foo)
+        self.assertTrue(res._dict_stale)
+
+        self.assertEqual(
+            {'foo': 'bar', 'id': None, 'location': None, 'name': None},
+            dict(res))
+        self.assertEqual(
+            sorted(['foo', 'id', 'location', 'name']), sorted(res))
+        self.assertFalse(res._dict_stale)
+
+    def test_lazy_dict_json_dumps(self):
+        class Test(resource.Resource):
+            foo = resource.Body('foo_remote')
+
+        conn = mock.Mock(lazy_resource_dict=True, current_location=None)
+        res = Test(foo='bar', connection=conn)
+
+        expected = '{"foo": "bar", "id": null, "location": null, "name": null}'
+        self.assertEqual(expected, json.dumps(res, sort_keys=True))
+
+        res._translate_response(FakeResponse({'foo': 'new_bar'}))
+
+        self.assertTrue(res._dict_stale)
+        self.assertIn('foo', res)
+        self.assertEqual('new_bar', res.get('foo'))
+        self.assertFalse(res._dict_stale)
+
+    def test_lazy_dict_consistency(self):
+        class Test(resource.Resource):
+            foo = resource.Body('foo_remote')
+
+        conn = mock.Mock(lazy_resource_dict=True, current_location=None)
+        res = Test(foo='bar', connection=conn)
+        eager = Test(foo='bar')
+
+        self.assertEqual(len(eager), len(res))
+        self.assertTrue(res)
+        self.assertTrue(res._dict_stale)
+        self.assertEqual(eager.copy(), res.copy())
+        self.assertEqual(sorted(eager.keys()), sorted(res.keys()))
+        self.assertEqual(sorted(eager.items()), sorted(res.items()))
+        self.assertTrue(res._dict_stale)
+
+        self.assertEqual(Test(foo='bar', connection=conn), res)
+        self.assertFalse(Test(foo='bar', connection=conn) != res)
+        self.assertNotEqual(Test(foo='baz', connection=conn), res)
+        self.assertTrue(res._dict_stale)
+
+        self.assertEqual(dict(eager), dict(res))
+        self.assertEqual(len(eager), len(res))
+
+    def test_lazy_dict_mock_connection(self):
+        res = resource.Resource(connection=mock.Mock())
+
+        self.assertFalse(res._lazy_dict)
+        self.assertFalse(res._dict_stale)
+
     def test_items(self):
         class Test(resource.Resource):
             foo = resource.Body('foo')
@@ -1439,6 +1529,128 @@ class TestResourceActions(base.TestCase):
         self._test_create(Test, requires_id=False, prepend_key=True,
                           base_path='dummy')
 
+    def _bulk_create_class(self, **attrs):
+        class Test(resource.Resource):
+            service = self.service_name
+            base_path = '/things'
+            resource_key = 'thing'
+            resources_key = 'things'
+            allow_create = True
+            locals().update(attrs)
+
+            name = resource.Body('name')
+            parent = resource.URI('parent')
+
+        return Test
+
+    def _bulk_create_response(self, *names):
+        return FakeResponse({'things': [
+            {'id': 'id-' + name, 'name': name} for name in names]})
+
+    def test_bulk_create(self):
+        Test = self._bulk_create_class()
+        self.session.post.return_value = self._bulk_create_response('a', 'b')
+
+        result = Test.bulk_create(self.session, [{'name': 'a'},
+                                                 {'name': 'b'}])
+
+        self.session.post.assert_called_once_with(
+            '/things', json={'things': [{'name': 'a'}, {'name': 'b'}]},
+            headers={}, microversion=None)
+        self.assertEqual(['id-a', 'id-b'], [r.id for r in result])
+        self.assertEqual(['a', 'b'], [r.name for r in result])
+        for res in result:
+            self.assertIsInstance(res, Test)
+            self.assertEqual({}, res._body.dirty)
+
+    def test_bulk_create_chunks(self):
+        Test = self._bulk_create_class()
+        self.session.post.side_effect = [
+            self._bulk_create_response('a', 'b'),
+            self._bulk_create_response('c')]
+
+        result = Test.bulk_create(
+            self.session, [{'name': 'a'}, {'name': 'b'}, {'name': 'c'}],
+            chunk_size=2)
+
+        self.assertEqual([
+            mock.call('/things',
+                      json={'things': [{'name': 'a'}, {'name': 'b'}]},
+                      headers={}, microversion=None),
+            mock.call('/things', json={'things': [{'name': 'c'}]},
+                      headers={}, microversion=None),
+        ], self.session.post.call_args_list)
+        self.assertEqual(['id-a', 'id-b', 'id-c'], [r.id for r in result])
+
+    def test_bulk_create_put_no_prepend_key(self):
+        Test = self._bulk_create_class(create_method='PUT',
+                                       create_requires_id=False)
+        self.session.put.return_value = self._bulk_create_response('a')
+
+        result = Test.bulk_create(self.session, [{'name': 'a'}],
+                                  prepend_key=False, base_path='/other')
+
+        self.session.put.assert_called_once_with(
+            '/other', json=[{'name': 'a'}], headers={}, microversion=None)
+        self.assertEqual(['id-a'], [r.id for r in result])
+
+    def test_bulk_create_no_body(self):
+        Test = self._bulk_create_class(has_body=False)
+        self.session.post.return_value = FakeResponse(None, status_code=204)
+
+        result = Test.bulk_create(self.session, [{'name': 'a'}])
+
+        self.assertEqual(['a'], [r.name for r in result])
+        self.assertIsNone(result[0].id)
+
+    def test_bulk_create_different_uri(self):
+        Test = self._bulk_create_class(base_path='/parents/%(parent)s/things')
+
+        self.assertRaises(
+            ValueError, Test.bulk_create, self.session,
+            [{'parent': 'p1', 'name': 'a'}, {'parent': 'p2', 'name': 'b'}])
+        self.session.post.assert_not_called()
+
+    def test_bulk_create_invalid(self):
+        Test = self._bulk_create_class()
+
+        self.assertRaises(ValueError, Test.bulk_create, self.session,
+                          {'name': 'a'})
+        self.assertRaises(ValueError, Test.bulk_create, self.session,
+                          ['a'])
+        self.assertRaises(ValueError, Test.bulk_create, self.session,
+                          [{'name': 'a'}], chunk_size=0)
+        self.assertRaises(ValueError, Test.bulk_create, self.session,
+                          [{'name': 'a'}], chunk_size=-1)
+        self.assertRaises(ValueError, Test.bulk_create, self.session,
+                          [{'name': 'a'}], chunk_size=1.5)
+        self.assertRaises(ValueError, Test.bulk_create, self.session,
+                          [], chunk_size=0)
+
+    def test_bulk_create_empty(self):
+        Test = self._bulk_create_class()
+
+        self.assertEqual([], Test.bulk_create(self.session, []))
+        self.assertEqual([], Test.bulk_create(self.session, [],
+                                              chunk_size=2))
+        self.session.post.assert_not_called()
+
+    def test_bulk_create_not_allowed(self):
+        Test = self._bulk_create_class(allow_create=False)
+
+        self.assertRaises(exceptions.MethodNotSupported, Test.bulk_create,
+                          self.session, [{'name': 'a'}])
+
+    def test_bulk_create_error(self):
+        Test = self._bulk_create_class()
+        response = requests.Response()
+        response.status_code = 400
+        response._content = b''
+        self.session.post.return_value = response
+
+        self.assertRaises(exceptions.BadRequestException, Test.bulk_create,
+                          self.session, [{'name': 'a'}])
+
     def test_fetch(self):
         result = self.sot.fetch(self.session)
 
@@ -2225,6 +2437,102 @@ class TestResourceActions(base.TestCase):
             params={},
             microversion=None)
 
+    def test_list_multi_page_response_prefetch(self):
+        responses = []
+        for ids, next_url in (([1, 2], 'next-1'), ([3], 'next-2'), ([], None)):
+            resp = mock.Mock()
+            resp.status_code = 200
+            resp.links = {}
+            body = {"resources": [{"id": i} for i in ids]}
+            if next_url:
+                body["resources_links"] = [{
+                    "href": "https://example.com/%s" % next_url,
+                    "rel": "next",
+                }]
+            resp.json.return_value = body
+            responses.append(resp)
+
+        self.session.get.side_effect = responses
+
+        results = list(self.sot.list(self.session, paginated=True,
+                                     prefetch=2))
+
+        self.assertEqual([1, 2, 3], [r.id for r in results])
+        self.assertEqual(3, len(self.session.get.call_args_list))
+        self.session.get.assert_called_with(
+            'https://example.com/next-2',
+            headers={"Accept": "application/json"},
+            params={},
+            microversion=None)
+
+    def test_list_prefetch_error(self):
+        resp1 = mock.Mock()
+        resp1.status_code = 200
+        resp1.links = {}
+        resp1.json.return_value = {
+            "resources": [{"id": 1}],
+            "resources_links": [{
+                "href": "https://example.com/next-url",
+                "rel": "next",
+            }],
+        }
+        resp2 = mock.Mock()
+        resp2.status_code = 500
+        resp2.headers = {}
+        resp2.json.return_value = {}
+
+        self.session.get.side_effect = [resp1, resp2]
+
+        results = self.sot.list(self.session, paginated=True, prefetch=1)
+
+        self.assertEqual(1, next(results).id)
+        self.assertRaises(exceptions.HttpException, next, results)
+
+    def _stream_response(self, body, chunk_size=7):
+        raw = json.dumps(body).encode('utf-8')
+        resp = mock.Mock()
+        resp.status_code = 200
+        resp.links = {}
+        resp.headers = {}
+        resp.iter_content.return_value = [
+            raw[i:i + chunk_size] for i in range(0, len(raw), chunk_size)]
+        return resp
+
+    def test_list_stream(self):
+        resp1 = self._stream_response({
+            "resources": [{"id": 1, "name": "one"}, {"id": 2}],
+            "resources_links": [{
+                "href": "https://example.com/next-url?marker=2",
+                "rel": "next",
+            }],
+        })
+        resp2 = self._stream_response({"resources": [{"id": 3}]})
+        resp3 = self._stream_response({"resources": []})
+
+        self.session.get.side_effect = [resp1, resp2, resp3]
+
+        results = list(self.sot.list(self.session, paginated=True,
+                                     stream=True))
+
+        self.assertEqual([1, 2, 3], [r.id for r in results])
+        self.assertEqual('one', results[0].name)
+        self.session.get.assert_has_calls([
+            mock.call(self.base_path,
+                      headers={"Accept": "application/json"},
+                      params={}, microversion=None, stream=True),
+            mock.call('https://example.com/next-url',
+                      headers={"Accept": "application/json"},
+                      params={'marker': ['2']}, microversion=None,
+                      stream=True),
+        ])
+        self.assertFalse(resp1.json.called)
+
+    def test_list_stream_no_ijson(self):
+        with mock.patch.object(resource, 'ijson', None):
+            self.assertRaises(
+                exceptions.SDKException,
+                list, self.sot.list(self.session, stream=True))
+
     def test_list_multi_page_no_early_termination(self):
         # This tests verifies that multipages are not early terminated.
         # APIs can set max_limit to the number of items returned in each
@@ -2580,6 +2888,62 @@ class TestResourceFind(base.TestCase):
             resource.Resource._get_one_match, the_id, [match, match])
 
 
+class TestIterJsonResources(base.TestCase):
+
+    def _iter(self, body, resources_key, remainder, chunk_size=5):
+        raw = json.dumps(body).encode('utf-8')
+        chunks = [raw[i:i + chunk_size]
+                  for i in range(0, len(raw), chunk_size)]
+        return list(resource._iter_json_resources(
+            chunks, resources_key, remainder))
+
+    def test_resources_key(self):
+        body = {
+            'before': {'a': [1, 2]},
+            'resources': [{'id': 1, 'sub': {'x': [1.5, None]}}, {'id': 2}],
+            'resources_links': [{'rel': 'next', 'href': 'url'}],
+            'count': 2,
+        }
+        remainder = {}
+
+        result = self._iter(body, 'resources', remainder)
+
+        self.assertEqual(body['resources'], result)
+        self.assertEqual({
+            'before': {'a': [1, 2]},
+            'resources_links': [{'rel': 'next', 'href': 'url'}],
+            'count': 2,
+        }, remainder)
+
+    def test_top_level_list(self):
+        body = [{'name': 'a'}, {'name': 'b', 'bytes': 5}]
+        remainder = {}
+
+        self.assertEqual(body, self._iter(body, None, remainder))
+        self.assertEqual({}, remainder)
+
+    def test_single_resource(self):
+        body = {'resources': {'id': 1}, 'other': 'value'}
+        remainder = {}
+
+        self.assertEqual([{'id': 1}], self._iter(body, 'resources', remainder))
+        self.assertEqual({'other': 'value'}, remainder)
+
+    def test_no_resources_key(self):
+        body = {'id': 1, 'name': 'value'}
+
+        self.assertEqual([body], self._iter(body, None, {}))
+
+    def test_yields_incrementally(self):
+        chunks = iter([b'{"resources": [{"id": 1}, ', b'{"id": 2}]}'])
+
+        results = resource._iter_json_resources(chunks, 'resources', {})
+
+        self.assertEqual({'id': 1}, next(results))
+        # Only the first chunk has been read so far
+        self.assertEqual(b'{"id": 2}]}', next(chunks))
+
+
 class TestWaitForStatus(base.TestCase):
 
     def test_immediate_status(self):
@@ -2710,6 +3074,158 @@ class TestWaitForStatus(base.TestCase):
                           self.cloud.compute, res, "status", None, 0, -1)
 
 
+class TestWaitForStatuses(base.TestCase):
+
+    class Thing(resource.Resource):
+        base_path = '/things'
+        allow_fetch = True
+        allow_list = True
+        _query_mapping = resource.QueryParameters('id')
+
+        status = resource.Body('status')
+
+    class DatedThing(resource.Resource):
+        base_path = '/dated'
+        allow_fetch = True
+        allow_list = True
+        _list_details_base_path = '/dated/detail'
+        _query_mapping = resource.QueryParameters('changes_since')
+
+        status = resource.Body('status')
+        updated_at = resource.Body('updated_at')
+
+    class PlainThing(resource.Resource):
+        base_path = '/plain'
+        allow_fetch = True
+
+        status = resource.Body('status')
+
+    def setUp(self):
+        super(TestWaitForStatuses, self).setUp()
+        self.session = mock.Mock()
+
+    def _listed(self, cls, **statuses):
+        return [cls.existing(id=id, status=status)
+                for id, status in sorted(statuses.items())]
+
+    def _wait(self, resources, **kwargs):
+        kwargs.setdefault('interval', 1)
+        kwargs.setdefault('wait', 5)
+        return list(resource.wait_for_statuses(
+            self.session, resources, 'ACTIVE', **kwargs))
+
+    def test_immediate(self):
+        things = [self.Thing.existing(id='a', status='active')]
+
+        with mock.patch.object(self.Thing, 'list') as mock_list:
+            self.assertEqual(things, self._wait(things))
+
+        mock_list.assert_not_called()
+
+    def test_id_filter(self):
+        a = self.Thing.existing(id='a', status='BUILD')
+        b = self.Thing.existing(id='b', status='BUILD')
+
+        with mock.patch.object(self.Thing, 'list', side_effect=[
+                self._listed(self.Thing, a='BUILD', b='ACTIVE'),
+                self._listed(self.Thing, a='ACTIVE')]) as mock_list:
+            result = self._wait([a, b])
+
+        self.assertEqual([b, a], result)
+        self.assertEqual('ACTIVE', a.status)
+        self.assertEqual('ACTIVE', b.status)
+        self.assertEqual({}, a._body.dirty)
+        self.assertEqual([
+            mock.call(self.session, base_path=None, id=['a', 'b']),
+            mock.call(self.session, base_path=None, id=['a']),
+        ], mock_list.call_args_list)
+
+    def test_id_filter_chunks(self):
+        things = [self.Thing.existing(id='%03d' % i, status='BUILD')
+                  for i in range(resource._WAIT_IDS_PER_REQUEST + 1)]
+
+        def list_things(session, base_path, id):
+            return self._listed(self.Thing, **{i: 'ACTIVE' for i in id})
+
+        with mock.patch.object(self.Thing, 'list',
+                               side_effect=list_things) as mock_list:
+            result = self._wait(things)
+
+        self.assertEqual(things, result)
+        self.assertEqual(2, mock_list.call_count)
+
+    def test_id_filter_gone(self):
+        a = self.Thing.existing(id='a', status='BUILD')
+
+        with mock.patch.object(self.Thing, 'list', return_value=[]):
+            self.assertRaises(exceptions.ResourceFailure, self._wait, [a])
+
+    def test_failure(self):
+        a = self.Thing.existing(id='a', status='BUILD')
+
+        with mock.patch.object(self.Thing, 'list', return_value=self._listed(
+                self.Thing, a='FAILED')):
+            self.assertRaises(exceptions.ResourceFailure,
+                              self._wait, [a], failures=['failed'])
+
+    def test_timeout(self):
+        a = self.Thing.existing(id='a', status='BUILD')
+
+        with mock.patch.object(self.Thing, 'list', return_value=self._listed(
+                self.Thing, a='BUILD')):
+            self.assertRaises(exceptions.ResourceTimeout,
+                              self._wait, [a], wait=0.01, interval=0.001)
+
+    def test_changes_since(self):
+        a = self.DatedThing.existing(id='a', status='BUILD',
+                                     updated_at='2019-01-02T00:00:00Z')
+        b = self.DatedThing.existing(id='b', status='BUILD',
+                                     updated_at='2019-01-01T00:00:00Z')
+        c = self.DatedThing.existing(id='c', status='BUILD')
+        fetched_c = self.DatedThing.existing(id='c', status='BUILD',
+                                             updated_at='2019-01-03T00:00:00Z')
+
+        def fetch(session):
+            c._body.attributes.update(fetched_c._body.attributes)
+            return c
+
+        c.fetch = mock.Mock(side_effect=fetch)
+        listed = [
+            self.DatedThing.existing(id='b', status='ACTIVE',
+                                     updated_at='2019-01-04T00:00:00Z'),
+            self.DatedThing.existing(id='other', status='ACTIVE',
+                                     updated_at='2019-01-04T00:00:00Z'),
+        ]
+        with mock.patch.object(self.DatedThing, 'list', side_effect=[
+                listed,
+                self._listed(self.DatedThing, a='ACTIVE', c='ACTIVE'),
+        ]) as mock_list:
+            result = self._wait([a, b, c])
+
+        self.assertEqual([b, a, c], result)
+        self.assertEqual('2019-01-04T00:00:00Z', b.updated_at)
+        c.fetch.assert_called_once_with(self.session)
+        self.assertEqual([
+            mock.call(self.session, base_path='/dated/detail',
+                      changes_since='2019-01-01T00:00:00Z'),
+            mock.call(self.session, base_path='/dated/detail',
+                      changes_since='2019-01-02T00:00:00Z'),
+        ], mock_list.call_args_list)
+
+    def test_fetch(self):
+        a = self.PlainThing.existing(id='a', status='BUILD')
+        statuses = iter(['BUILD', 'ACTIVE'])
+
+        def fetch(session):
+            a._body.attributes['status'] = next(statuses)
+            return a
+
+        a.fetch = mock.Mock(side_effect=fetch)
+
+        self.assertEqual([a], self._wait([a]))
+        self.assertEqual(2, a.fetch.call_count)
+
+
 class TestWaitForDelete(base.TestCase):
 
     def test_success(self):
@@ -2735,6 +3251,42 @@ class TestWaitForDelete(base.TestCase):
             resource.wait_for_delete,
             self.cloud.compute, res, 0.1, 0.3)
 
+    @mock.patch.object(utils, 'iterate_timeout', return_value=iter([1]))
+    def test_strategy(self, mock_iterate):
+        res = mock.Mock()
+        res.fetch.return_value = None
+
+        resource.wait_for_delete(
+            self.cloud.compute, res, 1, 3, strategy='jitter')
+
+        mock_iterate.assert_called_once_with(
+            timeout=3, message=mock.ANY, wait=1, strategy='jitter',
+            max_wait=None)
+
+    @mock.patch.object(utils, 'iterate_timeout', return_value=iter([1]))
+    def test_strategy_from_proxy(self, mock_iterate):
+        session = mock.Mock(wait_strategy='exponential', wait_max_interval=30)
+        res = mock.Mock()
+        res.fetch.return_value = None
+
+        resource.wait_for_delete(session, res, 1, 3)
+
+        mock_iterate.assert_called_once_with(
+            timeout=3, message=mock.ANY, wait=1, strategy='exponential',
+            max_wait=30)
+
+    @mock.patch.object(utils, 'iterate_timeout', return_value=iter([1]))
+    def test_max_wait(self, mock_iterate):
+        session = mock.Mock(wait_strategy='exponential', wait_max_interval=30)
+        res = mock.Mock()
+        res.fetch.return_value = None
+
+        resource.wait_for_delete(session, res, 1, 3, max_wait=5)
+
+        mock_iterate.assert_called_once_with(
+            timeout=3, message=mock.ANY, wait=1, strategy='exponential',
+            max_wait=5)
+
 
 @mock.patch.object(resource.Resource, '_get_microversion_for', autospec=True)
 class TestAssertMicroversionFor(base.TestCase):
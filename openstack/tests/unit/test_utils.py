@@ -12,6 +12,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import itertools
 import logging
 import mock
 import sys
@@ -21,6 +22,7 @@ import fixtures
 import os_service_types
 
 import openstack
+from openstack import exceptions
 from openstack import utils
 
 
@@ -130,6 +132,102 @@ class Test_urljoin(base.TestCase):
         self.assertEqual(result, u"http://www.example.com/ascii/extra_chars-™")
 
 
+class Test_iterate_ahead(base.TestCase):
+
+    def test_items(self):
+        self.assertEqual(
+            list(range(10)), list(utils.iterate_ahead(iter(range(10)), 2)))
+
+    def test_empty(self):
+        self.assertEqual([], list(utils.iterate_ahead(iter([]), 1)))
+
+    def test_exception(self):
+        def gen():
+            yield 1
+            raise exceptions.SDKException("boom")
+
+        results = utils.iterate_ahead(gen(), 3)
+
+        self.assertEqual(1, next(results))
+        self.assertRaises(exceptions.SDKException, next, results)
+
+    def test_stays_ahead(self):
+        produced = []
+
+        def gen():
+            for i in range(10):
+                produced.append(i)
+                yield i
+
+        results = utils.iterate_ahead(gen(), 2)
+        self.assertEqual(0, next(results))
+        for count in utils.iterate_timeout(5, "producer did not run", 0.01):
+            # One item consumed, two buffered and one waiting to be put.
+            if len(produced) == 4:
+                break
+        results.close()
+
+    def test_invalid_depth(self):
+        self.assertRaises(ValueError, list, utils.iterate_ahead([], 0))
+
+
+class Test_iterate_intervals(base.TestCase):
+
+    def _take(self, intervals, count=6):
+        return [next(intervals) for _ in range(count)]
+
+    def test_fixed(self):
+        self.assertEqual([2] * 6, self._take(utils.iterate_intervals(2)))
+        self.assertEqual(
+            [2] * 6, self._take(utils.iterate_intervals(2, 'fixed')))
+
+    def test_exponential(self):
+        self.assertEqual(
+            [1, 2, 4, 8, 10, 10],
+            self._take(utils.iterate_intervals(1, 'exponential')))
+
+    def test_exponential_max_wait(self):
+        self.assertEqual(
+            [1, 2, 3, 3, 3, 3],
+            self._take(utils.iterate_intervals(1, 'exponential', 3)))
+
+    def test_fast_start(self):
+        self.assertEqual(
+            [1, 2, 4, 8, 8, 8],
+            self._take(utils.iterate_intervals(8, 'fast-start')))
+
+    def test_jitter(self):
+        intervals = self._take(utils.iterate_intervals(1, 'jitter'), 50)
+        self.assertEqual(1, intervals[0])
+        for previous, interval in zip(intervals, intervals[1:]):
+            self.assertGreaterEqual(interval, 1)
+            self.assertLessEqual(interval, min(previous * 3, 10))
+
+    def test_unknown(self):
+        self.assertRaises(
+            exceptions.SDKException, utils.iterate_intervals, 1, 'linear')
+
+
+class Test_iterate_timeout(base.TestCase):
+
+    @mock.patch('time.sleep')
+    def test_strategy(self, mock_sleep):
+        for count in utils.iterate_timeout(
+                60, "timed out", 1, strategy='exponential', max_wait=4):
+            if count == 5:
+                break
+        self.assertEqual(
+            [mock.call(1.0), mock.call(2.0), mock.call(4.0), mock.call(4.0)],
+            mock_sleep.call_args_list)
+
+    @mock.patch('time.sleep')
+    def test_timeout(self, mock_sleep):
+        with mock.patch('time.time', side_effect=itertools.count()):
+            self.assertRaises(
+                exceptions.ResourceTimeout, list,
+                utils.iterate_timeout(2, "timed out", 1, strategy='jitter'))
+
+
 class TestMaximumSupportedMicroversion(base.TestCase):
     def setUp(self):
         super(TestMaximumSupportedMicroversion, self).setUp()
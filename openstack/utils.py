@@ -10,7 +10,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import random
 import string
+import sys
+import threading
 import time
 
 import six
@@ -32,12 +35,67 @@ def urljoin(*args):
     return '/'.join(six.text_type(a or '').strip('/') for a in args)
 
 
-def iterate_timeout(timeout, message, wait=2):
+#: Names of the polling strategies of :func:`iterate_timeout`.
+WAIT_STRATEGIES = ('fixed', 'exponential', 'jitter', 'fast-start')
+
+
+def iterate_intervals(wait, strategy=None, max_wait=None):
+    """Return a generator of the successive intervals to wait for.
+
+    :param float wait: Base interval, in seconds.
+    :param str strategy: One of :data:`WAIT_STRATEGIES`:
+
+        * ``fixed``: always wait for ``wait`` seconds. This is the default.
+        * ``exponential``: start with ``wait`` seconds and double the interval
+          each time, up to ``max_wait``.
+        * ``jitter``: decorrelated jitter, random intervals between ``wait``
+          and three times the previous one, up to ``max_wait``. This avoids
+          many concurrent pollers hitting a service at the same time.
+        * ``fast-start``: start with an eighth of ``wait`` and double the
+          interval each time, up to ``wait``, so that quick transitions are
+          noticed quickly.
+    :param float max_wait: Maximum interval for the ``exponential`` and
+        ``jitter`` strategies. Defaults to ten times ``wait``.
+    """
+    if strategy not in (None,) + WAIT_STRATEGIES:
+        raise exceptions.SDKException(
+            "Unknown wait strategy {strategy}, expected one of {valid}".format(
+                strategy=strategy, valid=', '.join(WAIT_STRATEGIES)))
+    if max_wait is None:
+        max_wait = wait * 10
+    else:
+        max_wait = float(max_wait)
+    return _iterate_intervals(wait, strategy, max_wait)
+
+
+def _iterate_intervals(wait, strategy, max_wait):
+    if strategy == 'exponential':
+        interval = wait
+        while True:
+            yield interval
+            interval = min(interval * 2, max_wait)
+    elif strategy == 'jitter':
+        interval = wait
+        while True:
+            yield interval
+            interval = min(random.uniform(wait, interval * 3), max_wait)
+    elif strategy == 'fast-start':
+        interval = wait / 8
+        while True:
+            yield interval
+            interval = min(interval * 2, wait)
+    else:
+        while True:
+            yield wait
+
+
+def iterate_timeout(timeout, message, wait=2, strategy=None, max_wait=None):
     """Iterate and raise an exception on timeout.
 
     This is a generator that will continually yield and sleep for
     wait seconds, and if the timeout is reached, will raise an exception
-    with <message>.
+    with <message>. How the time slept changes over iterations is set by
+    ``strategy`` and ``max_wait``, see :func:`iterate_intervals`.
 
     """
     log = _log.setup_logging('openstack.iterate_timeout')
@@ -57,17 +115,73 @@ def iterate_timeout(timeout, message, wait=2):
         raise exceptions.SDKException(
             "Wait value must be an int or float value. {wait} given"
             " instead".format(wait=wait))
+    intervals = iterate_intervals(wait, strategy, max_wait)
 
     start = time.time()
     count = 0
     while (timeout is None) or (time.time() < start + timeout):
         count += 1
         yield count
-        log.debug('Waiting %s seconds', wait)
-        time.sleep(wait)
+        interval = next(intervals)
+        log.debug('Waiting %s seconds', interval)
+        time.sleep(interval)
     raise exceptions.ResourceTimeout(message)
 
 
+def iterate_ahead(iterable, depth):
+    """Consume an iterable in a background thread, staying ahead of the caller
+
+    This is a generator yielding the same items as ``iterable``. A daemon
+    thread pulls up to ``depth`` items from ``iterable`` before they are
+    requested, so that slow producers (such as paginated API calls) overlap
+    with the work done by the caller on the previous items.
+
+    Exceptions raised by ``iterable`` are re-raised to the caller once the
+    items produced before them have been consumed. If the caller stops
+    iterating early, the background thread is told to stop as well.
+    """
+    if depth < 1:
+        raise ValueError("depth must be at least 1, got %s" % depth)
+
+    items = six.moves.queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def _put(item):
+        # Don't block forever if the consumer went away.
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except six.moves.queue.Full:
+                continue
+        return False
+
+    def _produce():
+        try:
+            for item in iterable:
+                if not _put((item, None)):
+                    return
+        except Exception:
+            _put((done, sys.exc_info()))
+        else:
+            _put((done, None))
+
+    producer = threading.Thread(target=_produce)
+    producer.daemon = True
+    producer.start()
+    try:
+        while True:
+            item, exc_info = items.get()
+            if item is done:
+                if exc_info:
+                    six.reraise(*exc_info)
+                return
+            yield item
+    finally:
+        stop.set()
+
+
 def get_string_format_keys(fmt_string, old_style=True):
     """Gets a list of required keys from a format string
 
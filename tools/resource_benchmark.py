@@ -0,0 +1,96 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Measure how many Resource instances can be built per second.
+
+This mimics what ``Resource.list`` does for every item of a listing
+response, which is the dominant cost when iterating over large
+collections such as ``conn.network.ports()`` or ``conn.compute.servers()``.
+
+Usage::
+
+    python tools/resource_benchmark.py [--count N]
+"""
+
+import argparse
+import copy
+import time
+
+from openstack.compute.v2 import server
+from openstack.network.v2 import port
+
+PORT = {
+    'admin_state_up': True,
+    'allowed_address_pairs': [],
+    'binding:host_id': 'compute-1',
+    'binding:profile': {},
+    'binding:vif_details': {'port_filter': True},
+    'binding:vif_type': 'ovs',
+    'binding:vnic_type': 'normal',
+    'created_at': '2016-03-09T12:14:57.233772',
+    'description': '',
+    'device_id': '9d3c5a4e-9c42-4b4f-a0b6-6a5b47b8cc2b',
+    'device_owner': 'compute:nova',
+    'fixed_ips': [{'subnet_id': 'b4b4', 'ip_address': '10.0.0.4'}],
+    'id': '8a2f8d3b-9a8c-4fd0-9ae2-0c3d1ac1c1b3',
+    'mac_address': 'fa:16:3e:00:00:01',
+    'name': 'port-1',
+    'network_id': 'a87cc70a-3e15-4acf-8205-9b711a3531b7',
+    'port_security_enabled': True,
+    'revision_number': 4,
+    'security_groups': ['f0ac4394-7e4a-4409-9701-ba8be283dbc3'],
+    'status': 'ACTIVE',
+    'tenant_id': 'c6fa3d2f4f7f4c9b8a2c0b0bb4a1e3f9',
+    'updated_at': '2016-07-09T12:14:57.233772',
+}
+
+SERVER = {
+    'id': '6f4c1e4a-3a1e-4b7f-8d0e-1f2c3d4e5f60',
+    'name': 'server-1',
+    'status': 'ACTIVE',
+    'addresses': {'private': [{'addr': '10.0.0.4', 'version': 4}]},
+    'flavor': {'id': '1'},
+    'image': {'id': '2'},
+    'metadata': {'key': 'value'},
+    'created': '2015-03-09T12:14:57.233772',
+    'updated': '2015-03-09T12:15:57.233772',
+    'tenant_id': 'c6fa3d2f4f7f4c9b8a2c0b0bb4a1e3f9',
+    'user_id': 'b2c3d4e5f6a7b8c9d0e1f2a3b4c5d6e7',
+    'hostId': 'abcdef',
+    'OS-EXT-STS:vm_state': 'active',
+    'OS-EXT-STS:power_state': 1,
+    'OS-EXT-AZ:availability_zone': 'nova',
+}
+
+
+def measure(resource_cls, raw, count):
+    items = [copy.deepcopy(raw) for _ in range(count)]
+    start = time.time()
+    for item in items:
+        resource_cls.existing(**item)
+    elapsed = time.time() - start
+    return count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--count', type=int, default=10000,
+                        help='Number of instances to build per resource.')
+    args = parser.parse_args()
+
+    for resource_cls, raw in ((port.Port, PORT), (server.Server, SERVER)):
+        rate = measure(resource_cls, raw, args.count)
+        print('%-8s %10.0f instances/second' % (resource_cls.__name__, rate))
+
+
+if __name__ == '__main__':
+    main()